@@ -0,0 +1,33 @@
+"""
+A batch job held by the fake provider server.
+"""
+
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from ..models import Provider
+
+
+class FakeBatch:
+    """A batch job, reported in progress until its delay has passed."""
+
+    def __init__(
+        self,
+        provider: Provider,
+        model: str,
+        requests: List[Tuple[str, str]],
+        delaySeconds: float,
+    ):
+        self.id: str = uuid.uuid4().hex
+        self.provider: Provider = provider
+        self.model: str = model
+        # Custom id and prompt text of each request
+        self.requests: List[Tuple[str, str]] = requests
+        self.createdAt: float = time.time()
+        self.endsAt: float = self.createdAt + delaySeconds
+        self.outputFileId: Optional[str] = None
+
+    @property
+    def ended(self) -> bool:
+        return time.time() >= self.endsAt
@@ -0,0 +1,256 @@
+"""
+Local stand-in for the provider APIs used by the helpers.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..models import FakeServerConfig, LatencyDistribution, Provider
+from . import anthropicApi, geminiApi, openaiApi
+from .FakeBatch import FakeBatch
+
+
+class _HttpServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server with a listen backlog deep enough for a benchmark's
+    burst of new connections; with the default of 5, connections beyond it are
+    reset, which clients would see as errors nobody injected.
+    """
+
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FakeProviderServer:
+    """
+    HTTP server answering the Anthropic Messages, OpenAI Responses and Gemini
+    generateContent endpoints the helpers call, along with their batch and Gemini
+    context cache endpoints, so benchmarks can run offline.
+
+    Prompts are answered with the moves of the configured policy after a delay
+    drawn from the latency distribution, unless an injected error or rate limit
+    answers them first. A batch job reports itself in progress until
+    `batchDelaySeconds` after it was created, and then returns a successful result
+    for every request. Point the clients at `url` with `ClientConfig.baseUrls`
+    (OpenAI's with a /v1 suffix), or with the ANTHROPIC_BASE_URL, OPENAI_BASE_URL
+    and GOOGLE_GEMINI_BASE_URL environment variables.
+    """
+
+    def __init__(self, config: Optional[FakeServerConfig] = None):
+        self.config: FakeServerConfig = config or FakeServerConfig()
+        self.batches: Dict[str, FakeBatch] = {}
+        self.files: Dict[str, str] = {}
+        self.caches: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._moveIndex: Dict[str, int] = {}
+        self._counters: Dict[str, int] = self._emptyCounters()
+        self._httpServer: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpServer.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def _emptyCounters() -> Dict[str, int]:
+        return {
+            "connections": 0,
+            "prompts": 0,
+            "errors": 0,
+            "rateLimited": 0,
+            "batches": 0,
+        }
+
+    def _count(self, counter: str) -> None:
+        with self.lock:
+            self._counters[counter] += 1
+
+    def reply(self, model: str) -> str:
+        """
+        The model's next move under the policy.
+
+        Args:
+            model: The requested model
+
+        Returns:
+            "C" or "D"
+        """
+        policy = self.config.policy or "C"
+
+        with self.lock:
+            index = self._moveIndex.get(model, 0)
+            self._moveIndex[model] = index + 1
+            move = policy[index % len(policy)].upper()
+
+            if move == "R":
+                move = self._random.choice("CD")
+
+        return move
+
+    def answer(self) -> Optional[int]:
+        """
+        Decide how a prompt is answered, waiting out its latency if it succeeds.
+
+        Returns:
+            The status of an injected failure (500 or 429), or None once the
+            prompt should be answered
+        """
+        self._count("prompts")
+
+        with self.lock:
+            draw = self._random.random()
+            delay = self._latency()
+
+        if draw < self.config.rateLimitRate:
+            self._count("rateLimited")
+            return 429
+
+        if draw < self.config.rateLimitRate + self.config.errorRate:
+            self._count("errors")
+            return 500
+
+        if delay > 0:
+            time.sleep(delay)
+
+        return None
+
+    def _latency(self) -> float:
+        mean = self.config.latencySeconds
+        spread = self.config.latencySpread
+        distribution = self.config.latencyDistribution
+
+        if mean <= 0:
+            return 0.0
+
+        if distribution == LatencyDistribution.UNIFORM:
+            return self._random.uniform(mean * (1 - spread), mean * (1 + spread))
+
+        if distribution == LatencyDistribution.EXPONENTIAL:
+            return self._random.expovariate(1 / mean)
+
+        if distribution == LatencyDistribution.LOGNORMAL:
+            # Centre the distribution so its mean is `latencySeconds`
+            return self._random.lognormvariate(math.log(mean) - spread**2 / 2, spread)
+
+        return mean
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the server's request counters.
+
+        Returns:
+            Connections accepted, prompts received, prompts failed with an
+            injected error or rate limit, and batch jobs created
+        """
+        with self.lock:
+            return dict(self._counters)
+
+    def createBatch(
+        self, provider: Provider, model: str, requests: List[Tuple[str, str]]
+    ) -> FakeBatch:
+        """
+        Register a batch job.
+
+        Args:
+            provider: The provider whose API received the job
+            model: The model the requests are for
+            requests: Custom id and prompt text of each request
+
+        Returns:
+            The new batch
+        """
+        batch = FakeBatch(provider, model, requests, self.config.batchDelaySeconds)
+
+        with self.lock:
+            self.batches[batch.id] = batch
+            self._counters["batches"] += 1
+
+        return batch
+
+    def start(self) -> "FakeProviderServer":
+        """Serve on a background thread; port 0 picks a free port."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                server._count("connections")
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+            def do_DELETE(self):
+                server._dispatch(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpServer = _HttpServer((self.config.host, self.config.port), Handler)
+        self._thread = threading.Thread(
+            target=self._httpServer.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._httpServer is not None:
+            self._httpServer.shutdown()
+            self._httpServer.server_close()
+            self._httpServer = None
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        path = urlsplit(handler.path).path
+        baseUrl = f"http://{handler.headers.get('Host')}"
+        result: Optional[Tuple[int, Any]] = None
+
+        for api in (anthropicApi, openaiApi, geminiApi):
+            result = api.handle(self, method, path, body, handler.headers, baseUrl)
+
+            if result is not None:
+                break
+
+        if result is None:
+            result = (404, {"error": {"message": f"No route for {method} {path}"}})
+
+        status, payload = result
+
+        if isinstance(payload, str):
+            data = payload.encode("utf-8")
+            contentType = "application/jsonl"
+        else:
+            data = json.dumps(payload).encode("utf-8")
+            contentType = "application/json"
+
+        handler.send_response(status)
+
+        if status == 429:
+            handler.send_header("Retry-After", f"{self.config.retryAfterSeconds:g}")
+
+        handler.send_header("Content-Type", contentType)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
@@ -0,0 +1,3 @@
+from .FakeProviderServer import FakeProviderServer
+
+__all__ = ["FakeProviderServer"]
@@ -0,0 +1,191 @@
+"""
+Anthropic Messages and Message Batches routes of the fake provider server.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ..models import Provider
+from .countTokens import countTokens
+from .FakeBatch import FakeBatch
+
+if TYPE_CHECKING:
+    from .FakeProviderServer import FakeProviderServer
+
+BATCH_PATH = re.compile(r"^/v1/messages/batches/(?P<id>[^/]+)(?P<results>/results)?$")
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+def promptText(params: Dict[str, Any]) -> str:
+    """
+    Join the text of a Messages API request's messages.
+
+    Args:
+        params: The request body
+
+    Returns:
+        The text of every message, one message per line
+    """
+    texts = []
+
+    for message in params.get("messages", []):
+        content = message.get("content", "")
+
+        if isinstance(content, str):
+            texts.append(content)
+        else:
+            texts.append("".join(block.get("text", "") for block in content))
+
+    return "\n".join(texts)
+
+
+def message(model: str, prompt: str, reply: str) -> Dict[str, Any]:
+    """
+    Build a Messages API response.
+
+    Args:
+        model: The requested model
+        prompt: Text of the request's messages
+        reply: The text to answer with
+
+    Returns:
+        The response body
+    """
+    return {
+        "id": "msg_fake",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": reply}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": countTokens(prompt),
+            "output_tokens": countTokens(reply),
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+        },
+    }
+
+
+def error(status: int) -> Dict[str, Any]:
+    """
+    Build a Messages API error body.
+
+    Args:
+        status: The HTTP status of the error
+
+    Returns:
+        The error body
+    """
+    errorType = "rate_limit_error" if status == 429 else "api_error"
+
+    return {
+        "type": "error",
+        "error": {"type": errorType, "message": f"Injected {errorType}"},
+    }
+
+
+def _batchObject(batch: FakeBatch, baseUrl: str) -> Dict[str, Any]:
+    ended = batch.ended
+    count = len(batch.requests)
+
+    return {
+        "id": batch.id,
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else count,
+            "succeeded": count if ended else 0,
+            "errored": 0,
+            "canceled": 0,
+            "expired": 0,
+        },
+        "created_at": _timestamp(batch.createdAt),
+        "expires_at": _timestamp(batch.createdAt + 24 * 3600),
+        "ended_at": _timestamp(batch.endsAt) if ended else None,
+        "archived_at": None,
+        "cancel_initiated_at": None,
+        "results_url": (
+            f"{baseUrl}/v1/messages/batches/{batch.id}/results" if ended else None
+        ),
+    }
+
+
+def handle(
+    server: "FakeProviderServer",
+    method: str,
+    path: str,
+    body: bytes,
+    headers: Any,
+    baseUrl: str,
+) -> Optional[Tuple[int, Any]]:
+    """
+    Answer a request if it is for a Messages or Message Batches route.
+
+    Args:
+        server: The fake server holding the batches
+        method: HTTP method
+        path: URL path
+        body: Request body
+        headers: Request headers
+        baseUrl: Scheme and host the client used
+
+    Returns:
+        Status and body, or None if the route is not Anthropic's
+    """
+    if method == "POST" and path == "/v1/messages":
+        params = json.loads(body)
+        status = server.answer()
+
+        if status is not None:
+            return status, error(status)
+
+        return 200, message(
+            params["model"], promptText(params), server.reply(params["model"])
+        )
+
+    if method == "POST" and path == "/v1/messages/batches":
+        requests = json.loads(body)["requests"]
+        batch = server.createBatch(
+            Provider.ANTHROPIC,
+            requests[0]["params"]["model"] if requests else "",
+            [
+                (request["custom_id"], promptText(request["params"]))
+                for request in requests
+            ],
+        )
+
+        return 200, _batchObject(batch, baseUrl)
+
+    match = BATCH_PATH.match(path)
+
+    if method != "GET" or match is None:
+        return None
+
+    batch = server.batches.get(match["id"])
+
+    if batch is None:
+        return 404, {"type": "error", "error": {"type": "not_found_error"}}
+
+    if not match["results"]:
+        return 200, _batchObject(batch, baseUrl)
+
+    return 200, "".join(
+        json.dumps(
+            {
+                "custom_id": customId,
+                "result": {
+                    "type": "succeeded",
+                    "message": message(batch.model, prompt, server.reply(batch.model)),
+                },
+            }
+        )
+        + "\n"
+        for customId, prompt in batch.requests
+    )
@@ -0,0 +1,11 @@
+def countTokens(text: str) -> int:
+    """
+    Rough token count of a text, about four characters per token.
+
+    Args:
+        text: The text to count
+
+    Returns:
+        The estimated number of tokens, at least 1
+    """
+    return max(1, len(text) // 4)
@@ -0,0 +1,261 @@
+"""
+Gemini generateContent, batch mode and context cache routes of the fake provider
+server.
+"""
+
+import json
+import math
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ..models import Provider
+from .countTokens import countTokens
+from .FakeBatch import FakeBatch
+
+if TYPE_CHECKING:
+    from .FakeProviderServer import FakeProviderServer
+
+GENERATE_PATH = re.compile(r"^(/v1beta|/v1)?/models/(?P<model>[^/:]+):generateContent$")
+CREATE_CACHE_PATH = re.compile(r"^(/v1beta|/v1)?/cachedContents$")
+CACHE_PATH = re.compile(r"^(/v1beta|/v1)?/(?P<name>cachedContents/[^/]+)$")
+CREATE_BATCH_PATH = re.compile(
+    r"^(/v1beta|/v1)?/models/(?P<model>[^/:]+):batchGenerateContent$"
+)
+BATCH_PATH = re.compile(r"^(/v1beta|/v1)?/batches/(?P<id>[^/]+)$")
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+def promptText(request: Dict[str, Any]) -> str:
+    """
+    Join the text of a generateContent request's contents.
+
+    Args:
+        request: The request body
+
+    Returns:
+        The text of every content, one content per line
+    """
+    return "\n".join(
+        "".join(part.get("text", "") for part in content.get("parts", []))
+        for content in request.get("contents", [])
+    )
+
+
+def generateContentResponse(
+    model: str,
+    prompt: str,
+    reply: str,
+    topLogprobs: Optional[int] = None,
+    cachedPrefix: str = "",
+) -> Dict[str, Any]:
+    """
+    Build a generateContent response.
+
+    Args:
+        model: The requested model
+        prompt: Text of the request's contents
+        reply: The move to answer with
+        topLogprobs: Number of alternatives requested for each output token
+        cachedPrefix: Text of the context cache the request read from
+
+    Returns:
+        The response body, giving the reply a probability of 0.9 when logprobs
+        are requested
+    """
+    cachedTokens = countTokens(cachedPrefix) if cachedPrefix else 0
+    promptTokens = countTokens(prompt) + cachedTokens
+    candidatesTokens = countTokens(reply)
+    candidate: Dict[str, Any] = {
+        "content": {"role": "model", "parts": [{"text": reply}]},
+        "finishReason": "STOP",
+        "index": 0,
+    }
+
+    if topLogprobs:
+        other = "D" if reply == "C" else "C"
+        chosen = {"token": reply, "logProbability": math.log(0.9)}
+        candidate["logprobsResult"] = {
+            "chosenCandidates": [chosen],
+            "topCandidates": [
+                {
+                    "candidates": [
+                        chosen,
+                        {"token": other, "logProbability": math.log(0.1)},
+                    ][:topLogprobs]
+                }
+            ],
+        }
+
+    usage: Dict[str, Any] = {
+        "promptTokenCount": promptTokens,
+        "candidatesTokenCount": candidatesTokens,
+        "totalTokenCount": promptTokens + candidatesTokens,
+    }
+
+    if cachedTokens:
+        usage["cachedContentTokenCount"] = cachedTokens
+
+    return {"candidates": [candidate], "usageMetadata": usage, "modelVersion": model}
+
+
+def error(status: int) -> Dict[str, Any]:
+    """
+    Build a Gemini API error body.
+
+    Args:
+        status: The HTTP status of the error
+
+    Returns:
+        The error body
+    """
+    errorStatus = "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"
+
+    return {
+        "error": {
+            "code": status,
+            "message": f"Injected {errorStatus}",
+            "status": errorStatus,
+        }
+    }
+
+
+def _generate(
+    server: "FakeProviderServer", model: str, request: Dict[str, Any]
+) -> Tuple[int, Any]:
+    status = server.answer()
+
+    if status is not None:
+        return status, error(status)
+
+    config = request.get("generationConfig") or {}
+
+    return 200, generateContentResponse(
+        model,
+        promptText(request),
+        server.reply(model),
+        config.get("logprobs") if config.get("responseLogprobs") else None,
+        server.caches.get(request.get("cachedContent") or "", ""),
+    )
+
+
+def _createCache(server: "FakeProviderServer", request: Dict[str, Any]) -> Any:
+    name = f"cachedContents/{uuid.uuid4().hex}"
+    text = promptText(request)
+    ttlSeconds = float(str(request.get("ttl") or "3600s").rstrip("s"))
+
+    with server.lock:
+        server.caches[name] = text
+
+    return {
+        "name": name,
+        "model": request.get("model"),
+        "displayName": request.get("displayName", ""),
+        "createTime": _timestamp(time.time()),
+        "updateTime": _timestamp(time.time()),
+        "expireTime": _timestamp(time.time() + ttlSeconds),
+        "usageMetadata": {"totalTokenCount": countTokens(text)},
+    }
+
+
+def _batchObject(server: "FakeProviderServer", batch: FakeBatch) -> Dict[str, Any]:
+    ended = batch.ended
+    metadata: Dict[str, Any] = {
+        "@type": "type.googleapis.com/"
+        "google.ai.generativelanguage.v1beta.GenerateContentBatch",
+        "model": f"models/{batch.model}",
+        "displayName": batch.id,
+        "state": "BATCH_STATE_SUCCEEDED" if ended else "BATCH_STATE_RUNNING",
+        "createTime": _timestamp(batch.createdAt),
+        "updateTime": _timestamp(batch.endsAt if ended else batch.createdAt),
+    }
+
+    if ended:
+        metadata["endTime"] = _timestamp(batch.endsAt)
+        metadata["output"] = {
+            "inlinedResponses": {
+                "inlinedResponses": [
+                    {
+                        "response": generateContentResponse(
+                            batch.model, prompt, server.reply(batch.model)
+                        ),
+                        "metadata": {"key": customId},
+                    }
+                    for customId, prompt in batch.requests
+                ]
+            }
+        }
+
+    return {"name": f"batches/{batch.id}", "metadata": metadata, "done": ended}
+
+
+def handle(
+    server: "FakeProviderServer",
+    method: str,
+    path: str,
+    body: bytes,
+    headers: Any,
+    baseUrl: str,
+) -> Optional[Tuple[int, Any]]:
+    """
+    Answer a request if it is for a Gemini generateContent, batch or context cache
+    route.
+
+    Args:
+        server: The fake server holding the batches and caches
+        method: HTTP method
+        path: URL path
+        body: Request body
+        headers: Request headers
+        baseUrl: Scheme and host the client used
+
+    Returns:
+        Status and body, or None if the route is not Gemini's
+    """
+    match = GENERATE_PATH.match(path)
+
+    if method == "POST" and match is not None:
+        return _generate(server, match["model"], json.loads(body))
+
+    if method == "POST" and CREATE_CACHE_PATH.match(path) is not None:
+        return 200, _createCache(server, json.loads(body))
+
+    match = CACHE_PATH.match(path)
+
+    if method == "DELETE" and match is not None:
+        with server.lock:
+            server.caches.pop(match["name"], None)
+
+        return 200, {}
+
+    match = CREATE_BATCH_PATH.match(path)
+
+    if method == "POST" and match is not None:
+        requests = json.loads(body)["batch"]["inputConfig"]["requests"]["requests"]
+        batch = server.createBatch(
+            Provider.GEMINI,
+            match["model"],
+            [
+                (str(index), promptText(request["request"]))
+                for index, request in enumerate(requests)
+            ],
+        )
+
+        return 200, _batchObject(server, batch)
+
+    match = BATCH_PATH.match(path)
+
+    if method != "GET" or match is None:
+        return None
+
+    batch = server.batches.get(match["id"])
+
+    if batch is None:
+        return 404, {"error": {"code": 404, "status": "NOT_FOUND"}}
+
+    return 200, _batchObject(server, batch)
@@ -0,0 +1,299 @@
+"""
+OpenAI Responses, Files and Batch API routes of the fake provider server.
+"""
+
+import json
+import math
+import re
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ..models import Provider
+from .countTokens import countTokens
+from .FakeBatch import FakeBatch
+
+if TYPE_CHECKING:
+    from .FakeProviderServer import FakeProviderServer
+
+FILE_PATH = re.compile(r"^/v1/files/(?P<id>[^/]+)(?P<content>/content)?$")
+BATCH_PATH = re.compile(r"^/v1/batches/(?P<id>[^/]+)$")
+
+
+def promptText(params: Dict[str, Any]) -> str:
+    """
+    Join the text of a Responses API request's input messages.
+
+    Args:
+        params: The request body
+
+    Returns:
+        The text of every message, one message per line
+    """
+    texts = []
+
+    for message in params.get("input", []):
+        content = message.get("content", "")
+
+        if isinstance(content, str):
+            texts.append(content)
+        else:
+            texts.append("".join(part.get("text", "") for part in content))
+
+    return "\n".join(texts)
+
+
+def _logprob(token: str, logprob: float) -> Dict[str, Any]:
+    return {"token": token, "logprob": logprob, "bytes": list(token.encode("utf-8"))}
+
+
+def response(
+    model: str, prompt: str, reply: str, topLogprobs: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build a Responses API response.
+
+    Args:
+        model: The requested model
+        prompt: Text of the request's input messages
+        reply: The move to answer with
+        topLogprobs: Number of alternatives requested for each output token
+
+    Returns:
+        The response body, giving the reply a probability of 0.9 when logprobs
+        are requested
+    """
+    inputTokens = countTokens(prompt)
+    outputTokens = countTokens(reply)
+    outputText: Dict[str, Any] = {
+        "type": "output_text",
+        "text": reply,
+        "annotations": [],
+    }
+
+    if topLogprobs:
+        other = "D" if reply == "C" else "C"
+        outputText["logprobs"] = [
+            {
+                **_logprob(reply, math.log(0.9)),
+                "top_logprobs": [
+                    _logprob(reply, math.log(0.9)),
+                    _logprob(other, math.log(0.1)),
+                ][:topLogprobs],
+            }
+        ]
+
+    return {
+        "id": "resp_fake",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_fake",
+                "role": "assistant",
+                "status": "completed",
+                "content": [outputText],
+            }
+        ],
+        "usage": {
+            "input_tokens": inputTokens,
+            "output_tokens": outputTokens,
+            "total_tokens": inputTokens + outputTokens,
+            "input_tokens_details": {"cached_tokens": 0, "cache_write_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+def error(status: int) -> Dict[str, Any]:
+    """
+    Build a Responses API error body.
+
+    Args:
+        status: The HTTP status of the error
+
+    Returns:
+        The error body
+    """
+    errorType = "rate_limit_exceeded" if status == 429 else "server_error"
+
+    return {
+        "error": {
+            "message": f"Injected {errorType}",
+            "type": errorType,
+            "param": None,
+            "code": errorType,
+        }
+    }
+
+
+def _fileObject(fileId: str, content: str) -> Dict[str, Any]:
+    return {
+        "id": fileId,
+        "object": "file",
+        "bytes": len(content.encode("utf-8")),
+        "created_at": int(time.time()),
+        "filename": f"{fileId}.jsonl",
+        "purpose": "batch",
+        "status": "processed",
+    }
+
+
+def _uploadedFile(body: bytes, contentType: str) -> str:
+    """The content of the `file` field of a multipart upload."""
+    form = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {contentType}\r\n\r\n".encode("utf-8") + body
+    )
+
+    for part in form.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True).decode("utf-8")
+
+    return ""
+
+
+def _batchObject(server: "FakeProviderServer", batch: FakeBatch) -> Dict[str, Any]:
+    ended = batch.ended
+    count = len(batch.requests)
+
+    with server.lock:
+        if ended and batch.outputFileId is None:
+            batch.outputFileId = f"file-{uuid.uuid4().hex}"
+            server.files[batch.outputFileId] = "".join(
+                json.dumps(
+                    {
+                        "id": f"batch_req_{index}",
+                        "custom_id": customId,
+                        "response": {
+                            "status_code": 200,
+                            "request_id": f"req_{index}",
+                            "body": response(
+                                batch.model, prompt, server.reply(batch.model)
+                            ),
+                        },
+                        "error": None,
+                    }
+                )
+                + "\n"
+                for index, (customId, prompt) in enumerate(batch.requests)
+            )
+
+    return {
+        "id": batch.id,
+        "object": "batch",
+        "endpoint": "/v1/responses",
+        "input_file_id": "file-input",
+        "completion_window": "24h",
+        "status": "completed" if ended else "in_progress",
+        "created_at": int(batch.createdAt),
+        "completed_at": int(batch.endsAt) if ended else None,
+        "output_file_id": batch.outputFileId,
+        "request_counts": {
+            "total": count,
+            "completed": count if ended else 0,
+            "failed": 0,
+        },
+    }
+
+
+def handle(
+    server: "FakeProviderServer",
+    method: str,
+    path: str,
+    body: bytes,
+    headers: Any,
+    baseUrl: str,
+) -> Optional[Tuple[int, Any]]:
+    """
+    Answer a request if it is for a Responses, Files or Batch API route.
+
+    Args:
+        server: The fake server holding the files and batches
+        method: HTTP method
+        path: URL path
+        body: Request body
+        headers: Request headers
+        baseUrl: Scheme and host the client used
+
+    Returns:
+        Status and body, or None if the route is not OpenAI's
+    """
+    if method == "POST" and path == "/v1/responses":
+        params = json.loads(body)
+        status = server.answer()
+
+        if status is not None:
+            return status, error(status)
+
+        return 200, response(
+            params["model"],
+            promptText(params),
+            server.reply(params["model"]),
+            params.get("top_logprobs"),
+        )
+
+    if method == "POST" and path == "/v1/files":
+        fileId = f"file-{uuid.uuid4().hex}"
+        content = _uploadedFile(body, headers.get("Content-Type", ""))
+
+        with server.lock:
+            server.files[fileId] = content
+
+        return 200, _fileObject(fileId, content)
+
+    if method == "POST" and path == "/v1/batches":
+        inputFileId = json.loads(body)["input_file_id"]
+        lines = [
+            json.loads(line)
+            for line in server.files.get(inputFileId, "").splitlines()
+            if line.strip()
+        ]
+        batch = server.createBatch(
+            Provider.OPENAI,
+            lines[0]["body"]["model"] if lines else "",
+            [(line["custom_id"], promptText(line["body"])) for line in lines],
+        )
+
+        return 200, _batchObject(server, batch)
+
+    match = BATCH_PATH.match(path)
+
+    if method == "GET" and match is not None:
+        batch = server.batches.get(match["id"])
+
+        if batch is None:
+            return 404, {"error": {"message": "No such batch"}}
+
+        return 200, _batchObject(server, batch)
+
+    match = FILE_PATH.match(path)
+
+    if match is None:
+        return None
+
+    content = server.files.get(match["id"])
+
+    if content is None:
+        return 404, {"error": {"message": "No such file"}}
+
+    if method == "DELETE":
+        with server.lock:
+            server.files.pop(match["id"], None)
+
+        return 200, {"id": match["id"], "object": "file", "deleted": True}
+
+    if method == "GET" and match["content"]:
+        return 200, content
+
+    if method == "GET":
+        return 200, _fileObject(match["id"], content)
+
+    return None
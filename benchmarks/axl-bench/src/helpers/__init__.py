@@ -1,19 +1,35 @@
 from .anthropic import runPrompt as anthropicRunPrompt
+from .anthropic import runPromptAsync as anthropicRunPromptAsync
+from .buildMatchGraph import buildMatchGraph
 from .gemini import runPrompt as geminiRunPrompt
+from .gemini import runPromptAsync as geminiRunPromptAsync
 from .generateLlmPlayers import generateLlmPlayers
 from .generateVisualizations import generateVisualizations
+from .getProvider import getProvider
 from .openai import runPrompt as openaiRunPrompt
+from .openai import runPromptAsync as openaiRunPromptAsync
+from .runBatch import runBatch
 from .runPrompt import runPrompt
+from .runPromptAsync import runPromptAsync
 from .runTournamentIteration import runTournamentIteration
 from .saveResults import saveResults
+from .supportsLogprobs import supportsLogprobs
 
 __all__ = [
     "anthropicRunPrompt",
+    "anthropicRunPromptAsync",
+    "buildMatchGraph",
     "geminiRunPrompt",
+    "geminiRunPromptAsync",
     "generateLlmPlayers",
     "generateVisualizations",
+    "getProvider",
     "openaiRunPrompt",
+    "openaiRunPromptAsync",
+    "runBatch",
     "runPrompt",
+    "runPromptAsync",
     "runTournamentIteration",
     "saveResults",
+    "supportsLogprobs",
 ]
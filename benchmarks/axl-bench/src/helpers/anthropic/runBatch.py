@@ -0,0 +1,54 @@
+import asyncio
+from typing import List, Optional
+
+from anthropic import AsyncAnthropic
+
+from ...models import PromptRequest, PromptResponse
+from .runPrompt import buildRequestParams, parseResponse
+
+
+async def runBatch(
+    client: AsyncAnthropic,
+    requests: List[PromptRequest],
+    pollIntervalSeconds: float,
+) -> List[Optional[PromptResponse]]:
+    """
+    Run prompts as one Anthropic Message Batch and wait for it to end.
+
+    Args:
+        client: AsyncAnthropic client instance
+        requests: The requests to send, all for the same model
+        pollIntervalSeconds: Seconds between checks of the batch's status
+
+    Returns:
+        The response to each request, or None where the batch has no successful
+        result for it
+    """
+
+    batch = await client.messages.batches.create(
+        requests=[
+            {
+                "custom_id": str(index),
+                "params": buildRequestParams(
+                    request.model,
+                    request.maxTokens,
+                    request.temperature,
+                    request.messages,
+                    request.enableGrounding,
+                ),
+            }
+            for index, request in enumerate(requests)
+        ]
+    )
+
+    while batch.processing_status != "ended":
+        await asyncio.sleep(pollIntervalSeconds)
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    responses: List[Optional[PromptResponse]] = [None] * len(requests)
+
+    async for entry in await client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            responses[int(entry.custom_id)] = parseResponse(entry.result.message)
+
+    return responses
@@ -1,25 +1,47 @@
 from typing import Any, Dict, List, Optional
 
 from anthropic import Anthropic
+from anthropic.types import Message as AnthropicMessage
 from anthropic.types import TextBlock
 
-from ...models import ClaudeModelGrounding, Message
+from ...models import ClaudeModelGrounding, Message, PromptResponse
 
 
-def runPrompt(
-    client: Anthropic,
+def _messageParam(msg: Message) -> Dict[str, Any]:
+    if not msg.prefixLength:
+        return msg.model_dump()
+
+    content: List[Dict[str, Any]] = [
+        {
+            "type": "text",
+            "text": msg.content[: msg.prefixLength],
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+    # The API rejects empty text blocks
+    if msg.content[msg.prefixLength :]:
+        content.append({"type": "text", "text": msg.content[msg.prefixLength :]})
+
+    return {"role": msg.role, "content": content}
+
+
+def buildRequestParams(
     model: str,
     maxTokens: int,
     temperature: float,
     messages: List[Message],
     enableGrounding: bool = False,
     countryCode: Optional[str] = None,
-) -> str:
+) -> Dict[str, Any]:
     """
-    Run a prompt through the Anthropic API.
+    Build the Messages API request parameters shared by the sync and async helpers.
+
+    The static prefix of a message (its `prefixLength` characters) is sent as a
+    separate text block marked with `cache_control`, so repeated requests with the
+    same game rules read it from Anthropic's prompt cache.
 
     Args:
-        client: Anthropic client instance
         model: Model identifier
         maxTokens: Maximum tokens to generate
         temperature: Sampling temperature
@@ -28,15 +50,14 @@ def runPrompt(
         countryCode: ISO 3166-1 alpha-2 country code for web search location
 
     Returns:
-        Generated text response
+        Keyword arguments for `messages.create`
     """
 
-    textParts: List[str] = []
     requestParams: Dict[str, Any] = {
         "model": model,
         "max_tokens": maxTokens,
         "temperature": temperature,
-        "messages": [msg.model_dump() for msg in messages],
+        "messages": [_messageParam(msg) for msg in messages],
     }
 
     if enableGrounding and any(
@@ -56,10 +77,75 @@ def runPrompt(
 
         requestParams["tools"] = [webSearchTool]
 
-    response = client.messages.create(**requestParams)
+    return requestParams
+
+
+def parseResponse(response: AnthropicMessage) -> PromptResponse:
+    """
+    Join the text blocks of a Messages API response.
+
+    Args:
+        response: The Messages API response
+
+    Returns:
+        Generated text response (the Messages API does not expose logprobs), with
+        its token counts
+    """
+
+    textParts: List[str] = []
 
     for block in response.content:
         if isinstance(block, TextBlock):
             textParts.append(block.text)
 
-    return "".join(textParts)
+    # `input_tokens` only counts the tokens after the last cache breakpoint
+    usage = response.usage
+    cachedInputTokens = usage.cache_read_input_tokens or 0
+    # Only reported by recent SDK versions
+    outputTokensDetails = getattr(usage, "output_tokens_details", None)
+
+    return PromptResponse(
+        text="".join(textParts),
+        inputTokens=usage.input_tokens
+        + cachedInputTokens
+        + (usage.cache_creation_input_tokens or 0),
+        cachedInputTokens=cachedInputTokens,
+        outputTokens=usage.output_tokens,
+        reasoningTokens=(
+            outputTokensDetails.thinking_tokens if outputTokensDetails else 0
+        ),
+    )
+
+
+def runPrompt(
+    client: Anthropic,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    countryCode: Optional[str] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the Anthropic API.
+
+    Args:
+        client: Anthropic client instance
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: Text-only messages (role + content)
+        enableGrounding: Enable web search if supported by model
+        countryCode: ISO 3166-1 alpha-2 country code for web search location
+
+    Returns:
+        Generated text response
+    """
+
+    response = client.messages.create(
+        **buildRequestParams(
+            model, maxTokens, temperature, messages, enableGrounding, countryCode
+        )
+    )
+
+    return parseResponse(response)
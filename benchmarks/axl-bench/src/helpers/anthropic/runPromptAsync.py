@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+from anthropic import AsyncAnthropic
+
+from ...models import Message, PromptResponse
+from .runPrompt import buildRequestParams, parseResponse
+
+
+async def runPromptAsync(
+    client: AsyncAnthropic,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    countryCode: Optional[str] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the Anthropic API without blocking the event loop.
+
+    Args:
+        client: AsyncAnthropic client instance
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: Text-only messages (role + content)
+        enableGrounding: Enable web search if supported by model
+        countryCode: ISO 3166-1 alpha-2 country code for web search location
+
+    Returns:
+        Generated text response
+    """
+
+    response = await client.messages.create(
+        **buildRequestParams(
+            model, maxTokens, temperature, messages, enableGrounding, countryCode
+        )
+    )
+
+    return parseResponse(response)
@@ -0,0 +1,124 @@
+"""
+Helper function to choose which pairs of players meet in a tournament.
+"""
+
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import axelrod as axl
+from axelrod import Classifiers
+
+from ..models import MatchGraphMode
+from ..strategies import CompletionLLM
+
+
+def buildMatchGraph(
+    players: List[axl.Player],
+    mode: MatchGraphMode = MatchGraphMode.FULL,
+    seed: int = 42,
+    samplesPerCluster: int = 2,
+    pairs: Optional[Sequence[Tuple[str, str]]] = None,
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Build the edges of a tournament's match graph.
+
+    Classical strategies are clustered by whether they are stochastic and by
+    their memory depth (none, one turn, a few turns or unbounded). In STRATIFIED
+    mode each LLM player meets `samplesPerCluster` strategies drawn with `seed`
+    from every cluster, the same sample for every LLM player. Classical players
+    keep their self-play match, as in the full round robin; LLM players do not.
+
+    Args:
+        players: The tournament's players
+        mode: How to choose the pairs
+        seed: Seed for drawing the STRATIFIED sample
+        samplesPerCluster: Classical opponents per cluster in STRATIFIED mode
+        pairs: Names of the players in each match, for PAIRS mode
+
+    Returns:
+        The index pairs to play, or None for the full round robin
+
+    Raises:
+        ValueError: If a pair names an unknown player, or a player has no match
+    """
+    if mode == MatchGraphMode.FULL:
+        return None
+
+    if mode == MatchGraphMode.PAIRS:
+        indexByName: Dict[str, int] = {
+            str(player): index for index, player in enumerate(players)
+        }
+        edges: List[Tuple[int, int]] = []
+
+        for playerName, opponentName in pairs or []:
+            for name in (playerName, opponentName):
+                if name not in indexByName:
+                    raise ValueError(f"Unknown player in match pairs: {name}")
+
+            playerIndex = indexByName[playerName]
+            opponentIndex = indexByName[opponentName]
+            edge = (min(playerIndex, opponentIndex), max(playerIndex, opponentIndex))
+
+            if edge not in edges:
+                edges.append(edge)
+    else:
+        llmIndices = [
+            index
+            for index, player in enumerate(players)
+            if isinstance(player, CompletionLLM)
+        ]
+        classicalIndices = [
+            index
+            for index, player in enumerate(players)
+            if not isinstance(player, CompletionLLM)
+        ]
+        opponentIndices = classicalIndices
+
+        if mode == MatchGraphMode.STRATIFIED:
+            clusters: Dict[Tuple[bool, str], List[int]] = defaultdict(list)
+
+            for index in classicalIndices:
+                memoryDepth = Classifiers["memory_depth"](players[index])
+
+                if memoryDepth == float("inf"):
+                    memory = "unbounded"
+                elif memoryDepth > 1:
+                    memory = "bounded"
+                else:
+                    memory = str(memoryDepth)
+
+                stochastic = bool(Classifiers["stochastic"](players[index]))
+                clusters[(stochastic, memory)].append(index)
+
+            sampler = random.Random(seed)
+            opponentIndices = sorted(
+                index
+                for key in sorted(clusters)
+                for index in sampler.sample(
+                    clusters[key], min(samplesPerCluster, len(clusters[key]))
+                )
+            )
+
+        edges = [
+            (first, second)
+            for position, first in enumerate(classicalIndices)
+            for second in classicalIndices[position:]
+        ]
+        edges += [
+            (min(llmIndex, opponentIndex), max(llmIndex, opponentIndex))
+            for llmIndex in llmIndices
+            for opponentIndex in opponentIndices
+        ]
+
+    unmatched = set(range(len(players))).difference(
+        index for edge in edges for index in edge
+    )
+
+    if unmatched:
+        raise ValueError(
+            "Players without a match: "
+            + ", ".join(str(players[index]) for index in sorted(unmatched))
+        )
+
+    return edges
@@ -1,3 +1,5 @@
+from .runBatch import runBatch
 from .runPrompt import runPrompt
+from .runPromptAsync import runPromptAsync
 
-__all__ = ["runPrompt"]
+__all__ = ["runBatch", "runPrompt", "runPromptAsync"]
@@ -0,0 +1,69 @@
+import asyncio
+from typing import List, Optional
+
+from google import genai
+from google.genai import types
+
+from ...models import PromptRequest, PromptResponse
+from .runPrompt import buildRequestParams, parseResponse
+
+TERMINAL_STATES = (
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+)
+
+
+async def runBatch(
+    client: genai.Client,
+    requests: List[PromptRequest],
+    pollIntervalSeconds: float,
+) -> List[Optional[PromptResponse]]:
+    """
+    Run prompts as one Gemini batch job with inlined requests.
+
+    Batched requests carry their whole prompt; explicit context caches are not
+    used, since the batch is billed at a discount anyway.
+
+    Args:
+        client: Gemini Client instance (its `aio` interface is used)
+        requests: The requests to send, all for the same model
+        pollIntervalSeconds: Seconds between checks of the job's state
+
+    Returns:
+        The response to each request, or None where the job has no successful
+        result for it
+    """
+
+    inlinedRequests: List[types.InlinedRequest] = []
+
+    for request in requests:
+        params = buildRequestParams(
+            request.model,
+            request.maxTokens,
+            request.temperature,
+            request.messages,
+            request.enableGrounding,
+            request.topLogprobs,
+        )
+        inlinedRequests.append(
+            types.InlinedRequest(contents=params["contents"], config=params["config"])
+        )
+
+    job = await client.aio.batches.create(model=requests[0].model, src=inlinedRequests)
+
+    while job.state not in TERMINAL_STATES:
+        await asyncio.sleep(pollIntervalSeconds)
+        job = await client.aio.batches.get(name=job.name)
+
+    responses: List[Optional[PromptResponse]] = [None] * len(requests)
+
+    # Inlined responses come back in the order of the requests
+    for index, entry in enumerate(
+        (job.dest.inlined_responses or []) if job.dest else []
+    ):
+        if entry.response is not None and entry.error is None:
+            responses[index] = parseResponse(entry.response)
+
+    return responses
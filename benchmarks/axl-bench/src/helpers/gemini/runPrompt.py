@@ -1,34 +1,87 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from google import genai
 from google.genai import types
 
-from ...models import GeminiModelGrounding, Message
+from ...models import (
+    GeminiModelGrounding,
+    GeminiModelLogprobs,
+    Message,
+    PromptResponse,
+)
+from ...runtime import contextCache
 
 
-def runPrompt(
-    client: genai.Client,
+def _isGrounded(model: str, enableGrounding: bool) -> bool:
+    return enableGrounding and any(
+        model.replace("models/", "").startswith(member.value)
+        for member in GeminiModelGrounding
+    )
+
+
+def staticPrefix(model: str, messages: List[Message], enableGrounding: bool) -> str:
+    """
+    The prefix worth putting in an explicit context cache, if any.
+
+    Grounded requests are left alone, since a request using a cache cannot add
+    tools of its own.
+
+    Args:
+        model: Model identifier
+        messages: Text-only messages (role + content)
+        enableGrounding: Enable Google Search grounding if supported by model
+
+    Returns:
+        The first message's static prefix, or "" if there is none
+    """
+
+    if not messages or not messages[0].prefixLength:
+        return ""
+
+    if _isGrounded(model, enableGrounding):
+        return ""
+
+    return messages[0].content[: messages[0].prefixLength]
+
+
+def buildRequestParams(
     model: str,
     maxTokens: int,
     temperature: float,
     messages: List[Message],
     enableGrounding: bool = False,
-) -> str:
+    topLogprobs: Optional[int] = None,
+    cachedContent: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Run a prompt through the Gemini API.
+    Build the generateContent request parameters shared by the sync and async helpers.
 
     Args:
-        client: Gemini Client instance
         model: Model identifier
         maxTokens: Maximum tokens to generate
         temperature: Sampling temperature
         messages: Text-only messages (role + content)
         enableGrounding: Enable Google Search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
+        cachedContent: Name of a context cache holding the first message's static
+            prefix, which is then left out of the request
 
     Returns:
-        Generated text response
+        Keyword arguments for `models.generate_content`
     """
 
+    if cachedContent is not None:
+        messages = [
+            messages[0].model_copy(
+                update={
+                    "content": messages[0].content[messages[0].prefixLength :],
+                    "prefixLength": None,
+                }
+            ),
+            *messages[1:],
+        ]
+
     contents = (
         messages[0].content
         if len(messages) == 1
@@ -41,25 +94,107 @@ def runPrompt(
         ]
     )
 
-    if enableGrounding and any(
-        model.replace("models/", "").startswith(member.value)
-        for member in GeminiModelGrounding
+    config = types.GenerateContentConfig(
+        temperature=temperature,
+        max_output_tokens=maxTokens,
+        cached_content=cachedContent,
+    )
+
+    if _isGrounded(model, enableGrounding):
+        config.tools = [types.Tool(google_search=types.GoogleSearch())]
+
+    if topLogprobs and any(
+        model.replace("models/", "") == member.value for member in GeminiModelLogprobs
     ):
-        config = types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=maxTokens,
-            tools=[types.Tool(google_search=types.GoogleSearch())],
-        )
-    else:
-        config = types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=maxTokens,
-        )
+        config.response_logprobs = True
+        config.logprobs = topLogprobs
+
+    return {"model": model, "contents": contents, "config": config}
+
+
+def parseResponse(response: types.GenerateContentResponse) -> PromptResponse:
+    """
+    Extract the text of a generateContent response.
 
+    Args:
+        response: The generateContent response
+
+    Returns:
+        Generated text response, with the first token's alternatives if requested
+        and its token counts
+    """
+
+    topLogprobs: Optional[Dict[str, float]] = None
+    logprobsResult = (
+        response.candidates[0].logprobs_result if response.candidates else None
+    )
+
+    if logprobsResult and logprobsResult.top_candidates:
+        topLogprobs = {
+            candidate.token: candidate.log_probability
+            for candidate in logprobsResult.top_candidates[0].candidates or []
+            if candidate.token is not None and candidate.log_probability is not None
+        }
+
+    usage = response.usage_metadata
+
+    return PromptResponse(
+        text=response.text or "",
+        topLogprobs=topLogprobs,
+        inputTokens=usage.prompt_token_count if usage else None,
+        cachedInputTokens=(usage.cached_content_token_count or 0) if usage else None,
+        # Thinking tokens are billed as output but not counted in the candidates
+        outputTokens=(
+            (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+            if usage
+            else None
+        ),
+        reasoningTokens=(usage.thoughts_token_count or 0) if usage else None,
+    )
+
+
+def runPrompt(
+    client: genai.Client,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    topLogprobs: Optional[int] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the Gemini API.
+
+    When the context cache is enabled, the static prompt prefix is read from an
+    explicit Gemini cache instead of being sent with every request.
+
+    Args:
+        client: Gemini Client instance
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: Text-only messages (role + content)
+        enableGrounding: Enable Google Search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
+
+    Returns:
+        Generated text response
+    """
+
+    cachedContent = contextCache.lookup(
+        client, model, staticPrefix(model, messages, enableGrounding)
+    )
     response = client.models.generate_content(
-        model=model,
-        contents=contents,
-        config=config,
+        **buildRequestParams(
+            model,
+            maxTokens,
+            temperature,
+            messages,
+            enableGrounding,
+            topLogprobs,
+            cachedContent,
+        )
     )
 
-    return response.text or ""
+    return parseResponse(response)
@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from google import genai
+
+from ...models import Message, PromptResponse
+from ...runtime import contextCache
+from .runPrompt import buildRequestParams, parseResponse, staticPrefix
+
+
+async def runPromptAsync(
+    client: genai.Client,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    topLogprobs: Optional[int] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the Gemini API without blocking the event loop.
+
+    Args:
+        client: Gemini Client instance (its `aio` interface is used)
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: Text-only messages (role + content)
+        enableGrounding: Enable Google Search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
+
+    Returns:
+        Generated text response
+    """
+
+    cachedContent = await contextCache.lookupAsync(
+        client, model, staticPrefix(model, messages, enableGrounding)
+    )
+    response = await client.aio.models.generate_content(
+        **buildRequestParams(
+            model,
+            maxTokens,
+            temperature,
+            messages,
+            enableGrounding,
+            topLogprobs,
+            cachedContent,
+        )
+    )
+
+    return parseResponse(response)
@@ -9,11 +9,13 @@ import axelrod as axl
 from ..models import (
     ClaudeModel,
     ClaudeModelGrounding,
+    DecisionMode,
     GeminiModel,
     GeminiModelGrounding,
     OpenAiModel,
     OpenAiModelGrounding,
     PromptConfig,
+    PromptMode,
 )
 from ..prompts.contextualized import (
     STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY,
@@ -21,7 +23,9 @@ from ..prompts.contextualized import (
     STRATEGY_PROBABILISTIC_END_FULL_HISTORY,
     STRATEGY_PROBABILISTIC_END_LAST_TURNS,
 )
+from ..prompts.contextualized import TURN_UPDATE as CONTEXTUALIZED_TURN_UPDATE
 from ..prompts.uncontextualized import STRATEGY_FULL_HISTORY, STRATEGY_LAST_TURNS
+from ..prompts.uncontextualized import TURN_UPDATE as UNCONTEXTUALIZED_TURN_UPDATE
 from ..strategies import CompletionLLM
 
 
@@ -31,6 +35,8 @@ def generateLlmPlayers(
     includeGrounding: bool = True,
     maxTokens: int = 1024,
     temperature: float = 1.0,
+    decisionMode: DecisionMode = DecisionMode.TEXT,
+    promptMode: PromptMode = PromptMode.STATELESS,
 ) -> List[axl.Player]:
     """
     Generates all LLM players for the benchmark.
@@ -46,6 +52,9 @@ def generateLlmPlayers(
         includeGrounding: Whether to include grounding-enabled models
         maxTokens: Maximum tokens for LLM responses
         temperature: Temperature parameter for LLM
+        decisionMode: How players turn model responses into moves
+        promptMode: How players show the game history to the model; the
+            conversation mode only applies to full-history prompts
 
     Returns:
         List of all CompletionLLM players
@@ -55,6 +64,7 @@ def generateLlmPlayers(
         PromptConfig(
             template=STRATEGY_FULL_HISTORY,
             nameSuffix="FullHist",
+            turnTemplate=UNCONTEXTUALIZED_TURN_UPDATE,
         ),
         PromptConfig(
             template=STRATEGY_LAST_TURNS,
@@ -65,6 +75,7 @@ def generateLlmPlayers(
             template=STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY,
             nameSuffix="PredetFullHist",
             numTurns=numTurns,
+            turnTemplate=CONTEXTUALIZED_TURN_UPDATE,
         ),
         PromptConfig(
             template=STRATEGY_PREDETERMINED_TURNS_LAST_TURNS,
@@ -77,6 +88,7 @@ def generateLlmPlayers(
             template=STRATEGY_PROBABILISTIC_END_FULL_HISTORY,
             nameSuffix="ProbEndFullHist",
             endProbability=10.0,  # 10% chance of ending each turn
+            turnTemplate=CONTEXTUALIZED_TURN_UPDATE,
         ),
         PromptConfig(
             template=STRATEGY_PROBABILISTIC_END_LAST_TURNS,
@@ -97,9 +109,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -113,9 +128,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -129,9 +147,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -146,9 +167,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -162,9 +186,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -178,9 +205,12 @@ def generateLlmPlayers(
                         historyLastTurns=config.historyLastTurns,
                         numTurns=config.numTurns,
                         endProbability=config.endProbability,
+                        turnTemplate=config.turnTemplate,
                         model=model,
                         maxTokens=maxTokens,
                         temperature=temperature,
+                        decisionMode=decisionMode,
+                        promptMode=promptMode,
                     )
                 )
 
@@ -2,21 +2,226 @@
 Helper function to generate and save tournament visualizations.
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import seaborn as sns
-from models import TournamentIterationResult
+
+from ..models import TournamentIterationResult
+from ..runtime import (
+    ITERATION_LOG_FILENAME,
+    MATRIX_DIRNAME,
+    MATRIX_MANIFEST_FILENAME,
+    MatrixStore,
+)
+
+FIGURE_MANIFEST_FILENAME = "figures.json"
+PLAYER_COLUMNS = ["iteration", "player", "score", "rank", "wins", "cooperationRate"]
+
+
+def _plotScoreDistribution(data: Dict[str, Any], path: str, dpi: int) -> None:
+    fig, ax = plt.subplots(figsize=(16, 10))
+    ax.boxplot(data["scores"], tick_labels=data["names"])
+    ax.set_xlabel("Player", fontsize=12)
+    ax.set_ylabel("Score", fontsize=12)
+    ax.set_title("Score Distribution - Top 20 Players", fontsize=14, fontweight="bold")
+    plt.xticks(rotation=90, ha="right")
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _plotBars(data: Dict[str, Any], path: str, dpi: int) -> None:
+    names, values = data["names"], data["values"]
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    bars = ax.barh(range(len(names)), values)
+    ax.set_yticks(range(len(names)))
+    ax.set_yticklabels(names)
+    ax.set_xlabel(data["xlabel"], fontsize=12)
+    ax.set_title(data["title"], fontsize=14, fontweight="bold")
+    ax.invert_yaxis()
+
+    # Color bars by value
+    cmap = plt.colormaps[data["cmap"]]
+    normalize = plt.Normalize(vmin=min(values), vmax=max(values))
+    for i, bar in enumerate(bars):
+        bar.set_color(cmap(normalize(values[i])))
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _plotCooperationRates(data: Dict[str, Any], path: str, dpi: int) -> None:
+    names, rates = data["names"], data["rates"]
+
+    fig, ax = plt.subplots(figsize=(8, 12))
+    im = ax.imshow([[rate] for rate in rates], cmap="RdYlGn", aspect="auto")
+    ax.set_yticks(range(len(names)))
+    ax.set_yticklabels(names, fontsize=8)
+    ax.set_xticks([0])
+    ax.set_xticklabels(["Cooperation Rate"])
+    ax.set_title(
+        "Average Cooperation Rate - Top 30 Players", fontsize=14, fontweight="bold"
+    )
+
+    # Add colorbar
+    cbar = plt.colorbar(im, ax=ax)
+    cbar.set_label("Cooperation Rate", fontsize=10)
+
+    # Add values as text
+    for i, rate in enumerate(rates):
+        ax.text(0, i, f"{rate:.2%}", ha="center", va="center", fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _plotScoreTrends(data: Dict[str, Any], path: str, dpi: int) -> None:
+    fig, ax = plt.subplots(figsize=(14, 8))
+    for name, scores in zip(data["names"], data["scores"]):
+        ax.plot(data["iterations"], scores, marker="o", label=name, linewidth=2)
+
+    ax.set_xlabel("Iteration", fontsize=12)
+    ax.set_ylabel("Score", fontsize=12)
+    ax.set_title(
+        "Score Trends Across Iterations - Top 10 Players",
+        fontsize=14,
+        fontweight="bold",
+    )
+    ax.legend(bbox_to_anchor=(1.05, 1), loc="upper left", fontsize=9)
+    ax.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _plotPayoffMatrix(data: Dict[str, Any], path: str, dpi: int) -> None:
+    names = data["names"]
+
+    fig, ax = plt.subplots(figsize=(16, 14))
+    im = ax.imshow(data["matrix"], cmap="YlOrRd", aspect="auto")
+    ax.set_xticks(range(len(names)))
+    ax.set_yticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=90, ha="right", fontsize=7)
+    ax.set_yticklabels(names, fontsize=7)
+    ax.set_title(
+        "Average Payoff Matrix - Top 30 Players", fontsize=14, fontweight="bold"
+    )
+
+    # Add colorbar
+    cbar = plt.colorbar(im, ax=ax)
+    cbar.set_label("Average Score", fontsize=10)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close()
+
+
+def _renderFigure(
+    plot: Callable[[Dict[str, Any], str, int], None],
+    data: Dict[str, Any],
+    path: str,
+    dpi: int,
+) -> None:
+    """Render one figure; runs in a worker process, so it sets the style itself."""
+    sns.set_style("whitegrid")
+    plot(data, path, dpi)
+
+
+def _iterateResults(runPath: Path) -> Iterator[TournamentIterationResult]:
+    """Stream a run's iterations from its log, or from `full_results.json`."""
+    logPath = runPath / ITERATION_LOG_FILENAME
+
+    if logPath.exists():
+        with open(logPath, "r", encoding="utf-8") as f:
+            for line in f:
+                yield TournamentIterationResult.model_validate_json(line)
+
+        return
+
+    with open(runPath / "full_results.json", "r") as f:
+        for iteration in json.load(f)["iterations"]:
+            yield TournamentIterationResult(**iteration)
+
+
+def _loadPlayerResults(runPath: Path) -> pd.DataFrame:
+    """One row per (iteration, player) of every successful iteration."""
+    detailedCsvPath = runPath / "detailedResults.csv"
+
+    if detailedCsvPath.exists():
+        return pd.read_csv(detailedCsvPath)
+
+    return pd.DataFrame(
+        [
+            {
+                "iteration": iteration.iteration,
+                "player": playerResult.name,
+                "score": playerResult.score,
+                "rank": playerResult.rank,
+                "wins": playerResult.wins,
+                "cooperationRate": playerResult.cooperationRate,
+            }
+            for iteration in _iterateResults(runPath)
+            if not iteration.error
+            for playerResult in iteration.playerResults
+        ],
+        columns=PLAYER_COLUMNS,
+    )
+
+
+def _loadMeanPayoffBlock(runPath: Path, names: List[str]) -> Optional[np.ndarray]:
+    """Average payoff matrix restricted to `names`, or None if none was saved."""
+    if (runPath / MATRIX_DIRNAME / MATRIX_MANIFEST_FILENAME).exists():
+        matrixStore = MatrixStore(str(runPath / MATRIX_DIRNAME))
+        indices = [matrixStore.playerNames.index(name) for name in names]
+
+        return matrixStore.mean("payoffMatrix", indices, indices)
+
+    # Runs saved before the matrix store keep the matrices inline
+    total: Optional[np.ndarray] = None
+    count = 0
+
+    for iteration in _iterateResults(runPath):
+        if iteration.payoffMatrix is None or iteration.error:
+            continue
+
+        indices = [iteration.playerNames.index(name) for name in names]
+        block = np.array(iteration.payoffMatrix)[np.ix_(indices, indices)]
+        total = block if total is None else total + block
+        count += 1
+
+    return total / count if total is not None else None
+
+
+def _hashInputs(plot: Callable, data: Dict[str, Any], dpi: int) -> str:
+    payload = json.dumps(
+        {"plot": plot.__name__, "dpi": dpi, "data": data}, sort_keys=True
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 def generateVisualizations(
-    allResults: List[TournamentIterationResult],
-    outputDir: str,
+    runDir: str,
+    outputDir: Optional[str] = None,
+    imageFormat: str = "png",
+    dpi: int = 300,
+    processes: Optional[int] = None,
+    force: bool = False,
 ) -> Dict[str, str]:
     """
-    Generates and saves visualizations from tournament results.
+    Generates and saves visualizations for a saved run directory.
 
     Creates:
     - Score distribution boxplots
@@ -26,250 +231,178 @@ def generateVisualizations(
     - Top players comparison charts
     - Score trends across iterations
 
+    Player statistics are read from `detailedResults.csv` (or the iteration log) and
+    aggregated once with pandas; the payoff block is averaged from the matrix store
+    when the run has one. Figures are rendered in parallel worker processes. A
+    figure whose inputs, format and dpi match the previous render recorded in
+    `figures.json` is not rendered again, so plots of old runs can be regenerated
+    without re-running their tournaments.
+
     Args:
-        allResults: List of all tournament iteration results
-        outputDir: Directory to save visualizations
+        runDir: Directory of a saved run
+        outputDir: Directory to save visualizations (default: `runDir`)
+        imageFormat: Matplotlib output format, e.g. "png", "svg" or "pdf"
+        dpi: Resolution of raster formats (default: 300)
+        processes: Worker processes used to render figures (default: all cores)
+        force: Render every figure, even if its inputs are unchanged
 
     Returns:
         Dictionary with paths to saved visualization files
     """
-    outputPath = Path(outputDir)
+    runPath = Path(runDir)
+    outputPath = Path(outputDir) if outputDir is not None else runPath
     outputPath.mkdir(parents=True, exist_ok=True)
 
-    savedFiles = {}
-    sns.set_style("whitegrid")
+    results = _loadPlayerResults(runPath)
 
-    # Extract data for visualizations
-    if not allResults or "playerResults" in allResults[0]:
-        print("Generating visualizations...")
-
-        # Aggregate player statistics across iterations
-        playerStats = {}
-        for iteration in allResults:
-            if "error" in iteration:
-                continue
-
-            for playerResult in iteration["playerResults"]:
-                playerName = playerResult["name"]
-
-                if playerName not in playerStats:
-                    playerStats[playerName] = {
-                        "scores": [],
-                        "ranks": [],
-                        "wins": [],
-                        "cooperationRates": [],
-                    }
-
-                playerStats[playerName]["scores"].append(playerResult["score"])
-                playerStats[playerName]["ranks"].append(playerResult["rank"])
-                playerStats[playerName]["wins"].append(playerResult["wins"])
-                playerStats[playerName]["cooperationRates"].append(
-                    playerResult["cooperationRate"]
-                )
+    if results.empty:
+        print("No valid results to visualize")
+        return {}
 
-        # 1. Score Distribution Boxplot (Top 20 players by avg score)
-        avgScores = {
-            name: sum(stats["scores"]) / len(stats["scores"])
-            for name, stats in playerStats.items()
-        }
-        topPlayers = sorted(avgScores.items(), key=lambda x: x[1], reverse=True)[:20]
-        topPlayerNames = [name for name, _ in topPlayers]
-
-        fig, ax = plt.subplots(figsize=(16, 10))
-        scoreData = [playerStats[name]["scores"] for name in topPlayerNames]
-        ax.boxplot(scoreData, labels=topPlayerNames)
-        ax.set_xlabel("Player", fontsize=12)
-        ax.set_ylabel("Score", fontsize=12)
-        ax.set_title(
-            "Score Distribution - Top 20 Players", fontsize=14, fontweight="bold"
+    print("Generating visualizations...")
+
+    # Aggregate player statistics across iterations, players in first-seen order so
+    # ties keep a stable order
+    summary = (
+        results.groupby("player", sort=False)
+        .agg(
+            avgScore=("score", "mean"),
+            avgRank=("rank", "mean"),
+            totalWins=("wins", "sum"),
+            avgCooperationRate=("cooperationRate", "mean"),
         )
-        plt.xticks(rotation=90, ha="right")
-        plt.tight_layout()
-        scorePath = outputPath / "score_distribution_top20.png"
-        plt.savefig(scorePath, dpi=300, bbox_inches="tight")
-        plt.close()
-        savedFiles["scoreDistribution"] = str(scorePath)
-        print(f"Saved score distribution to: {scorePath}")
-
-        # 2. Total Wins Bar Chart (Top 20 players)
-        totalWins = {name: sum(stats["wins"]) for name, stats in playerStats.items()}
-        topWinners = sorted(totalWins.items(), key=lambda x: x[1], reverse=True)[:20]
-
-        fig, ax = plt.subplots(figsize=(14, 8))
-        names = [name for name, _ in topWinners]
-        wins = [w for _, w in topWinners]
-        bars = ax.barh(range(len(names)), wins)
-        ax.set_yticks(range(len(names)))
-        ax.set_yticklabels(names)
-        ax.set_xlabel("Total Wins", fontsize=12)
-        ax.set_title("Total Wins - Top 20 Players", fontsize=14, fontweight="bold")
-        ax.invert_yaxis()
-
-        # Color bars by value
-        cmap = plt.cm.get_cmap("viridis")
-        normalize = plt.Normalize(vmin=min(wins), vmax=max(wins))
-        for i, bar in enumerate(bars):
-            bar.set_color(cmap(normalize(wins[i])))
-
-        plt.tight_layout()
-        winsPath = outputPath / "total_wins_top20.png"
-        plt.savefig(winsPath, dpi=300, bbox_inches="tight")
-        plt.close()
-        savedFiles["totalWins"] = str(winsPath)
-        print(f"Saved total wins chart to: {winsPath}")
-
-        # 3. Cooperation Rates Heatmap (Top 30 players)
-        topCoopPlayers = sorted(avgScores.items(), key=lambda x: x[1], reverse=True)[
-            :30
-        ]
-        topCoopNames = [name for name, _ in topCoopPlayers]
-
-        coopData = []
-        for name in topCoopNames:
-            avgCoop = sum(playerStats[name]["cooperationRates"]) / len(
-                playerStats[name]["cooperationRates"]
-            )
-            avgScore = sum(playerStats[name]["scores"]) / len(
-                playerStats[name]["scores"]
-            )
-            coopData.append([avgCoop, avgScore])
-
-        fig, ax = plt.subplots(figsize=(8, 12))
-        im = ax.imshow([[row[0]] for row in coopData], cmap="RdYlGn", aspect="auto")
-        ax.set_yticks(range(len(topCoopNames)))
-        ax.set_yticklabels(topCoopNames, fontsize=8)
-        ax.set_xticks([0])
-        ax.set_xticklabels(["Cooperation Rate"])
-        ax.set_title(
-            "Average Cooperation Rate - Top 30 Players", fontsize=14, fontweight="bold"
+        .sort_values("avgScore", ascending=False, kind="stable")
+    )
+    scoresByPlayer = results.groupby("player", sort=False)["score"].agg(list)
+
+    top20 = summary.index[:20].tolist()
+    top30 = summary.index[:30].tolist()
+    topWinners = summary["totalWins"].sort_values(ascending=False, kind="stable")[:20]
+    topRanked = summary["avgRank"].sort_values(kind="stable")[:20]
+
+    figures: Dict[str, Dict[str, Any]] = {
+        "scoreDistribution": {
+            "file": "score_distribution_top20",
+            "plot": _plotScoreDistribution,
+            "data": {
+                "names": top20,
+                "scores": [
+                    [float(score) for score in scoresByPlayer[name]] for name in top20
+                ],
+            },
+        },
+        "totalWins": {
+            "file": "total_wins_top20",
+            "plot": _plotBars,
+            "data": {
+                "names": topWinners.index.tolist(),
+                "values": topWinners.tolist(),
+                "xlabel": "Total Wins",
+                "title": "Total Wins - Top 20 Players",
+                "cmap": "viridis",
+            },
+        },
+        "cooperationRates": {
+            "file": "cooperation_rates_top30",
+            "plot": _plotCooperationRates,
+            "data": {
+                "names": top30,
+                "rates": summary["avgCooperationRate"][:30].tolist(),
+            },
+        },
+        "averageRank": {
+            "file": "average_rank_top20",
+            "plot": _plotBars,
+            "data": {
+                "names": topRanked.index.tolist(),
+                "values": topRanked.tolist(),
+                "xlabel": "Average Rank",
+                "title": "Average Rank - Top 20 Players (Lower is Better)",
+                "cmap": "RdYlGn_r",
+            },
+        },
+    }
+
+    if results["iteration"].nunique() > 1:
+        trends = results.pivot_table(
+            index="iteration", columns="player", values="score", aggfunc="mean"
         )
+        top10 = top20[:10]
+        figures["scoreTrends"] = {
+            "file": "score_trends_top10",
+            "plot": _plotScoreTrends,
+            "data": {
+                "names": top10,
+                "iterations": trends.index.tolist(),
+                "scores": [
+                    [None if np.isnan(score) else float(score) for score in column]
+                    for column in (trends[name] for name in top10)
+                ],
+            },
+        }
 
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax)
-        cbar.set_label("Cooperation Rate", fontsize=10)
-
-        # Add values as text
-        for i, row in enumerate(coopData):
-            ax.text(0, i, f"{row[0]:.2%}", ha="center", va="center", fontsize=7)
-
-        plt.tight_layout()
-        coopPath = outputPath / "cooperation_rates_top30.png"
-        plt.savefig(coopPath, dpi=300, bbox_inches="tight")
-        plt.close()
-        savedFiles["cooperationRates"] = str(coopPath)
-        print(f"Saved cooperation rates to: {coopPath}")
-
-        # 4. Average Rank Comparison (Top 20 players)
-        avgRanks = {
-            name: sum(stats["ranks"]) / len(stats["ranks"])
-            for name, stats in playerStats.items()
+    payoffBlock = _loadMeanPayoffBlock(runPath, top30)
+
+    if payoffBlock is not None:
+        figures["payoffMatrix"] = {
+            "file": "payoff_matrix_top30",
+            "plot": _plotPayoffMatrix,
+            "data": {"names": top30, "matrix": payoffBlock.tolist()},
         }
-        topRankedPlayers = sorted(avgRanks.items(), key=lambda x: x[0])[:20]
-
-        fig, ax = plt.subplots(figsize=(14, 8))
-        names = [name for name, _ in topRankedPlayers]
-        ranks = [r for _, r in topRankedPlayers]
-        bars = ax.barh(range(len(names)), ranks)
-        ax.set_yticks(range(len(names)))
-        ax.set_yticklabels(names)
-        ax.set_xlabel("Average Rank", fontsize=12)
-        ax.set_title(
-            "Average Rank - Top 20 Players (Lower is Better)",
-            fontsize=14,
-            fontweight="bold",
-        )
-        ax.invert_yaxis()
-
-        # Color bars by value (reverse colormap for ranks)
-        cmap = plt.cm.get_cmap("RdYlGn_r")
-        normalize = plt.Normalize(vmin=min(ranks), vmax=max(ranks))
-        for i, bar in enumerate(bars):
-            bar.set_color(cmap(normalize(ranks[i])))
-
-        plt.tight_layout()
-        rankPath = outputPath / "average_rank_top20.png"
-        plt.savefig(rankPath, dpi=300, bbox_inches="tight")
-        plt.close()
-        savedFiles["averageRank"] = str(rankPath)
-        print(f"Saved average rank chart to: {rankPath}")
-
-        # 5. Score Trends Across Iterations (Top 10 players)
-        if len(allResults) > 1:
-            topTrendPlayers = sorted(
-                avgScores.items(), key=lambda x: x[1], reverse=True
-            )[:10]
-            topTrendNames = [name for name, _ in topTrendPlayers]
-
-            fig, ax = plt.subplots(figsize=(14, 8))
-            for name in topTrendNames:
-                scores = playerStats[name]["scores"]
-                iterations = list(range(1, len(scores) + 1))
-                ax.plot(iterations, scores, marker="o", label=name, linewidth=2)
-
-            ax.set_xlabel("Iteration", fontsize=12)
-            ax.set_ylabel("Score", fontsize=12)
-            ax.set_title(
-                "Score Trends Across Iterations - Top 10 Players",
-                fontsize=14,
-                fontweight="bold",
-            )
-            ax.legend(bbox_to_anchor=(1.05, 1), loc="upper left", fontsize=9)
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-            trendPath = outputPath / "score_trends_top10.png"
-            plt.savefig(trendPath, dpi=300, bbox_inches="tight")
-            plt.close()
-            savedFiles["scoreTrends"] = str(trendPath)
-            print(f"Saved score trends to: {trendPath}")
-
-        # 6. Payoff Matrix Heatmap (if available)
-        if "payoffMatrix" in allResults[0]:
-            # Average payoff matrix across all iterations
-            payoffMatrices = [
-                np.array(iteration["payoffMatrix"])
-                for iteration in allResults
-                if "payoffMatrix" in iteration and "error" not in iteration
-            ]
-
-            if payoffMatrices:
-                avgPayoffMatrix = np.mean(payoffMatrices, axis=0)
-                playerNames = allResults[0]["playerNames"]
-
-                # Only visualize top 30 players for readability
-                topPayoffPlayers = sorted(
-                    avgScores.items(), key=lambda x: x[1], reverse=True
-                )[:30]
-                topPayoffNames = [name for name, _ in topPayoffPlayers]
-                topIndices = [playerNames.index(name) for name in topPayoffNames]
-
-                subMatrix = avgPayoffMatrix[np.ix_(topIndices, topIndices)]
-
-                fig, ax = plt.subplots(figsize=(16, 14))
-                im = ax.imshow(subMatrix, cmap="YlOrRd", aspect="auto")
-                ax.set_xticks(range(len(topPayoffNames)))
-                ax.set_yticks(range(len(topPayoffNames)))
-                ax.set_xticklabels(topPayoffNames, rotation=90, ha="right", fontsize=7)
-                ax.set_yticklabels(topPayoffNames, fontsize=7)
-                ax.set_title(
-                    "Average Payoff Matrix - Top 30 Players",
-                    fontsize=14,
-                    fontweight="bold",
-                )
 
-                # Add colorbar
-                cbar = plt.colorbar(im, ax=ax)
-                cbar.set_label("Average Score", fontsize=10)
+    # Skip figures rendered before from the same inputs
+    manifestPath = outputPath / FIGURE_MANIFEST_FILENAME
+    manifest: Dict[str, Dict[str, str]] = {}
+
+    if manifestPath.exists() and not force:
+        with open(manifestPath, "r") as f:
+            manifest = json.load(f)
+
+    savedFiles: Dict[str, str] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
 
-                plt.tight_layout()
-                payoffPath = outputPath / "payoff_matrix_top30.png"
-                plt.savefig(payoffPath, dpi=300, bbox_inches="tight")
-                plt.close()
-                savedFiles["payoffMatrix"] = str(payoffPath)
-                print(f"Saved payoff matrix to: {payoffPath}")
+    for key, figure in figures.items():
+        path = outputPath / f"{figure['file']}.{imageFormat}"
+        inputsHash = _hashInputs(figure["plot"], figure["data"], dpi)
+        savedFiles[key] = str(path)
 
-        print(f"\nAll visualizations saved to: {outputPath}")
-        return savedFiles
+        if manifest.get(key, {}).get("inputsHash") == inputsHash and path.exists():
+            print(f"Unchanged, skipped: {path}")
+            continue
 
+        pending[key] = {**figure, "path": str(path), "inputsHash": inputsHash}
+
+    workers = min(processes or cpu_count(), len(pending))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                key: pool.submit(
+                    _renderFigure, figure["plot"], figure["data"], figure["path"], dpi
+                )
+                for key, figure in pending.items()
+            }
+
+            for key, future in futures.items():
+                future.result()
+                print(f"Saved {key} to: {pending[key]['path']}")
     else:
-        print("No valid results to visualize")
-        return {}
+        for key, figure in pending.items():
+            _renderFigure(figure["plot"], figure["data"], figure["path"], dpi)
+            print(f"Saved {key} to: {figure['path']}")
+
+    manifest = {
+        key: {"file": Path(savedFiles[key]).name, "inputsHash": figure["inputsHash"]}
+        for key, figure in pending.items()
+    } | {key: manifest[key] for key in savedFiles if key not in pending}
+    tmpPath = manifestPath.with_name(f"{FIGURE_MANIFEST_FILENAME}.tmp")
+
+    with open(tmpPath, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmpPath, manifestPath)
+
+    print(f"\nAll visualizations saved to: {outputPath}")
+    return savedFiles
@@ -0,0 +1,36 @@
+"""
+Helper function to resolve the API provider of a model.
+"""
+
+from typing import Dict
+
+from ..models import ClaudeModel, GeminiModel, OpenAiModel, Provider
+
+_PROVIDER_BY_MODEL: Dict[str, Provider] = {
+    **{member.value: Provider.GEMINI for member in GeminiModel},
+    **{member.value: Provider.OPENAI for member in OpenAiModel},
+    **{member.value: Provider.ANTHROPIC for member in ClaudeModel},
+}
+
+
+def getProvider(model: str) -> Provider:
+    """
+    Resolves the provider serving a model.
+
+    Args:
+        model: The model identifier
+
+    Returns:
+        The provider the model is registered under
+
+    Raises:
+        ValueError: If the model provider cannot be determined
+    """
+    provider = _PROVIDER_BY_MODEL.get(model)
+
+    if provider is None:
+        raise ValueError(
+            f"Unable to determine provider for model: {model}. Model must be registered in ClaudeModel, OpenAiModel, or GeminiModel enums. Available models: {ClaudeModel}, {OpenAiModel}, {GeminiModel}"  # noqa: E501
+        )
+
+    return provider
@@ -0,0 +1,91 @@
+import asyncio
+import json
+from typing import List, Optional
+
+from openai import AsyncOpenAI
+from openai.types.responses import Response
+
+from ...models import PromptRequest, PromptResponse
+from .runPrompt import buildRequestParams, parseResponse
+
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+async def runBatch(
+    client: AsyncOpenAI,
+    requests: List[PromptRequest],
+    pollIntervalSeconds: float,
+) -> List[Optional[PromptResponse]]:
+    """
+    Run prompts as one OpenAI Batch API job against the Responses endpoint.
+
+    The requests are uploaded as a JSONL file; the input and output files are
+    deleted once the results are read.
+
+    Args:
+        client: AsyncOpenAI client instance
+        requests: The requests to send, all for the same model
+        pollIntervalSeconds: Seconds between checks of the batch's status
+
+    Returns:
+        The response to each request, or None where the batch has no successful
+        result for it
+    """
+
+    lines = [
+        json.dumps(
+            {
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": buildRequestParams(
+                    request.model,
+                    request.maxTokens,
+                    request.temperature,
+                    request.messages,
+                    request.enableGrounding,
+                    request.topLogprobs,
+                ),
+            }
+        )
+        for index, request in enumerate(requests)
+    ]
+    inputFile = await client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+    )
+    responses: List[Optional[PromptResponse]] = [None] * len(requests)
+
+    try:
+        batch = await client.batches.create(
+            input_file_id=inputFile.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+
+        while batch.status not in TERMINAL_STATUSES:
+            await asyncio.sleep(pollIntervalSeconds)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.output_file_id is None:
+            return responses
+
+        output = await client.files.content(batch.output_file_id)
+
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+
+            entry = json.loads(line)
+            result = entry.get("response") or {}
+
+            if result.get("status_code") == 200:
+                # Build leniently, as the SDK does for its own responses
+                responses[int(entry["custom_id"])] = parseResponse(
+                    Response.construct(**result["body"])
+                )
+
+        await client.files.delete(batch.output_file_id)
+    finally:
+        await client.files.delete(inputFile.id)
+
+    return responses
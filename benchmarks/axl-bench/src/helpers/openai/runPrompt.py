@@ -1,39 +1,59 @@
-from typing import Any, Dict, List
+import hashlib
+from typing import Any, Dict, List, Optional
 
 from openai import OpenAI
+from openai.types.responses import Response
 
-from ...models import Message, OpenAiModelGrounding
+from ...models import (
+    Message,
+    OpenAiModelGrounding,
+    OpenAiModelLogprobs,
+    PromptResponse,
+)
 
+# The Responses API rejects a smaller `max_output_tokens`
+MIN_OUTPUT_TOKENS = 16
 
-def runPrompt(
-    client: OpenAI,
+
+def buildRequestParams(
     model: str,
     maxTokens: int,
     temperature: float,
     messages: List[Message],
     enableGrounding: bool = False,
-) -> str:
+    topLogprobs: Optional[int] = None,
+) -> Dict[str, Any]:
     """
-    Run a prompt through the OpenAI Responses API.
+    Build the Responses API request parameters shared by the sync and async helpers.
+
+    OpenAI caches prompt prefixes automatically. Messages keep their static prefix
+    first, and requests sharing that prefix carry the same `prompt_cache_key`, so
+    they are routed to the same cache. `maxTokens` is raised to the API's minimum
+    of 16, so a logprob-mode request for a single token is accepted; only the first
+    output token's alternatives are read.
 
     Args:
-        client: OpenAI Client instance
         model: Model identifier
         maxTokens: Maximum tokens to generate
         temperature: Sampling temperature
         messages: List of messages with role and content
         enableGrounding: Enable web search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
 
     Returns:
-        Generated text response
+        Keyword arguments for `responses.create`
     """
 
     requestParams: Dict[str, Any] = {
         "model": model,
-        "max_output_tokens": maxTokens,
+        "max_output_tokens": max(maxTokens, MIN_OUTPUT_TOKENS),
         "temperature": temperature,
+        # Earlier replies in a conversation are plain assistant text
         "input": [
-            {
+            {"role": msg.role, "content": msg.content}
+            if msg.role == "assistant"
+            else {
                 "role": msg.role,
                 "content": [{"type": "input_text", "text": msg.content}],
             }
@@ -41,18 +61,95 @@ def runPrompt(
         ],
     }
 
+    if messages and messages[0].prefixLength:
+        prefix = messages[0].content[: messages[0].prefixLength]
+        requestParams["prompt_cache_key"] = hashlib.sha256(
+            prefix.encode("utf-8")
+        ).hexdigest()[:32]
+
     if enableGrounding and any(
         model.startswith(member.value) for member in OpenAiModelGrounding
     ):
         requestParams["tools"] = [{"type": "web_search"}]
 
-    response = client.responses.create(**requestParams)
-    outputText = [
-        part.text
+    if topLogprobs and any(model == member.value for member in OpenAiModelLogprobs):
+        requestParams["top_logprobs"] = topLogprobs
+        requestParams["include"] = ["message.output_text.logprobs"]
+
+    return requestParams
+
+
+def parseResponse(response: Response) -> PromptResponse:
+    """
+    Join the output text parts of a Responses API response.
+
+    Args:
+        response: The Responses API response
+
+    Returns:
+        Generated text response, with the first token's alternatives if requested
+        and its token counts
+    """
+
+    outputParts = [
+        part
         for msg in response.output
         if msg.type == "message"
         for part in msg.content
         if part.type == "output_text"
     ]
+    topLogprobs: Optional[Dict[str, float]] = None
+
+    if outputParts and outputParts[0].logprobs:
+        topLogprobs = {
+            alternative.token: alternative.logprob
+            for alternative in outputParts[0].logprobs[0].top_logprobs
+        }
+
+    usage = response.usage
+
+    return PromptResponse(
+        text="".join(part.text for part in outputParts),
+        topLogprobs=topLogprobs,
+        inputTokens=usage.input_tokens if usage else None,
+        cachedInputTokens=usage.input_tokens_details.cached_tokens if usage else None,
+        outputTokens=usage.output_tokens if usage else None,
+        reasoningTokens=(
+            usage.output_tokens_details.reasoning_tokens if usage else None
+        ),
+    )
+
+
+def runPrompt(
+    client: OpenAI,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    topLogprobs: Optional[int] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the OpenAI Responses API.
+
+    Args:
+        client: OpenAI Client instance
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: List of messages with role and content
+        enableGrounding: Enable web search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
+
+    Returns:
+        Generated text response
+    """
+
+    response = client.responses.create(
+        **buildRequestParams(
+            model, maxTokens, temperature, messages, enableGrounding, topLogprobs
+        )
+    )
 
-    return "".join(outputText)
+    return parseResponse(response)
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from openai import AsyncOpenAI
+
+from ...models import Message, PromptResponse
+from .runPrompt import buildRequestParams, parseResponse
+
+
+async def runPromptAsync(
+    client: AsyncOpenAI,
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    topLogprobs: Optional[int] = None,
+) -> PromptResponse:
+    """
+    Run a prompt through the OpenAI Responses API without blocking the event loop.
+
+    Args:
+        client: AsyncOpenAI Client instance
+        model: Model identifier
+        maxTokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        messages: List of messages with role and content
+        enableGrounding: Enable web search grounding if supported by model
+        topLogprobs: Number of alternatives to return per output token, if
+            supported by model
+
+    Returns:
+        Generated text response
+    """
+
+    response = await client.responses.create(
+        **buildRequestParams(
+            model, maxTokens, temperature, messages, enableGrounding, topLogprobs
+        )
+    )
+
+    return parseResponse(response)
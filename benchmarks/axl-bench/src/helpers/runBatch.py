@@ -0,0 +1,39 @@
+from typing import List, Optional
+
+from ..models import PromptRequest, PromptResponse, Provider
+from ..runtime import batchDispatcher, clientRegistry
+from .anthropic import runBatch as anthropicRunBatch
+from .gemini import runBatch as geminiRunBatch
+from .openai import runBatch as openaiRunBatch
+
+
+async def runBatch(
+    provider: Provider, model: str, requests: List[PromptRequest]
+) -> List[Optional[PromptResponse]]:
+    """
+    Gateway function to run a batch of prompts through a provider's batch API.
+
+    Routes to Anthropic Message Batches, the OpenAI Batch API or Gemini batch mode,
+    using the provider's async client from the registry, and polls the job at the
+    batch dispatcher's interval until it ends.
+
+    Args:
+        provider: The provider serving the requests
+        model: The model identifier shared by all requests
+        requests: The requests to send
+
+    Returns:
+        The response to each request, or None where the batch has no successful
+        result for it
+    """
+    client = clientRegistry.getAsyncClient(provider)
+    pollIntervalSeconds = batchDispatcher.config.pollIntervalSeconds
+
+    if provider == Provider.ANTHROPIC:
+        return await anthropicRunBatch(client, requests, pollIntervalSeconds)
+
+    elif provider == Provider.OPENAI:
+        return await openaiRunBatch(client, requests, pollIntervalSeconds)
+
+    else:
+        return await geminiRunBatch(client, requests, pollIntervalSeconds)
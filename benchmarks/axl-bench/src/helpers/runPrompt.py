@@ -1,18 +1,22 @@
-import os
-from typing import List
+import time
+from typing import List, Optional
 
-from anthropic import Anthropic
-from dotenv import load_dotenv
-from google import genai
-from openai import OpenAI
-
-from ..models import ClaudeModel, GeminiModel, Message, OpenAiModel
+from ..models import Message, PromptRequest, PromptResponse, Provider, ResponseSource
+from ..runtime import (
+    cassette,
+    clientRegistry,
+    hashRequest,
+    rateLimiter,
+    responseCache,
+    retryExecutor,
+    tracer,
+    usageTracker,
+)
 from .anthropic import runPrompt as anthropicRunPrompt
 from .gemini import runPrompt as geminiRunPrompt
+from .getProvider import getProvider
 from .openai import runPrompt as openaiRunPrompt
 
-load_dotenv()
-
 
 def runPrompt(
     model: str,
@@ -20,12 +24,23 @@ def runPrompt(
     temperature: float,
     messages: List[Message],
     enableGrounding: bool = False,
-) -> str:
+    topLogprobs: Optional[int] = None,
+    player: Optional[str] = None,
+    opponent: Optional[str] = None,
+    turn: Optional[int] = None,
+) -> PromptResponse:
     """
     Gateway function to run a prompt through the appropriate LLM API.
 
     This function automatically detects the provider based on the model name
     and routes to the correct implementation (Anthropic, OpenAI, or Gemini).
+    Clients come from the process-wide registry, so connections are reused
+    across calls, and responses are served from the response cache when open.
+    Requests wait for the provider's rate limiter before they are sent, and are
+    retried, timed out and hedged according to the retry executor's policy.
+    Every call is logged to the cassette when recording, and served from it
+    without any network access when replaying. Each call is timed as a span of
+    the tracer.
 
     Args:
         model: The model identifier
@@ -33,33 +48,93 @@ def runPrompt(
         temperature: Temperature for sampling (0.0 to 1.0)
         messages: List of message dictionaries with 'role' and 'content' keys
         enableGrounding: Whether to enable web search/grounding (default: False)
+        topLogprobs: Number of alternatives to return for each output token, for
+            models that expose logprobs (default: None)
+        player: Name of the requesting player, for usage accounting (default: None)
+        opponent: Name of that player's opponent, for usage accounting
+            (default: None)
+        turn: The turn the move is requested for, for tracing (default: None)
 
     Returns:
-        The generated text response from the model
+        The response from the model
 
     Raises:
         ValueError: If the model provider cannot be determined
     """
-    # Detect provider based on model name
-    if any(model == member.value for member in ClaudeModel):
-        client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        return anthropicRunPrompt(
-            client, model, maxTokens, temperature, messages, enableGrounding
-        )
-
-    elif any(model == member.value for member in OpenAiModel):
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        return openaiRunPrompt(
-            client, model, maxTokens, temperature, messages, enableGrounding
-        )
-
-    elif any(model == member.value for member in GeminiModel):
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-        return geminiRunPrompt(
-            client, model, maxTokens, temperature, messages, enableGrounding
-        )
-
-    else:
-        raise ValueError(
-            f"Unable to determine provider for model: {model}. Model must be registered in ClaudeModel, OpenAiModel, or GeminiModel enums. Available models: {ClaudeModel}, {OpenAiModel}, {GeminiModel}"  # noqa: E501
-        )
+    provider = getProvider(model)
+    request = PromptRequest(
+        model=model,
+        maxTokens=maxTokens,
+        temperature=temperature,
+        messages=messages,
+        enableGrounding=enableGrounding,
+        topLogprobs=topLogprobs,
+    )
+    requestKey = hashRequest(request)
+
+    with tracer.span(provider, model, player, opponent, turn) as span:
+        if cassette.replaying:
+            span.source = ResponseSource.CASSETTE
+            return cassette.nextResponse(requestKey)
+
+        startTime = time.time()
+        cacheKey = responseCache.keyFor(requestKey, temperature)
+        response = responseCache.get(cacheKey)
+
+        if response is None:
+            client = clientRegistry.getClient(provider)
+
+            def send() -> PromptResponse:
+                queuedAt = time.perf_counter()
+
+                with rateLimiter.limit(provider, request), span.attempt(queuedAt):
+                    retryExecutor.markSent()
+
+                    if provider == Provider.ANTHROPIC:
+                        response = anthropicRunPrompt(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                        )
+
+                    elif provider == Provider.OPENAI:
+                        response = openaiRunPrompt(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                            topLogprobs,
+                        )
+
+                    else:
+                        response = geminiRunPrompt(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                            topLogprobs,
+                        )
+
+                # Every answered request is billed, whether or not its answer is
+                # the one used, so losing hedges and abandoned attempts count too
+                usageTracker.record(
+                    model, player, opponent, response, time.perf_counter() - queuedAt
+                )
+
+                return response
+
+            response = retryExecutor.run(model, send)
+            responseCache.put(cacheKey, response)
+        else:
+            span.source = ResponseSource.CACHE
+
+        cassette.write(requestKey, request, response, startTime)
+
+        return response
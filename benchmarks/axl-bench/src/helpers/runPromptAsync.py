@@ -0,0 +1,195 @@
+import asyncio
+import time
+import weakref
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+from ..models import Message, PromptRequest, PromptResponse, Provider, ResponseSource
+from ..runtime import (
+    batchDispatcher,
+    cassette,
+    clientRegistry,
+    hashRequest,
+    rateLimiter,
+    responseCache,
+    retryExecutor,
+    tracer,
+    usageTracker,
+)
+from .anthropic import runPromptAsync as anthropicRunPromptAsync
+from .gemini import runPromptAsync as geminiRunPromptAsync
+from .getProvider import getProvider
+from .openai import runPromptAsync as openaiRunPromptAsync
+from .runBatch import runBatch
+
+# Cache keys of the requests being sent on each event loop, with the event set once
+# the request is answered (or fails)
+_inFlight: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, Dict[str, asyncio.Event]
+] = weakref.WeakKeyDictionary()
+
+
+async def runPromptAsync(
+    model: str,
+    maxTokens: int,
+    temperature: float,
+    messages: List[Message],
+    enableGrounding: bool = False,
+    topLogprobs: Optional[int] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    player: Optional[str] = None,
+    opponent: Optional[str] = None,
+    turn: Optional[int] = None,
+) -> PromptResponse:
+    """
+    Async gateway function to run a prompt through the appropriate LLM API.
+
+    Mirrors `runPrompt`, but awaits the provider's async client so that many
+    move requests can be in flight on one event loop at the same time. In batch
+    mode the request joins the batch dispatcher's next provider batch instead, and
+    is only sent on its own if the batch job does not answer it. While the
+    response cache is open, a cacheable request identical to one already in flight
+    on the event loop waits for that request's answer from the cache rather than
+    being sent again.
+
+    Args:
+        model: The model identifier
+        maxTokens: Maximum number of tokens to generate
+        temperature: Temperature for sampling (0.0 to 1.0)
+        messages: List of message dictionaries with 'role' and 'content' keys
+        enableGrounding: Whether to enable web search/grounding (default: False)
+        topLogprobs: Number of alternatives to return for each output token, for
+            models that expose logprobs (default: None)
+        semaphore: Shared limit on the number of requests in flight (default: None)
+        player: Name of the requesting player, for usage accounting (default: None)
+        opponent: Name of that player's opponent, for usage accounting
+            (default: None)
+        turn: The turn the move is requested for, for tracing (default: None)
+
+    Returns:
+        The response from the model
+
+    Raises:
+        ValueError: If the model provider cannot be determined
+    """
+    provider = getProvider(model)
+    request = PromptRequest(
+        model=model,
+        maxTokens=maxTokens,
+        temperature=temperature,
+        messages=messages,
+        enableGrounding=enableGrounding,
+        topLogprobs=topLogprobs,
+    )
+    requestKey = hashRequest(request)
+
+    with tracer.span(provider, model, player, opponent, turn) as span:
+        if cassette.replaying:
+            span.source = ResponseSource.CASSETTE
+            return cassette.nextResponse(requestKey)
+
+        startTime = time.time()
+        cacheKey = responseCache.keyFor(requestKey, temperature)
+        response = responseCache.get(cacheKey)
+        loopInFlight = _inFlight.setdefault(asyncio.get_running_loop(), {})
+
+        # If the request in flight fails, the first waiter sends its own
+        while response is None and cacheKey in loopInFlight:
+            await loopInFlight[cacheKey].wait()
+            response = responseCache.get(cacheKey)
+
+        if response is None:
+            client = clientRegistry.getAsyncClient(provider)
+
+            async def send() -> PromptResponse:
+                queuedAt = time.perf_counter()
+
+                async with AsyncExitStack() as stack:
+                    await stack.enter_async_context(
+                        rateLimiter.limitAsync(provider, request)
+                    )
+
+                    if semaphore is not None:
+                        await stack.enter_async_context(semaphore)
+
+                    stack.enter_context(span.attempt(queuedAt))
+                    retryExecutor.markSent()
+
+                    if provider == Provider.ANTHROPIC:
+                        response = await anthropicRunPromptAsync(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                        )
+
+                    elif provider == Provider.OPENAI:
+                        response = await openaiRunPromptAsync(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                            topLogprobs,
+                        )
+
+                    else:
+                        response = await geminiRunPromptAsync(
+                            client,
+                            model,
+                            maxTokens,
+                            temperature,
+                            messages,
+                            enableGrounding,
+                            topLogprobs,
+                        )
+
+                # Every answered request is billed, whether or not its answer is
+                # the one used, so a duplicate answered before it is cancelled
+                # counts too
+                usageTracker.record(
+                    model, player, opponent, response, time.perf_counter() - queuedAt
+                )
+
+                return response
+
+            sendTime = time.perf_counter()
+            answered = asyncio.Event()
+
+            if cacheKey is not None:
+                loopInFlight[cacheKey] = answered
+
+            try:
+                if batchDispatcher.enabled:
+                    response = await batchDispatcher.submit(
+                        provider, request, runBatch
+                    )
+
+                if response is not None:
+                    span.source = ResponseSource.BATCH
+                    usageTracker.record(
+                        model,
+                        player,
+                        opponent,
+                        response,
+                        time.perf_counter() - sendTime,
+                        batched=True,
+                    )
+                else:
+                    response = await retryExecutor.runAsync(model, send)
+
+                responseCache.put(cacheKey, response)
+            finally:
+                if cacheKey is not None:
+                    del loopInFlight[cacheKey]
+
+                answered.set()
+        else:
+            span.source = ResponseSource.CACHE
+
+        cassette.write(requestKey, request, response, startTime)
+
+        return response
@@ -3,12 +3,21 @@ Helper function to run a single tournament iteration.
 """
 
 import time
-from typing import List, cast
+from multiprocessing import cpu_count
+from typing import Dict, List, Optional, Tuple
 
 import axelrod as axl
 import numpy as np
 
-from ..models import PlayerResult, ScoreStatistics, TournamentIterationResult
+from ..models import (
+    PlayerResult,
+    ScoreStatistics,
+    TokenUsage,
+    TournamentEngine,
+    TournamentIterationResult,
+)
+from ..runtime import usageTracker
+from ..tournaments import HybridTournament, LockstepTournament, ResumableTournament
 
 
 def runTournamentIteration(
@@ -16,53 +25,138 @@ def runTournamentIteration(
     iterationNumber: int,
     turns: int = 200,
     seed: int = 42,
+    engine: TournamentEngine = TournamentEngine.SEQUENTIAL,
+    concurrency: int = 64,
+    processes: Optional[int] = None,
+    checkpointPath: Optional[str] = None,
+    edges: Optional[List[Tuple[int, int]]] = None,
 ) -> TournamentIterationResult:
     """
     Runs a single tournament iteration with the given players.
+
+    The sequential engine plays each match to completion, one after another, in
+    the calling process.
+    The lockstep engine advances all LLM matches one turn at a time and requests
+    their moves concurrently, at most `concurrency` requests in flight. The hybrid
+    engine does the same while playing classical matches on `processes` worker
+    processes (default: all cores).
+
+    With a `checkpointPath`, every finished match is appended to that interactions
+    file as it completes, and matches already recorded there are not played again.
+    While the match store is open, matches already in it are not played either.
+
+    With `edges`, only those pairs of players meet instead of the full round robin.
+    Players then meet different numbers of opponents, so each score is scaled to
+    a full round robin: the mean score per opponent met times the opponents each
+    player has in one. Ranks are comparable as they are, since Axelrod ranks by
+    the median score per turn.
+
+    The tokens, wall time and cost of the LLM requests made while the iteration
+    plays are attached per match, per player and in total.
     """
     print(f"\n=== Running Tournament Iteration {iterationNumber} ===")
     print(f"Players: {len(players)}")
     print(f"Turns: {turns}")
     print(f"Seed: {seed}")
+    print(f"Engine: {engine.value}")
+    print(f"Matches: {len(edges) if edges is not None else 'full round robin'}")
 
     startTime: float = time.time()
 
-    tournament: axl.Tournament = axl.Tournament(
-        players=players,
-        turns=turns,
-        seed=seed,
-        repetitions=1,
-    )
-    results: axl.ResultSet = tournament.play(processes=1)
+    # Leave out usage recorded before this iteration started
+    usageTracker.collect()
+
+    if engine == TournamentEngine.LOCKSTEP:
+        tournament: axl.Tournament = LockstepTournament(
+            players=players,
+            concurrency=concurrency,
+            turns=turns,
+            seed=seed,
+            repetitions=1,
+            edges=edges,
+        )
+        results: axl.ResultSet = tournament.play(filename=checkpointPath)
+    elif engine == TournamentEngine.HYBRID:
+        tournament = HybridTournament(
+            players=players,
+            concurrency=concurrency,
+            turns=turns,
+            seed=seed,
+            repetitions=1,
+            edges=edges,
+        )
+        results = tournament.play(
+            filename=checkpointPath, processes=processes or cpu_count()
+        )
+    else:
+        tournament = ResumableTournament(
+            players=players,
+            turns=turns,
+            seed=seed,
+            repetitions=1,
+            edges=edges,
+        )
+        # Axelrod plays in worker processes for any `processes` other than None
+        results = tournament.play(filename=checkpointPath, processes=None)
 
     endTime: float = time.time()
     duration: float = endTime - startTime
 
-    playerNames: List[str] = [str(player) for player in players]
+    matchUsage = usageTracker.collect()
+    playerUsage: Dict[str, TokenUsage] = {}
 
-    scores: List[List[float]] = results.scores
-    rankedNames: List[str] = results.ranked_names
-    wins: List[int] = cast(List[int], results.wins)
-    matchLengths: List[List[int]] = results.match_lengths
-    payoffMatrix: List[List[int]] = results.payoff_matrix
+    for entry in matchUsage:
+        playerUsage[entry.player] = (
+            playerUsage.get(entry.player, TokenUsage()) + entry.usage
+        )
+
+    iterationUsage: Optional[TokenUsage] = (
+        sum(playerUsage.values(), TokenUsage()) if playerUsage else None
+    )
 
-    cooperationRates: List[float] = []
+    playerNames: List[str] = [str(player) for player in players]
 
-    for i, _ in enumerate(players):
-        totalMoves = 0
-        cooperations = 0
+    # Every metric is a reduction over the arrays the ResultSet builds in its single
+    # pass over the interactions: scores and wins are (players, repetitions),
+    # match lengths are (repetitions, players, players) and cooperation counts are
+    # (players, players), summed over repetitions. As in Axelrod's cooperating
+    # rating, a self-play match counts the moves of one side.
+    scores = np.asarray(results.scores, dtype=float)
+    wins = np.asarray(results.wins, dtype=int).sum(axis=1)
+    matchLengths = np.asarray(results.match_lengths, dtype=int).sum(axis=0)
+    payoffMatrix = np.asarray(results.payoff_matrix, dtype=float)
+    cooperations = np.asarray(results.cooperation, dtype=float)
+
+    totalMoves = matchLengths.sum(axis=1)
+    cooperationRates = np.divide(
+        cooperations.sum(axis=1),
+        totalMoves,
+        out=np.zeros(len(players)),
+        where=totalMoves > 0,
+    )
+    cooperationMatrix = np.divide(
+        cooperations,
+        matchLengths,
+        out=np.zeros_like(cooperations),
+        where=matchLengths > 0,
+    )
 
-        for match in results.interactions:
-            for interaction in match:
-                if i in interaction:
-                    moves = interaction[i]
-                    totalMoves += len(moves)
-                    cooperations += sum(1 for move in moves if move == axl.Action.C)
+    ranks = np.empty(len(players), dtype=int)
+    ranks[results.ranking] = np.arange(1, len(players) + 1)
+    rankedNames: List[str] = results.ranked_names
 
-        cooperationRate = cooperations / totalMoves if totalMoves > 0 else 0.0
-        cooperationRates.append(cooperationRate)
+    playerScores = scores.mean(axis=1)
 
-    playerScores: List[float] = [float(np.mean(row)) for row in scores]
+    if edges is not None:
+        metOpponents = matchLengths > 0
+        np.fill_diagonal(metOpponents, False)
+        opponents = metOpponents.sum(axis=1)
+        playerScores = np.divide(
+            playerScores * (len(players) - 1),
+            opponents,
+            out=np.zeros(len(players)),
+            where=opponents > 0,
+        )
 
     scoreStats = ScoreStatistics(
         mean=float(np.mean(playerScores)),
@@ -80,26 +174,33 @@ def runTournamentIteration(
         seed=seed,
         numPlayers=len(players),
         playerNames=playerNames,
-        scores=playerScores,
+        scores=playerScores.tolist(),
         rankedNames=rankedNames,
-        wins=wins,
-        matchLengths=[
-            [int(matchLength) for matchLength in matchLengthRow]
-            for matchLengthRow in matchLengths
-        ],
-        cooperationRates=cooperationRates,
-        payoffMatrix=[[float(value) for value in row] for row in payoffMatrix],
+        wins=wins.tolist(),
+        matchLengths=matchLengths.tolist(),
+        cooperationRates=cooperationRates.tolist(),
+        cooperationMatrix=cooperationMatrix.tolist(),
+        payoffMatrix=payoffMatrix.tolist(),
         scoreStatistics=scoreStats,
         playerResults=[
             PlayerResult(
-                name=playerNames[i],
-                score=playerScores[i],
-                rank=rankedNames.index(playerNames[i]) + 1,
-                wins=wins[i],
-                cooperationRate=cooperationRates[i],
+                name=name,
+                score=score,
+                rank=rank,
+                wins=playerWins,
+                cooperationRate=cooperationRate,
+                usage=playerUsage.get(name),
+            )
+            for name, score, rank, playerWins, cooperationRate in zip(
+                playerNames,
+                playerScores.tolist(),
+                ranks.tolist(),
+                wins.tolist(),
+                cooperationRates.tolist(),
             )
-            for i in range(len(players))
         ],
+        usage=iterationUsage,
+        matchUsage=matchUsage,
     )
 
     return iterationResults
@@ -2,110 +2,203 @@
 Helper function to save tournament results to files.
 """
 
+import csv
 import json
+import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import IO, Dict, Iterable, Iterator, Optional
 
 import pandas as pd
 
-from ..models import BenchmarkMetadata, TournamentIterationResult
+from ..models import BenchmarkMetadata, TokenUsage, TournamentIterationResult
+from ..runtime import MATRIX_DIRNAME, MATRIX_MANIFEST_FILENAME, RunIndex
+
+DETAILED_COLUMNS = ["iteration", "player", "score", "rank", "wins", "cooperationRate"]
+
+
+@contextmanager
+def _atomicWrite(path: Path) -> Iterator[IO[str]]:
+    """Write to a temporary file, then fsync and rename it over `path`."""
+    tmpPath = path.with_name(f"{path.name}.tmp")
+
+    with open(tmpPath, "w", newline="") as f:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmpPath, path)
+
+
+def _usageColumns(usage: Optional[TokenUsage]) -> Dict[str, object]:
+    """Summary columns for a player's LLM usage, empty for classical players."""
+    if usage is None:
+        return {}
+
+    return {
+        "llmRequests": usage.requests,
+        "inputTokens": usage.inputTokens,
+        "cachedInputTokens": usage.cachedInputTokens,
+        "outputTokens": usage.outputTokens,
+        "reasoningTokens": usage.reasoningTokens,
+        "llmWallSeconds": usage.wallSeconds,
+        "costUsd": usage.costUsd,
+    }
 
 
 def saveResults(
-    allResults: List[TournamentIterationResult],
+    allResults: Iterable[TournamentIterationResult],
     benchmarkMetadata: BenchmarkMetadata,
     outputDir: str = "benchmarkResults",
+    runDir: Optional[str] = None,
 ) -> Dict[str, str]:
     """
-    Saves tournament results to JSON and CSV files with historical tracking.
+    Saves tournament results to JSON and CSV files and records the run in the
+    output directory's run index.
 
     Creates timestamped output directory and saves:
     - Full results as JSON
-    - Summary statistics as CSV
+    - Summary statistics as CSV, with each LLM player's token usage and cost
     - Per-player results as CSV
     - Benchmark metadata
 
     Args:
-        allResults: List of all tournament iteration results
+        allResults: All tournament iteration results; streamed once, so an
+            `IterationResultLog` can be passed without loading it into memory
         benchmarkMetadata: Metadata about the benchmark configuration
         outputDir: Base directory for saving results
+        runDir: Directory of this run, if it was created up front (default: a new
+            timestamped directory under `outputDir`)
 
     Returns:
         Dictionary with paths to saved files
     """
     # Create timestamped directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    runDir = Path(outputDir) / timestamp
-    runDir.mkdir(parents=True, exist_ok=True)
+    if runDir is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        runPath = Path(outputDir) / timestamp
+    else:
+        runPath = Path(runDir)
+        timestamp = runPath.name
 
-    savedFiles = {}
+    runPath.mkdir(parents=True, exist_ok=True)
 
-    # Save full results as JSON
-    fullResultsPath = runDir / "full_results.json"
-    with open(fullResultsPath, "w") as f:
-        json.dump(
-            {
-                "metadata": benchmarkMetadata.model_dump(),
-                "iterations": [result.model_dump() for result in allResults],
-            },
-            f,
-            indent=2,
-        )
-    savedFiles["fullResults"] = str(fullResultsPath)
-    print(f"Saved full results to: {fullResultsPath}")
+    savedFiles = {}
 
     # Save metadata separately
-    metadataPath = runDir / "metadata.json"
+    metadataPath = runPath / "metadata.json"
     with open(metadataPath, "w") as f:
         json.dump(benchmarkMetadata.model_dump(), f, indent=2)
     savedFiles["metadata"] = str(metadataPath)
     print(f"Saved metadata to: {metadataPath}")
 
-    # Aggregate results across all iterations
-    if allResults and allResults[0].playerResults:
-        # Per-player aggregated results
-        playerStats = {}
+    # Stream every iteration once: into the full results JSON, the detailed CSV
+    # and the running per-player aggregates
+    fullResultsPath = runPath / "full_results.json"
+    detailedCsvPath = runPath / "detailedResults.csv"
+    playerStats: Dict[str, Dict[str, float]] = {}
+    playerUsage: Dict[str, TokenUsage] = {}
+    numIterations = 0
+
+    with (
+        _atomicWrite(fullResultsPath) as fullResultsFile,
+        _atomicWrite(detailedCsvPath) as detailedFile,
+    ):
+        metadataJson = json.dumps(benchmarkMetadata.model_dump(), indent=2)
+        fullResultsFile.write(
+            '{\n  "metadata": '
+            + metadataJson.replace("\n", "\n  ")
+            + ',\n  "iterations": ['
+        )
+        detailedWriter = csv.DictWriter(detailedFile, fieldnames=DETAILED_COLUMNS)
+        detailedWriter.writeheader()
 
         for iteration in allResults:
+            iterationJson = json.dumps(iteration.model_dump(), indent=2)
+            fullResultsFile.write(
+                ("," if numIterations else "")
+                + "\n    "
+                + iterationJson.replace("\n", "\n    ")
+            )
+            numIterations += 1
+
             if iteration.error:
                 continue
 
             for playerResult in iteration.playerResults:
-                playerName = playerResult.name
-
-                if playerName not in playerStats:
-                    playerStats[playerName] = {
-                        "scores": [],
-                        "ranks": [],
-                        "wins": [],
-                        "cooperationRates": [],
+                detailedWriter.writerow(
+                    {
+                        "iteration": iteration.iteration,
+                        "player": playerResult.name,
+                        "score": playerResult.score,
+                        "rank": playerResult.rank,
+                        "wins": playerResult.wins,
+                        "cooperationRate": playerResult.cooperationRate,
                     }
-
-                playerStats[playerName]["scores"].append(playerResult.score)
-                playerStats[playerName]["ranks"].append(playerResult.rank)
-                playerStats[playerName]["wins"].append(playerResult.wins)
-                playerStats[playerName]["cooperationRates"].append(
-                    playerResult.cooperationRate
                 )
 
+                stats = playerStats.get(playerResult.name)
+
+                if stats is None:
+                    stats = {
+                        "count": 0,
+                        "scoreSum": 0.0,
+                        "minScore": playerResult.score,
+                        "maxScore": playerResult.score,
+                        "rankSum": 0,
+                        "bestRank": playerResult.rank,
+                        "worstRank": playerResult.rank,
+                        "winsSum": 0,
+                        "cooperationRateSum": 0.0,
+                    }
+                    playerStats[playerResult.name] = stats
+
+                stats["count"] += 1
+                stats["scoreSum"] += playerResult.score
+                stats["minScore"] = min(stats["minScore"], playerResult.score)
+                stats["maxScore"] = max(stats["maxScore"], playerResult.score)
+                stats["rankSum"] += playerResult.rank
+                stats["bestRank"] = min(stats["bestRank"], playerResult.rank)
+                stats["worstRank"] = max(stats["worstRank"], playerResult.rank)
+                stats["winsSum"] += playerResult.wins
+                stats["cooperationRateSum"] += playerResult.cooperationRate
+
+                if playerResult.usage is not None:
+                    playerUsage[playerResult.name] = (
+                        playerUsage.get(playerResult.name, TokenUsage())
+                        + playerResult.usage
+                    )
+
+        fullResultsFile.write(("\n  " if numIterations else "") + "]\n}")
+
+    savedFiles["fullResults"] = str(fullResultsPath)
+    print(f"Saved full results to: {fullResultsPath}")
+
+    # Aggregate results across all iterations
+    summaryData = []
+
+    if playerStats:
+        savedFiles["detailed"] = str(detailedCsvPath)
+        print(f"Saved detailed results to: {detailedCsvPath}")
+
         # Calculate summary statistics for each player
-        summaryData = []
         for playerName, stats in playerStats.items():
+            count = stats["count"]
             summaryData.append(
                 {
                     "player": playerName,
-                    "avgScore": sum(stats["scores"]) / len(stats["scores"]),
-                    "minScore": min(stats["scores"]),
-                    "maxScore": max(stats["scores"]),
-                    "avgRank": sum(stats["ranks"]) / len(stats["ranks"]),
-                    "bestRank": min(stats["ranks"]),
-                    "worstRank": max(stats["ranks"]),
-                    "totalWins": sum(stats["wins"]),
-                    "avgWins": sum(stats["wins"]) / len(stats["wins"]),
-                    "avgCooperationRate": sum(stats["cooperationRates"])
-                    / len(stats["cooperationRates"]),
-                    "numIterations": len(stats["scores"]),
+                    "avgScore": stats["scoreSum"] / count,
+                    "minScore": stats["minScore"],
+                    "maxScore": stats["maxScore"],
+                    "avgRank": stats["rankSum"] / count,
+                    "bestRank": stats["bestRank"],
+                    "worstRank": stats["worstRank"],
+                    "totalWins": stats["winsSum"],
+                    "avgWins": stats["winsSum"] / count,
+                    "avgCooperationRate": stats["cooperationRateSum"] / count,
+                    "numIterations": count,
+                    **_usageColumns(playerUsage.get(playerName)),
                 }
             )
 
@@ -114,57 +207,32 @@ def saveResults(
 
         # Save summary as CSV
         summaryDf = pd.DataFrame(summaryData)
-        summaryCsvPath = runDir / "summaryStatistics.csv"
+        summaryCsvPath = runPath / "summaryStatistics.csv"
 
         summaryDf.to_csv(summaryCsvPath, index=False)
 
         savedFiles["summary"] = str(summaryCsvPath)
         print(f"Saved summary statistics to: {summaryCsvPath}")
-
-        # Save detailed per-iteration results as CSV
-        detailedData = []
-        for iteration in allResults:
-            if iteration.error:
-                continue
-
-            for playerResult in iteration.playerResults:
-                detailedData.append(
-                    {
-                        "iteration": iteration.iteration,
-                        "player": playerResult.name,
-                        "score": playerResult.score,
-                        "rank": playerResult.rank,
-                        "wins": playerResult.wins,
-                        "cooperationRate": playerResult.cooperationRate,
-                    }
-                )
-
-        detailedDf = pd.DataFrame(detailedData)
-        detailedCsvPath = runDir / "detailedResults.csv"
-        detailedDf.to_csv(detailedCsvPath, index=False)
-        savedFiles["detailed"] = str(detailedCsvPath)
-        print(f"Saved detailed results to: {detailedCsvPath}")
-
-    # Update historical index
-    historyPath = Path(outputDir) / "history.json"
-    history = []
-
-    if historyPath.exists():
-        with open(historyPath, "r") as f:
-            history = json.load(f)
-
-    history.append(
-        {
-            "timestamp": timestamp,
-            "directory": str(runDir),
-            "metadata": benchmarkMetadata.model_dump(),
-            "numIterations": len(allResults),
-        }
+    else:
+        detailedCsvPath.unlink()
+
+    # Point at the columnar matrix store, if the run wrote one
+    manifestPath = runPath / MATRIX_DIRNAME / MATRIX_MANIFEST_FILENAME
+
+    if manifestPath.exists():
+        savedFiles["matrices"] = str(manifestPath)
+
+    # Record the run in the output directory's run index
+    runIndex = RunIndex(outputDir)
+    runIndex.addRun(
+        runId=timestamp,
+        directory=str(runPath),
+        metadata=benchmarkMetadata,
+        numIterations=numIterations,
+        playerSummaries=summaryData,
     )
-
-    with open(historyPath, "w") as f:
-        json.dump(history, f, indent=2)
-    savedFiles["history"] = str(historyPath)
-    print(f"Updated history index: {historyPath}")
+    runIndex.close()
+    savedFiles["runIndex"] = str(runIndex.path)
+    print(f"Updated run index: {runIndex.path}")
 
     return savedFiles
@@ -0,0 +1,20 @@
+"""
+Helper function to check whether a model exposes token logprobs.
+"""
+
+from ..models import GeminiModelLogprobs, OpenAiModelLogprobs
+
+
+def supportsLogprobs(model: str) -> bool:
+    """
+    Checks whether a model can return logprobs for its output tokens.
+
+    Args:
+        model: The model identifier
+
+    Returns:
+        True if the model is registered in OpenAiModelLogprobs or GeminiModelLogprobs
+    """
+    return any(model == member.value for member in OpenAiModelLogprobs) or any(
+        model.replace("models/", "") == member.value for member in GeminiModelLogprobs
+    )
@@ -0,0 +1,13 @@
+"""
+Model for the batch execution mode of LLM requests.
+"""
+
+from pydantic import BaseModel
+
+
+class BatchConfig(BaseModel):
+    """How move requests are grouped into provider batches and polled."""
+
+    windowSeconds: float = 0.5
+    pollIntervalSeconds: float = 30.0
+    maxRequests: int = 10_000
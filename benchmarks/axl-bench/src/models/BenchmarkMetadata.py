@@ -2,6 +2,8 @@
 Model for benchmark metadata.
 """
 
+from typing import List
+
 from pydantic import BaseModel
 
 
@@ -19,3 +21,8 @@ class BenchmarkMetadata(BaseModel):
     includeGroundingModels: bool
     maxTokens: int
     temperature: float
+    engine: str = "sequential"
+    decisionMode: str = "text"
+    promptMode: str = "stateless"
+    matchGraph: str = "full"
+    llmModels: List[str] = []
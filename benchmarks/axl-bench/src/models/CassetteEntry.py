@@ -0,0 +1,18 @@
+"""
+Model for one request recorded on a cassette.
+"""
+
+from pydantic import BaseModel
+
+from .PromptRequest import PromptRequest
+from .PromptResponse import PromptResponse
+
+
+class CassetteEntry(BaseModel):
+    """A request, its response and when it was made, as a line of the cassette."""
+
+    requestKey: str
+    request: PromptRequest
+    response: PromptResponse
+    startTime: float
+    durationSeconds: float
@@ -0,0 +1,25 @@
+"""
+Model for provider client configuration.
+"""
+
+from typing import Dict
+
+from pydantic import BaseModel
+
+from .Provider import Provider
+
+
+class ClientConfig(BaseModel):
+    """
+    Connection pool and timeout settings shared by all provider clients.
+
+    `baseUrls` points a provider's clients at another server, such as the fake
+    provider server; providers without an entry use their SDK's default endpoint.
+    """
+
+    maxConnections: int = 100
+    maxKeepaliveConnections: int = 20
+    keepaliveExpirySeconds: float = 30.0
+    timeoutSeconds: float = 60.0
+    http2: bool = False
+    baseUrls: Dict[Provider, str] = {}
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class DecisionMode(Enum):
+    """
+    Enum of the ways a CompletionLLM turns a model response into a move.
+    """
+
+    TEXT = "text"
+    LOGPROB = "logprob"
@@ -0,0 +1,36 @@
+"""
+Model for the local stand-in provider server.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .LatencyDistribution import LatencyDistribution
+
+
+class FakeServerConfig(BaseModel):
+    """
+    Address, latency, failure injection and move policy of the fake provider
+    server.
+
+    `latencySeconds` is the mean delay before a prompt is answered. `latencySpread`
+    shapes the distribution: the half-width of a uniform delay as a fraction of the
+    mean, or the sigma of a lognormal one. `errorRate` and `rateLimitRate` are the
+    fractions of prompts answered with a 500 and a 429 (carrying a `Retry-After`
+    of `retryAfterSeconds`) instead. `policy` is a script of moves cycled through
+    per model in the order prompts arrive: "C" cooperates, "D" defects and "R"
+    picks either at random.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8000
+    batchDelaySeconds: float = 1.0
+    latencySeconds: float = 0.0
+    latencyDistribution: LatencyDistribution = LatencyDistribution.CONSTANT
+    latencySpread: float = 0.5
+    errorRate: float = 0.0
+    rateLimitRate: float = 0.0
+    retryAfterSeconds: float = 1.0
+    policy: str = "C"
+    seed: Optional[int] = None
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class GeminiModelLogprobs(Enum):
+    """
+    Enum of Gemini models that return token logprobs.
+    Source: https://ai.google.dev/api/generate-content#generationconfig
+    """
+
+    GEMINI_2_0_FLASH = "gemini-2.0-flash"
+    GEMINI_1_5_PRO = "gemini-1.5-pro"
+    GEMINI_1_5_FLASH = "gemini-1.5-flash"
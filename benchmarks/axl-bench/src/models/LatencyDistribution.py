@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class LatencyDistribution(Enum):
+    """
+    Enum of the distributions the fake provider server draws response delays from.
+    """
+
+    CONSTANT = "constant"
+    UNIFORM = "uniform"
+    EXPONENTIAL = "exponential"
+    LOGNORMAL = "lognormal"
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class MatchGraphMode(Enum):
+    """
+    Enum of the ways to choose which pairs of players meet in a tournament.
+
+    FULL is the round robin of every player against every other. LLM_VS_CLASSICAL
+    keeps every classical match but drops those between LLM players. STRATIFIED
+    also limits each LLM player to a sample of classical opponents from every
+    strategy cluster. PAIRS plays only the pairs listed.
+    """
+
+    FULL = "full"
+    LLM_VS_CLASSICAL = "llm-vs-classical"
+    STRATIFIED = "stratified"
+    PAIRS = "pairs"
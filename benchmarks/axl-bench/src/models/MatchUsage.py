@@ -0,0 +1,15 @@
+"""
+Model for the LLM usage of one player in one match.
+"""
+
+from pydantic import BaseModel
+
+from .TokenUsage import TokenUsage
+
+
+class MatchUsage(BaseModel):
+    """Usage of a player's requests in its match against an opponent."""
+
+    player: str
+    opponent: str
+    usage: TokenUsage
@@ -1,6 +1,11 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class Message(BaseModel):
     role: str
     content: str
+    # Length of the static leading part of `content` (the game rules), which
+    # providers may cache across requests; not part of the request identity
+    prefixLength: Optional[int] = Field(default=None, exclude=True)
@@ -0,0 +1,19 @@
+"""
+Model for the token prices of one LLM model.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ModelPrice(BaseModel):
+    """
+    USD per million tokens; cached input is billed as input unless priced. Batch
+    requests cost `batchMultiplier` times as much, half price at all three providers.
+    """
+
+    inputPerMillion: float
+    outputPerMillion: float
+    cachedInputPerMillion: Optional[float] = None
+    batchMultiplier: float = 0.5
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class OpenAiModelLogprobs(Enum):
+    """
+    Enum of OpenAI models that return token logprobs via the Responses API.
+    Reasoning models (o-series, gpt-5) do not.
+    Source: https://platform.openai.com/docs/api-reference/responses
+    """
+
+    GPT_4O = "gpt-4o"
+    GPT_4O_MINI = "gpt-4o-mini"
+    GPT_4_TURBO = "gpt-4-turbo"
+    GPT_4 = "gpt-4"
+    GPT_4_1 = "gpt-4.1"
+    GPT_4_1_MINI = "gpt-4.1-mini"
+    GPT_3_5_TURBO = "gpt-3.5-turbo"
@@ -0,0 +1,23 @@
+"""
+Model for the timings of one performance benchmark case.
+"""
+
+from pydantic import BaseModel
+
+
+class PerfResult(BaseModel):
+    """
+    Per-call timings of a benchmark case.
+
+    Each of `repeats` samples times `number` back-to-back calls; the statistics are
+    over the samples, divided by `number`.
+    """
+
+    name: str
+    group: str
+    repeats: int
+    number: int
+    minSeconds: float
+    medianSeconds: float
+    meanSeconds: float
+    maxSeconds: float
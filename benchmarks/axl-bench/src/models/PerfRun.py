@@ -0,0 +1,21 @@
+"""
+Model for one run of the performance benchmark suite.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .PerfResult import PerfResult
+
+
+class PerfRun(BaseModel):
+    """The commit and machine a suite run measured, with the result of each case."""
+
+    timestamp: str
+    commit: Optional[str] = None
+    dirty: bool = False
+    python: str
+    platform: str
+    cpuCount: int
+    results: List[PerfResult] = []
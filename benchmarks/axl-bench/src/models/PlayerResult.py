@@ -2,14 +2,23 @@
 Model for individual player results.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel
 
+from .TokenUsage import TokenUsage
+
 
 class PlayerResult(BaseModel):
-    """Results for a single player in the tournament."""
+    """
+    Results for a single player in the tournament.
+
+    `usage` is None for players that make no LLM requests.
+    """
 
     name: str
     score: float
     rank: int
     wins: int
     cooperationRate: float
+    usage: Optional[TokenUsage] = None
@@ -15,3 +15,5 @@ class PromptConfig(BaseModel):
     historyLastTurns: Optional[int] = None
     numTurns: Optional[int] = None
     endProbability: Optional[float] = None
+    # Message adding the opponent's last move in conversation mode
+    turnTemplate: Optional[str] = None
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class PromptMode(Enum):
+    """
+    Enum of the ways a CompletionLLM shows the game history to the model.
+
+    STATELESS sends one prompt with the whole history on every move. CONVERSATION
+    keeps one multi-turn conversation per match: the first message carries the
+    rules, and each later message adds only the opponent's last move.
+    """
+
+    STATELESS = "stateless"
+    CONVERSATION = "conversation"
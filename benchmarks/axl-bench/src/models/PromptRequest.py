@@ -0,0 +1,20 @@
+"""
+Model for the parameters of a single LLM request.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .Message import Message
+
+
+class PromptRequest(BaseModel):
+    """Everything that determines the response to an LLM request."""
+
+    model: str
+    maxTokens: int
+    temperature: float
+    messages: List[Message]
+    enableGrounding: bool = False
+    topLogprobs: Optional[int] = None
@@ -0,0 +1,23 @@
+"""
+Model for the response of a single LLM request.
+"""
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class PromptResponse(BaseModel):
+    """
+    Generated text plus the alternatives considered for its first token.
+
+    Token counts are None when the provider did not report usage. Output tokens
+    include reasoning tokens.
+    """
+
+    text: str
+    topLogprobs: Optional[Dict[str, float]] = None
+    inputTokens: Optional[int] = None
+    cachedInputTokens: Optional[int] = None
+    outputTokens: Optional[int] = None
+    reasoningTokens: Optional[int] = None
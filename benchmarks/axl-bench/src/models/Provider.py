@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class Provider(Enum):
+    """
+    Enum of supported LLM API providers.
+    """
+
+    ANTHROPIC = "anthropic"
+    OPENAI = "openai"
+    GEMINI = "gemini"
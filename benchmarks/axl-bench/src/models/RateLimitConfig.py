@@ -0,0 +1,17 @@
+"""
+Model for provider rate limit configuration.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RateLimitConfig(BaseModel):
+    """Request/token quotas and concurrency bounds for one provider or model."""
+
+    requestsPerMinute: Optional[int] = None
+    tokensPerMinute: Optional[int] = None
+    initialConcurrency: int = 16
+    minConcurrency: int = 1
+    maxConcurrency: int = 256
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class ResponseSource(Enum):
+    """
+    Enum of where the response to an LLM request came from.
+
+    PROVIDER responses were sent over the network, BATCH responses came back from a
+    provider batch job, CACHE responses were served from the response cache, and
+    CASSETTE responses were replayed from a recording.
+    """
+
+    PROVIDER = "provider"
+    BATCH = "batch"
+    CACHE = "cache"
+    CASSETTE = "cassette"
@@ -0,0 +1,21 @@
+"""
+Model for the retry, deadline and hedging policy of LLM requests.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RetryPolicy(BaseModel):
+    """Backoff, deadline and hedged-request settings shared by all move requests."""
+
+    maxAttempts: int = 3
+    baseDelaySeconds: float = 0.5
+    maxDelaySeconds: float = 20.0
+    attemptTimeoutSeconds: Optional[float] = None
+    deadlineSeconds: Optional[float] = None
+    hedgePercentile: Optional[float] = None
+    maxHedges: int = 1
+    hedgeMinSamples: int = 20
+    latencyWindow: int = 200
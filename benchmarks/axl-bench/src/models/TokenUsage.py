@@ -0,0 +1,38 @@
+"""
+Model for the token usage and cost of LLM requests.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TokenUsage(BaseModel):
+    """
+    Tokens, wall time and cost of the LLM requests of a player, match or iteration.
+
+    `cachedInputTokens` is the part of `inputTokens` read from the provider's prompt
+    cache, and `reasoningTokens` the part of `outputTokens` spent on reasoning.
+    `costUsd` covers the requests whose model has a price, and is None if none has.
+    """
+
+    requests: int = 0
+    inputTokens: int = 0
+    cachedInputTokens: int = 0
+    outputTokens: int = 0
+    reasoningTokens: int = 0
+    wallSeconds: float = 0.0
+    costUsd: Optional[float] = None
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        costs = [cost for cost in (self.costUsd, other.costUsd) if cost is not None]
+
+        return TokenUsage(
+            requests=self.requests + other.requests,
+            inputTokens=self.inputTokens + other.inputTokens,
+            cachedInputTokens=self.cachedInputTokens + other.cachedInputTokens,
+            outputTokens=self.outputTokens + other.outputTokens,
+            reasoningTokens=self.reasoningTokens + other.reasoningTokens,
+            wallSeconds=self.wallSeconds + other.wallSeconds,
+            costUsd=sum(costs) if costs else None,
+        )
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class TournamentEngine(Enum):
+    """
+    Enum of engines available to play a tournament iteration.
+    """
+
+    SEQUENTIAL = "sequential"
+    LOCKSTEP = "lockstep"
+    HYBRID = "hybrid"
@@ -6,12 +6,20 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from .MatchUsage import MatchUsage
 from .PlayerResult import PlayerResult
 from .ScoreStatistics import ScoreStatistics
+from .TokenUsage import TokenUsage
 
 
 class TournamentIterationResult(BaseModel):
-    """Results from a single tournament iteration."""
+    """
+    Results from a single tournament iteration.
+
+    The player-by-player matrices are None once the result has been moved into a
+    `MatrixStore`. `usage` totals the LLM requests made by the iteration, which
+    `matchUsage` breaks down per player and match.
+    """
 
     iteration: int
     timestamp: str
@@ -23,9 +31,12 @@ class TournamentIterationResult(BaseModel):
     scores: List[float]
     rankedNames: List[str]
     wins: List[int]
-    matchLengths: List[List[int]]
+    matchLengths: Optional[List[List[int]]] = None
     cooperationRates: List[float]
-    payoffMatrix: List[List[float]]
+    payoffMatrix: Optional[List[List[float]]] = None
+    cooperationMatrix: Optional[List[List[float]]] = None
     scoreStatistics: ScoreStatistics
     playerResults: List[PlayerResult]
+    usage: Optional[TokenUsage] = None
+    matchUsage: List[MatchUsage] = []
     error: Optional[str] = None
@@ -0,0 +1,37 @@
+"""
+Model for the timing of one LLM request.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .Provider import Provider
+from .ResponseSource import ResponseSource
+
+
+class TraceSpan(BaseModel):
+    """
+    Timing of one call to the prompt gateway.
+
+    `startTime` is a Unix timestamp so spans recorded in different processes share
+    one timeline. Queue wait is the time spent waiting for the rate limiter and the
+    in-flight limit, summed over attempts. Time to first byte is measured from
+    sending the successful attempt to receiving its response headers, and is None
+    when no response came over the network. `cooperationProbability` is the P(C)
+    a logprob-mode player sampled its move from, and None for any other call.
+    """
+
+    provider: Provider
+    model: str
+    player: Optional[str] = None
+    opponent: Optional[str] = None
+    turn: Optional[int] = None
+    source: ResponseSource = ResponseSource.PROVIDER
+    startTime: float
+    totalSeconds: float
+    queueWaitSeconds: float = 0.0
+    timeToFirstByteSeconds: Optional[float] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    cooperationProbability: Optional[float] = None
@@ -1,29 +1,75 @@
+from .BatchConfig import BatchConfig
 from .BenchmarkMetadata import BenchmarkMetadata
+from .CassetteEntry import CassetteEntry
 from .ClaudeModel import ClaudeModel
 from .ClaudeModelGrounding import ClaudeModelGrounding
+from .ClientConfig import ClientConfig
+from .DecisionMode import DecisionMode
+from .FakeServerConfig import FakeServerConfig
 from .GeminiModel import GeminiModel
 from .GeminiModelGrounding import GeminiModelGrounding
+from .GeminiModelLogprobs import GeminiModelLogprobs
+from .LatencyDistribution import LatencyDistribution
+from .MatchGraphMode import MatchGraphMode
+from .MatchUsage import MatchUsage
 from .Message import Message
+from .ModelPrice import ModelPrice
 from .OpenAiModel import OpenAiModel
 from .OpenAiModelGrounding import OpenAiModelGrounding
+from .OpenAiModelLogprobs import OpenAiModelLogprobs
+from .PerfResult import PerfResult
+from .PerfRun import PerfRun
 from .PlayerResult import PlayerResult
 from .PromptConfig import PromptConfig
 from .PromptContext import PromptContext
+from .PromptMode import PromptMode
+from .PromptRequest import PromptRequest
+from .PromptResponse import PromptResponse
+from .Provider import Provider
+from .RateLimitConfig import RateLimitConfig
+from .ResponseSource import ResponseSource
+from .RetryPolicy import RetryPolicy
 from .ScoreStatistics import ScoreStatistics
+from .TokenUsage import TokenUsage
+from .TournamentEngine import TournamentEngine
 from .TournamentIterationResult import TournamentIterationResult
+from .TraceSpan import TraceSpan
 
 __all__ = [
+    "BatchConfig",
     "BenchmarkMetadata",
+    "CassetteEntry",
+    "ClientConfig",
+    "DecisionMode",
+    "FakeServerConfig",
     "PromptContext",
+    "PromptMode",
     "PromptConfig",
+    "PromptRequest",
+    "PromptResponse",
     "ClaudeModel",
     "GeminiModel",
     "OpenAiModel",
     "ClaudeModelGrounding",
     "GeminiModelGrounding",
     "OpenAiModelGrounding",
+    "GeminiModelLogprobs",
+    "OpenAiModelLogprobs",
+    "LatencyDistribution",
+    "MatchGraphMode",
+    "MatchUsage",
     "Message",
+    "ModelPrice",
+    "Provider",
+    "RateLimitConfig",
+    "ResponseSource",
+    "RetryPolicy",
+    "TokenUsage",
+    "TournamentEngine",
     "TournamentIterationResult",
+    "TraceSpan",
+    "PerfResult",
+    "PerfRun",
     "PlayerResult",
     "ScoreStatistics",
 ]
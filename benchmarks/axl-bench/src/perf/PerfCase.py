@@ -0,0 +1,36 @@
+"""
+A single case of the performance benchmark suite.
+"""
+
+from typing import Any, Callable, ContextManager, Optional
+
+# Builds the case's inputs and yields the call to time; anything it created is
+# cleaned up when the context exits
+Prepare = Callable[[], ContextManager[Callable[[], Any]]]
+
+
+class PerfCase:
+    """
+    A named call to time, in the style of an asv benchmark.
+
+    `prepare` sets up the inputs outside the timed region. With `number` unset, the
+    call is repeated until a sample takes at least 0.2 seconds, as `timeit` does;
+    slow cases set `number=1` and fewer `repeats`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        group: str,
+        prepare: Prepare,
+        number: Optional[int] = None,
+        repeats: int = 5,
+    ):
+        self.name: str = name
+        self.group: str = group
+        self.prepare: Prepare = prepare
+        self.number: Optional[int] = number
+        self.repeats: int = repeats
+
+    def __repr__(self) -> str:
+        return f"{self.group}/{self.name}"
@@ -0,0 +1,15 @@
+from typing import List
+
+from . import endToEndCases, outputCases, promptCases, tournamentCases
+from .compareRuns import compareRuns
+from .measure import measure
+from .PerfCase import PerfCase
+
+CASES: List[PerfCase] = [
+    *promptCases.CASES,
+    *tournamentCases.CASES,
+    *outputCases.CASES,
+    *endToEndCases.CASES,
+]
+
+__all__ = ["CASES", "PerfCase", "compareRuns", "measure"]
@@ -0,0 +1,49 @@
+"""
+Compares the timings of two suite runs.
+"""
+
+from typing import Dict, List, Tuple
+
+from ..models import PerfResult, PerfRun
+
+
+def compareRuns(
+    baseline: PerfRun, current: PerfRun, threshold: float = 0.1
+) -> List[Tuple[str, float, float, float, str]]:
+    """
+    Compare the median timings of the cases two runs share.
+
+    Args:
+        baseline: The earlier run
+        current: The run to check
+        threshold: Relative change of the median beyond which a case counts as
+            slower or faster
+
+    Returns:
+        Per shared case: its key, the baseline and current medians, their ratio
+        and a verdict of "slower", "faster" or "same"
+    """
+    baselineResults: Dict[str, PerfResult] = {
+        f"{result.group}/{result.name}": result for result in baseline.results
+    }
+    rows = []
+
+    for result in current.results:
+        key = f"{result.group}/{result.name}"
+        previous = baselineResults.get(key)
+
+        if previous is None or previous.medianSeconds <= 0:
+            continue
+
+        ratio = result.medianSeconds / previous.medianSeconds
+
+        if ratio > 1 + threshold:
+            verdict = "slower"
+        elif ratio < 1 / (1 + threshold):
+            verdict = "faster"
+        else:
+            verdict = "same"
+
+        rows.append((key, previous.medianSeconds, result.medianSeconds, ratio, verdict))
+
+    return rows
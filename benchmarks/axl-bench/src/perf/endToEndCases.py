@@ -0,0 +1,189 @@
+"""
+Benchmark cases for whole iterations with LLM players whose requests are stubbed
+or replayed.
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+
+from ..fakeServer import FakeProviderServer
+from ..helpers.generateLlmPlayers import generateLlmPlayers
+from ..helpers.runTournamentIteration import runTournamentIteration
+from ..models import (
+    ClientConfig,
+    FakeServerConfig,
+    Message,
+    PromptResponse,
+    Provider,
+    TournamentEngine,
+)
+from ..runtime import cassette, clientRegistry
+from ..runtime.Cassette import CASSETTE_FILENAME
+from ..strategies import CompletionLLM
+from .PerfCase import PerfCase
+from .tournamentCases import classicalPlayers
+
+CLASSICAL_PLAYERS = 16
+# One model with each of the six prompt configurations
+LLM_PLAYERS = 6
+TURNS = 200
+# A small roster for the replay cases, whose recording is played for real
+REPLAY_CLASSICAL_PLAYERS = 4
+REPLAY_LLM_PLAYERS = 2
+REPLAY_TURNS = 10
+
+
+def _stubResponse(messages: List[Message], turn: int, **params: Any) -> PromptResponse:
+    """An instant reply that defects every fourth move."""
+    return PromptResponse(
+        text="D" if turn % 4 == 0 else "C",
+        inputTokens=sum(len(message.content) for message in messages) // 4,
+        cachedInputTokens=0,
+        outputTokens=1,
+        reasoningTokens=0,
+    )
+
+
+async def _stubResponseAsync(**params: Any) -> PromptResponse:
+    return _stubResponse(**params)
+
+
+@contextlib.contextmanager
+def _stubbedIteration(engine: TournamentEngine) -> Iterator[Callable[[], Any]]:
+    """
+    An iteration whose LLM players are answered by `_stubResponse` instead of
+    `runPrompt`, so only the harness's own work is timed.
+
+    The stub is patched into this process, where every engine plays its LLM
+    matches.
+    """
+    completionModule = sys.modules[CompletionLLM.__module__]
+    runPrompt = completionModule.runPrompt
+    runPromptAsync = completionModule.runPromptAsync
+    players = [
+        *classicalPlayers(CLASSICAL_PLAYERS),
+        *generateLlmPlayers(TURNS, includeGrounding=False)[:LLM_PLAYERS],
+    ]
+
+    completionModule.runPrompt = _stubResponse
+    completionModule.runPromptAsync = _stubResponseAsync
+
+    try:
+        yield lambda: runTournamentIteration(
+            players=players,
+            iterationNumber=1,
+            turns=TURNS,
+            engine=engine,
+            processes=2,
+        )
+    finally:
+        completionModule.runPrompt = runPrompt
+        completionModule.runPromptAsync = runPromptAsync
+
+
+@contextlib.contextmanager
+def _replayedIteration(engine: TournamentEngine) -> Iterator[Callable[[], Any]]:
+    """
+    An iteration replayed from a cassette recorded against the fake provider
+    server, which checks that the engine records and replays every request.
+
+    Raises:
+        RuntimeError: If the recording misses a request the server answered, or
+            the replay sends one to the server
+    """
+    players = [
+        *classicalPlayers(REPLAY_CLASSICAL_PLAYERS),
+        *generateLlmPlayers(REPLAY_TURNS, includeGrounding=False)[
+            :REPLAY_LLM_PLAYERS
+        ],
+    ]
+    clientConfig = clientRegistry.config
+
+    def playIteration() -> Any:
+        return runTournamentIteration(
+            players=players,
+            iterationNumber=1,
+            turns=REPLAY_TURNS,
+            engine=engine,
+            processes=2,
+        )
+
+    # The fake server accepts any key, but the SDKs insist on having one
+    for keyVariable in ("ANTHROPIC_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY"):
+        os.environ.setdefault(keyVariable, "fake")
+
+    with (
+        tempfile.TemporaryDirectory() as cassetteDir,
+        FakeProviderServer(FakeServerConfig(port=0)) as server,
+    ):
+        clientRegistry.configure(
+            ClientConfig(
+                baseUrls={
+                    Provider.ANTHROPIC: server.url,
+                    Provider.OPENAI: f"{server.url}/v1",
+                    Provider.GEMINI: server.url,
+                }
+            )
+        )
+
+        try:
+            cassette.record(cassetteDir)
+            playIteration()
+            cassette.close()
+
+            with open(Path(cassetteDir) / CASSETTE_FILENAME, "r") as f:
+                recorded = sum(1 for _ in f)
+
+            prompts = server.stats()["prompts"]
+
+            if recorded != prompts:
+                raise RuntimeError(
+                    f"{engine.value} recorded {recorded} of {prompts} requests"
+                )
+
+            def replayIteration() -> Any:
+                cassette.replay(cassetteDir)
+                result = playIteration()
+                livePrompts = server.stats()["prompts"] - prompts
+
+                if livePrompts:
+                    raise RuntimeError(
+                        f"{engine.value} sent {livePrompts} requests while replaying"
+                    )
+
+                return result
+
+            yield replayIteration
+        finally:
+            cassette.close()
+            clientRegistry.configure(clientConfig)
+
+
+CASES: List[PerfCase] = [
+    *(
+        PerfCase(
+            f"stubbedIteration[{engine.value},"
+            f"players={CLASSICAL_PLAYERS + LLM_PLAYERS}]",
+            "endToEnd",
+            lambda engine=engine: _stubbedIteration(engine),
+            number=1,
+            repeats=3,
+        )
+        for engine in TournamentEngine
+    ),
+    *(
+        PerfCase(
+            f"replayedIteration[{engine.value},"
+            f"players={REPLAY_CLASSICAL_PLAYERS + REPLAY_LLM_PLAYERS}]",
+            "endToEnd",
+            lambda engine=engine: _replayedIteration(engine),
+            number=1,
+            repeats=3,
+        )
+        for engine in TournamentEngine
+    ),
+]
@@ -0,0 +1,61 @@
+"""
+Times one benchmark case.
+"""
+
+import contextlib
+import os
+import statistics
+import time
+import timeit
+from typing import Iterator, Optional
+
+from ..models import PerfResult
+from .PerfCase import PerfCase
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    """Silence the progress output of the code under test."""
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            yield
+
+
+def measure(case: PerfCase, repeats: Optional[int] = None) -> PerfResult:
+    """
+    Time a benchmark case.
+
+    Args:
+        case: The case to time
+        repeats: Samples to take (default: the case's own)
+
+    Returns:
+        Per-call timings of the case
+    """
+    samples = []
+
+    with _quiet(), case.prepare() as call:
+        number = case.number
+
+        if number is None:
+            # Doubles as a warm-up run
+            number, _ = timeit.Timer(call).autorange()
+
+        for _ in range(repeats or case.repeats):
+            startTime = time.perf_counter()
+
+            for _ in range(number):
+                call()
+
+            samples.append((time.perf_counter() - startTime) / number)
+
+    return PerfResult(
+        name=case.name,
+        group=case.group,
+        repeats=len(samples),
+        number=number,
+        minSeconds=min(samples),
+        medianSeconds=statistics.median(samples),
+        meanSeconds=statistics.fmean(samples),
+        maxSeconds=max(samples),
+    )
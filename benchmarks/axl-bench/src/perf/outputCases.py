@@ -0,0 +1,188 @@
+"""
+Benchmark cases for saving and plotting the results of large synthetic runs.
+"""
+
+import contextlib
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+
+import numpy as np
+
+from ..helpers.generateVisualizations import generateVisualizations
+from ..helpers.saveResults import saveResults
+from ..models import (
+    BenchmarkMetadata,
+    PlayerResult,
+    ScoreStatistics,
+    TokenUsage,
+    TournamentIterationResult,
+)
+from ..runtime import (
+    ITERATION_LOG_FILENAME,
+    MATRIX_DIRNAME,
+    IterationResultLog,
+    MatrixStore,
+)
+from .PerfCase import PerfCase
+
+# (players, iterations): the size of a full runBenchmark roster, and a larger one
+RUN_SIZES = ((405, 5), (1000, 10))
+TURNS = 200
+
+
+def _syntheticIteration(
+    rng: np.random.Generator, names: List[str], iteration: int
+) -> TournamentIterationResult:
+    count = len(names)
+    payoffMatrix = rng.uniform(0, 5, (count, count))
+    cooperationMatrix = rng.uniform(0, 1, (count, count))
+    scores = payoffMatrix.mean(axis=1) * TURNS
+    wins = rng.integers(0, count, count)
+    cooperationRates = cooperationMatrix.mean(axis=1)
+    ranking = np.argsort(-scores, kind="stable")
+    ranks = np.empty(count, dtype=int)
+    ranks[ranking] = np.arange(1, count + 1)
+    llmPlayers = count // 3
+
+    return TournamentIterationResult(
+        iteration=iteration,
+        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+        durationSeconds=0.0,
+        turns=TURNS,
+        seed=iteration,
+        numPlayers=count,
+        playerNames=names,
+        scores=scores.tolist(),
+        rankedNames=[names[index] for index in ranking],
+        wins=wins.tolist(),
+        matchLengths=np.full((count, count), TURNS).tolist(),
+        cooperationRates=cooperationRates.tolist(),
+        cooperationMatrix=cooperationMatrix.tolist(),
+        payoffMatrix=payoffMatrix.tolist(),
+        scoreStatistics=ScoreStatistics(
+            mean=float(np.mean(scores)),
+            median=float(np.median(scores)),
+            std=float(np.std(scores)),
+            min=float(np.min(scores)),
+            max=float(np.max(scores)),
+        ),
+        playerResults=[
+            PlayerResult(
+                name=names[index],
+                score=float(scores[index]),
+                rank=int(ranks[index]),
+                wins=int(wins[index]),
+                cooperationRate=float(cooperationRates[index]),
+                # The last third stand in for LLM players
+                usage=(
+                    TokenUsage(
+                        requests=count * TURNS,
+                        inputTokens=count * TURNS * 400,
+                        outputTokens=count * TURNS,
+                        wallSeconds=count * 0.5,
+                    )
+                    if index >= count - llmPlayers
+                    else None
+                ),
+            )
+            for index in range(count)
+        ],
+    )
+
+
+def _syntheticRun(runPath: Path, players: int, iterations: int) -> BenchmarkMetadata:
+    """Write a run's iteration log and matrix store as runBenchmark does."""
+    rng = np.random.default_rng(players)
+    names = [f"Player{index:04d}" for index in range(players)]
+    resultLog = IterationResultLog(str(runPath / ITERATION_LOG_FILENAME))
+    matrixStore = MatrixStore(str(runPath / MATRIX_DIRNAME))
+
+    for iteration in range(1, iterations + 1):
+        resultLog.append(matrixStore.put(_syntheticIteration(rng, names, iteration)))
+
+    resultLog.close()
+
+    return BenchmarkMetadata(
+        benchmarkDate=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        iterations=iterations,
+        turnsPerMatch=TURNS,
+        baseSeed=1,
+        totalPlayers=players,
+        numAxelrodStrategies=players - players // 3,
+        numLlmPlayers=players // 3,
+        includeRegularModels=True,
+        includeGroundingModels=False,
+        maxTokens=1024,
+        temperature=1.0,
+    )
+
+
+@contextlib.contextmanager
+def _saveResults(players: int, iterations: int) -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as outputDir:
+        runPath = Path(outputDir) / "run"
+        metadata = _syntheticRun(runPath, players, iterations)
+        resultLog = IterationResultLog(str(runPath / ITERATION_LOG_FILENAME))
+
+        try:
+            yield lambda: saveResults(
+                allResults=resultLog,
+                benchmarkMetadata=metadata,
+                outputDir=outputDir,
+                runDir=str(runPath),
+            )
+        finally:
+            resultLog.close()
+
+
+@contextlib.contextmanager
+def _generateVisualizations(
+    players: int, iterations: int
+) -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as outputDir:
+        runPath = Path(outputDir) / "run"
+        metadata = _syntheticRun(runPath, players, iterations)
+        resultLog = IterationResultLog(str(runPath / ITERATION_LOG_FILENAME))
+
+        try:
+            saveResults(
+                allResults=resultLog,
+                benchmarkMetadata=metadata,
+                outputDir=outputDir,
+                runDir=str(runPath),
+            )
+        finally:
+            resultLog.close()
+
+        # Forced, or every render after the first would be skipped as unchanged
+        yield lambda: generateVisualizations(runDir=str(runPath), dpi=100, force=True)
+
+
+CASES: List[PerfCase] = [
+    *(
+        PerfCase(
+            f"saveResults[players={players},iterations={iterations}]",
+            "output",
+            lambda players=players, iterations=iterations: _saveResults(
+                players, iterations
+            ),
+            number=1,
+            repeats=3,
+        )
+        for players, iterations in RUN_SIZES
+    ),
+    *(
+        PerfCase(
+            f"generateVisualizations[players={players},iterations={iterations}]",
+            "output",
+            lambda players=players, iterations=iterations: _generateVisualizations(
+                players, iterations
+            ),
+            number=1,
+            repeats=3,
+        )
+        for players, iterations in RUN_SIZES
+    ),
+]
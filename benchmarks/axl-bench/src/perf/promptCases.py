@@ -0,0 +1,101 @@
+"""
+Benchmark cases for prompt rendering.
+"""
+
+import contextlib
+import random
+from typing import Any, Callable, Iterator, List, Tuple
+
+from axelrod import Action, History
+
+from ..models import PromptContext
+from ..prompts import PromptRenderer
+from ..prompts.contextualized import STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY
+from .PerfCase import PerfCase
+
+TURN_COUNTS = (10, 200, 1000)
+
+
+def _moves(turns: int) -> List[Tuple[Action, Action]]:
+    """A fixed random sequence of (own move, opponent move) pairs."""
+    rng = random.Random(turns)
+
+    return [
+        (rng.choice((Action.C, Action.D)), rng.choice((Action.C, Action.D)))
+        for _ in range(turns)
+    ]
+
+
+def _histories(turns: int) -> Tuple[History, History]:
+    personalHistory, opponentHistory = History(), History()
+
+    for play, coplay in _moves(turns):
+        personalHistory.append(play, coplay)
+        opponentHistory.append(coplay, play)
+
+    return personalHistory, opponentHistory
+
+
+@contextlib.contextmanager
+def _formatPrompt(turns: int) -> Iterator[Callable[[], Any]]:
+    """One prompt after `turns` moves."""
+    personalHistory, opponentHistory = _histories(turns)
+    context = PromptContext(
+        promptTemplate=STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY,
+        personalHistory=personalHistory,
+        opponentHistory=opponentHistory,
+        numTurns=turns,
+    )
+
+    yield context.formatPrompt
+
+
+@contextlib.contextmanager
+def _matchPrompts(turns: int, incremental: bool) -> Iterator[Callable[[], Any]]:
+    """Every prompt of a `turns`-move match, one per move."""
+    moves = _moves(turns)
+
+    def renderMatch() -> None:
+        personalHistory, opponentHistory = History(), History()
+        renderer = PromptRenderer(
+            STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY, numTurns=turns
+        )
+
+        for play, coplay in moves:
+            if incremental:
+                renderer.render(personalHistory, opponentHistory)
+            else:
+                PromptContext(
+                    promptTemplate=STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY,
+                    personalHistory=personalHistory,
+                    opponentHistory=opponentHistory,
+                    numTurns=turns,
+                ).formatPrompt()
+
+            personalHistory.append(play, coplay)
+            opponentHistory.append(coplay, play)
+
+    yield renderMatch
+
+
+CASES: List[PerfCase] = [
+    *(
+        PerfCase(
+            f"formatPrompt[turns={turns}]",
+            "prompt",
+            lambda turns=turns: _formatPrompt(turns),
+        )
+        for turns in TURN_COUNTS
+    ),
+    *(
+        PerfCase(
+            f"matchPrompts[{method},turns={turns}]",
+            "prompt",
+            lambda turns=turns, incremental=incremental: _matchPrompts(
+                turns, incremental
+            ),
+        )
+        for turns in TURN_COUNTS
+        for method, incremental in (("formatPrompt", False), ("PromptRenderer", True))
+    ),
+]
@@ -0,0 +1,69 @@
+"""
+Benchmark cases for tournament iterations between classical strategies.
+"""
+
+import contextlib
+from typing import Any, Callable, Iterator, List, Optional
+
+import axelrod as axl
+
+from ..helpers.runTournamentIteration import runTournamentIteration
+from ..models import TournamentEngine
+from .PerfCase import PerfCase
+
+ROSTER_SIZES = (8, 16, 32)
+TURNS = 200
+
+
+def classicalPlayers(count: int) -> List[axl.Player]:
+    """
+    The first `count` of the Axelrod strategies runBenchmark plays.
+
+    Args:
+        count: Number of strategies
+
+    Returns:
+        Fresh players
+    """
+    return [strategy() for strategy in axl.strategies[:count]]
+
+
+@contextlib.contextmanager
+def _iteration(
+    count: int, engine: TournamentEngine, processes: Optional[int] = None
+) -> Iterator[Callable[[], Any]]:
+    """
+    One iteration of `count` classical players. Only the hybrid engine uses
+    `processes`; the sequential engine plays in this process, so its timings do
+    not depend on the host's core count.
+    """
+    players = classicalPlayers(count)
+
+    yield lambda: runTournamentIteration(
+        players=players,
+        iterationNumber=1,
+        turns=TURNS,
+        engine=engine,
+        processes=processes,
+    )
+
+
+CASES: List[PerfCase] = [
+    *(
+        PerfCase(
+            f"runTournamentIteration[sequential,players={count}]",
+            "tournament",
+            lambda count=count: _iteration(count, TournamentEngine.SEQUENTIAL),
+            number=1,
+            repeats=3,
+        )
+        for count in ROSTER_SIZES
+    ),
+    PerfCase(
+        f"runTournamentIteration[hybrid,players={ROSTER_SIZES[-1]}]",
+        "tournament",
+        lambda: _iteration(ROSTER_SIZES[-1], TournamentEngine.HYBRID, processes=2),
+        number=1,
+        repeats=3,
+    ),
+]
@@ -0,0 +1,156 @@
+"""
+Incremental prompt rendering for one player within a match.
+"""
+
+from collections import deque
+from string import Formatter
+from typing import Deque, Dict, List, Optional, Tuple
+
+from axelrod import History
+
+HISTORY_FIELDS = ("personalHistory", "opponentHistory")
+
+_formatter = Formatter()
+
+
+class _MoveBuffer:
+    """
+    Moves of one side of a match as a string, extended by the moves played since
+    the last sync. With `lastTurns` set, only that many recent moves are kept in a
+    ring buffer.
+    """
+
+    def __init__(self, lastTurns: Optional[int]):
+        self._lastTurns: Optional[int] = lastTurns
+        self._source: Optional[History] = None
+        self._synced: int = 0
+        self._moves: str = ""
+        self._recent: Deque[str] = deque(maxlen=lastTurns)
+
+    def sync(self, history: History) -> str:
+        """
+        Catch up with `history` and return the moves to show.
+
+        Args:
+            history: The player's history, which only grows within a match
+
+        Returns:
+            The moves as a string of "C"s and "D"s
+        """
+        # A new History object or a shorter one means a new match
+        if history is not self._source or len(history) < self._synced:
+            self._source = history
+            self._synced = 0
+            self._moves = ""
+            self._recent.clear()
+
+        newMoves = [action.name for action in history[self._synced :]]
+        self._synced += len(newMoves)
+
+        if self._lastTurns is None:
+            self._moves += "".join(newMoves)
+            return self._moves
+
+        self._recent.extend(newMoves)
+        return "".join(self._recent)
+
+
+class PromptRenderer:
+    """
+    Renders a player's prompt move after move, producing the same text as
+    `PromptContext.formatPrompt`.
+
+    The template is parsed once: `numTurns` and `endProbability` are substituted up
+    front, leaving only the two history fields to fill on each move. Each side's
+    moves are kept in a buffer that grows by the moves played since the previous
+    render, so a move no longer re-joins the whole `History` or builds pydantic
+    models. Raises `KeyError` on construction if the template uses any other field.
+    """
+
+    def __init__(
+        self,
+        promptTemplate: str,
+        historyLastTurns: Optional[int] = None,
+        numTurns: Optional[int] = None,
+        endProbability: Optional[float] = None,
+    ):
+        variables: Dict[str, str] = {}
+
+        if numTurns is not None:
+            variables["numTurns"] = str(numTurns)
+
+        if endProbability is not None:
+            variables["endProbability"] = str(endProbability)
+
+        # Static text between the history fields, and where each history field goes
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, int, str, Optional[str]]] = []
+        text = ""
+
+        for literal, fieldName, formatSpec, conversion in _formatter.parse(
+            promptTemplate
+        ):
+            text += literal
+
+            if fieldName is None:
+                continue
+
+            if fieldName in HISTORY_FIELDS:
+                self._parts.append(text)
+                self._slots.append(
+                    (
+                        len(self._parts),
+                        HISTORY_FIELDS.index(fieldName),
+                        formatSpec or "",
+                        conversion,
+                    )
+                )
+                self._parts.append("")
+                text = ""
+                continue
+
+            if fieldName not in variables:
+                raise KeyError(fieldName)
+
+            value = _formatter.convert_field(variables[fieldName], conversion)
+            text += _formatter.format_field(value, formatSpec or "")
+
+        self._parts.append(text)
+
+        # Like the slice `history[-0:]`, a limit of 0 keeps the whole history
+        lastTurns = historyLastTurns or None
+        self._buffers: Tuple[_MoveBuffer, _MoveBuffer] = (
+            _MoveBuffer(lastTurns),
+            _MoveBuffer(lastTurns),
+        )
+
+    @property
+    def staticPrefix(self) -> str:
+        """The text before the first history field, the same on every move."""
+        return self._parts[0]
+
+    def render(self, personalHistory: History, opponentHistory: History) -> str:
+        """
+        Render the prompt for the next move.
+
+        Args:
+            personalHistory: The player's own moves so far
+            opponentHistory: The opponent's moves so far
+
+        Returns:
+            The formatted prompt string
+        """
+        moves = (
+            self._buffers[0].sync(personalHistory),
+            self._buffers[1].sync(opponentHistory),
+        )
+        parts = self._parts.copy()
+
+        for position, side, formatSpec, conversion in self._slots:
+            if formatSpec or conversion:
+                value = _formatter.convert_field(moves[side], conversion)
+                parts[position] = _formatter.format_field(value, formatSpec)
+            else:
+                parts[position] = moves[side]
+
+        return "".join(parts)
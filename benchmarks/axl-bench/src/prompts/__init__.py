@@ -1,6 +1,8 @@
 from . import contextualized, uncontextualized
+from .PromptRenderer import PromptRenderer
 
 __all__ = [
+    "PromptRenderer",
     "contextualized",
     "uncontextualized",
 ]
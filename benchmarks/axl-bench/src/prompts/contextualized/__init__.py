@@ -10,10 +10,12 @@ from .strategyProbabilisticEndFullHistory import (
 from .strategyProbabilisticEndLastTurns import (
     PROMPT as STRATEGY_PROBABILISTIC_END_LAST_TURNS,
 )
+from .turnUpdate import PROMPT as TURN_UPDATE
 
 __all__ = [
     "STRATEGY_PREDETERMINED_TURNS_FULL_HISTORY",
     "STRATEGY_PREDETERMINED_TURNS_LAST_TURNS",
     "STRATEGY_PROBABILISTIC_END_FULL_HISTORY",
     "STRATEGY_PROBABILISTIC_END_LAST_TURNS",
+    "TURN_UPDATE",
 ]
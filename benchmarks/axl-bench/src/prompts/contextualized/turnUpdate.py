@@ -0,0 +1,3 @@
+PROMPT = """Opponent move: {opponentMove}
+
+Your move:"""
@@ -1,7 +1,9 @@
 from .strategyFullHistory import PROMPT as STRATEGY_FULL_HISTORY
 from .strategyLastTurns import PROMPT as STRATEGY_LAST_TURNS
+from .turnUpdate import PROMPT as TURN_UPDATE
 
 __all__ = [
     "STRATEGY_FULL_HISTORY",
     "STRATEGY_LAST_TURNS",
+    "TURN_UPDATE",
 ]
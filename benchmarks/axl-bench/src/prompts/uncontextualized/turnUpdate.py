@@ -0,0 +1,3 @@
+PROMPT = """Other move: {opponentMove}
+
+Your move:"""
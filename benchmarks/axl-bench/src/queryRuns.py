@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Query the run index of a benchmark output directory.
+
+Lists the runs matching the given filters or, with --players, each player's
+summary statistics across those runs, without opening any run's result files.
+"""
+
+import argparse
+
+from .runtime import RunIndex
+
+
+def main():
+    """Main function to query the run index."""
+    parser = argparse.ArgumentParser(
+        description="Find and compare benchmark runs recorded in the run index"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="benchmark_results",
+        help="Output directory holding the run index (default: benchmark_results)",
+    )
+    parser.add_argument("--model", type=str, default=None, help="LLM model value")
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument("--turns", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="Base seed")
+    parser.add_argument(
+        "--since", type=str, default=None, help="Earliest date (ISO, inclusive)"
+    )
+    parser.add_argument(
+        "--until", type=str, default=None, help="Latest date (ISO, exclusive)"
+    )
+    parser.add_argument(
+        "--players",
+        action="store_true",
+        help="Show per-player results instead of runs",
+    )
+    parser.add_argument(
+        "--player", type=str, default=None, help="Only this player (with --players)"
+    )
+
+    args = parser.parse_args()
+    filters = {
+        "model": args.model,
+        "temperature": args.temperature,
+        "turns": args.turns,
+        "seed": args.seed,
+        "since": args.since,
+        "until": args.until,
+    }
+
+    runIndex = RunIndex(args.output_dir)
+
+    if args.players:
+        for row in runIndex.playerResults(player=args.player, **filters):
+            print(
+                f"{row['runId']}  {row['player']:<40} "
+                f"score {row['avgScore']:8.2f}  rank {row['avgRank']:6.2f}  "
+                f"wins {row['totalWins']:4d}  "
+                f"cooperation {row['avgCooperationRate']:.1%}"
+            )
+    else:
+        for row in runIndex.findRuns(**filters):
+            print(
+                f"{row['runId']}  {row['benchmarkDate']}  turns {row['turns']}  "
+                f"seed {row['baseSeed']}  temperature {row['temperature']}  "
+                f"iterations {row['numIterations']}  "
+                f"models {', '.join(row['models']) or '-'}"
+            )
+
+    runIndex.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,21 +11,69 @@ Results are saved with comprehensive metrics and visualizations.
 """
 
 import argparse
+import hashlib
+import json
+import math
+import os
 import time
 from datetime import datetime
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import axelrod as axl
 from dotenv import load_dotenv
 
+from .helpers.buildMatchGraph import buildMatchGraph
 from .helpers.generateLlmPlayers import generateLlmPlayers
 from .helpers.generateVisualizations import generateVisualizations
 from .helpers.runTournamentIteration import runTournamentIteration
 from .helpers.saveResults import saveResults
-from .models import BenchmarkMetadata, TournamentIterationResult
+from .models import (
+    BatchConfig,
+    BenchmarkMetadata,
+    ClientConfig,
+    DecisionMode,
+    MatchGraphMode,
+    ModelPrice,
+    PromptMode,
+    Provider,
+    RateLimitConfig,
+    RetryPolicy,
+    TournamentEngine,
+)
+from .runtime import (
+    ITERATION_LOG_FILENAME,
+    MATRIX_DIRNAME,
+    IterationResultLog,
+    MatrixStore,
+    batchDispatcher,
+    cassette,
+    clientRegistry,
+    contextCache,
+    matchStore,
+    rateLimiter,
+    responseCache,
+    retryExecutor,
+    tracer,
+    usageTracker,
+)
 
 load_dotenv()
 
+# Settings that change the matches played, which a resumed run must share
+CHECKPOINT_ARGS = [
+    "turns",
+    "seed",
+    "skip_regular",
+    "skip_grounding",
+    "max_tokens",
+    "temperature",
+    "decision_mode",
+    "prompt_mode",
+    "match_graph",
+    "samples_per_cluster",
+]
+
 
 def main():
     """Main function to run the benchmark."""
@@ -78,6 +126,242 @@ def main():
         default=1.0,
         help="Temperature parameter for LLMs (default: 1.0)",
     )
+    parser.add_argument(
+        "--decision-mode",
+        type=str,
+        choices=[mode.value for mode in DecisionMode],
+        default=DecisionMode.TEXT.value,
+        help="How LLM players pick moves: parse the text, or sample from "
+        "single-token logprobs where supported (default: text)",
+    )
+    parser.add_argument(
+        "--prompt-mode",
+        type=str,
+        choices=[mode.value for mode in PromptMode],
+        default=PromptMode.STATELESS.value,
+        help="How full-history LLM players see the game: the whole history in one "
+        "prompt per move, or one conversation per match that adds only the "
+        "opponent's last move (default: stateless)",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=[engine.value for engine in TournamentEngine],
+        default=TournamentEngine.SEQUENTIAL.value,
+        help="Tournament engine used to play each iteration (default: sequential)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=64,
+        help="Maximum concurrent LLM requests for the lockstep and hybrid engines "
+        "(default: 64)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes for classical matches in the hybrid engine "
+        "(default: all cores)",
+    )
+    parser.add_argument(
+        "--match-graph",
+        type=str,
+        choices=[mode.value for mode in MatchGraphMode],
+        default=MatchGraphMode.FULL.value,
+        help="Which pairs of players meet: the full round robin, LLMs against "
+        "classical strategies only, LLMs against a sample of each strategy "
+        "cluster, or the pairs in --match-pairs (default: full)",
+    )
+    parser.add_argument(
+        "--samples-per-cluster",
+        type=int,
+        default=2,
+        help="Classical opponents per strategy cluster for each LLM player with "
+        "the stratified match graph (default: 2)",
+    )
+    parser.add_argument(
+        "--match-pairs",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON list of [player, opponent] name pairs for the pairs match graph",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Send each round's LLM moves through the provider batch APIs at batch "
+        "prices (lockstep and hybrid engines only)",
+    )
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=0.5,
+        help="Seconds without a new move request before a batch is sent (default: 0.5)",
+    )
+    parser.add_argument(
+        "--batch-poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between status checks of a running batch (default: 30)",
+    )
+    parser.add_argument(
+        "--batch-max-requests",
+        type=int,
+        default=10_000,
+        help="Maximum requests per batch (default: 10000)",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=100,
+        help="Maximum pooled HTTP connections per provider client (default: 100)",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        action="append",
+        default=[],
+        metavar="PROVIDER=URL",
+        help="Send a provider's requests to another server, e.g. "
+        "openai=http://127.0.0.1:8000/v1 (repeatable)",
+    )
+    parser.add_argument(
+        "--fake-server",
+        type=str,
+        default=None,
+        metavar="URL",
+        help="Send every provider's requests to a fake provider server started "
+        "with runFakeServer, e.g. http://127.0.0.1:8000",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=60.0,
+        help="Timeout in seconds for each LLM API request (default: 60.0)",
+    )
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        default=None,
+        help="SQLite file for the persistent LLM response cache (default: disabled)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Maximum size of the response cache before LRU eviction (default: 512)",
+    )
+    parser.add_argument(
+        "--cache-sampled",
+        action="store_true",
+        help="Also cache responses for requests with temperature > 0",
+    )
+    parser.add_argument(
+        "--match-store",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="SQLite file of played matches; matches already in it are reused "
+        "instead of played again (default: disabled)",
+    )
+    parser.add_argument(
+        "--gemini-cache-ttl",
+        type=int,
+        default=None,
+        metavar="SECONDS",
+        help="Put each static prompt prefix in an explicit Gemini context cache "
+        "with this TTL (default: rely on implicit caching)",
+    )
+    parser.add_argument(
+        "--rate-limits",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON file mapping 'provider' or 'provider/model' to RateLimitConfig "
+        'fields, e.g. {"openai": {"requestsPerMinute": 500}} (default: no limits)',
+    )
+    parser.add_argument(
+        "--prices",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON file mapping model ids to ModelPrice fields in USD per million "
+        'tokens, e.g. {"gpt-4o": {"inputPerMillion": 2.5, "outputPerMillion": 10}} '
+        "(default: usage is reported without cost)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write a span for every LLM request to this Chrome trace file, "
+        "viewable in chrome://tracing or Perfetto (default: no trace file)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per LLM request before a transient error is raised (default: 3)",
+    )
+    parser.add_argument(
+        "--attempt-timeout",
+        type=float,
+        default=None,
+        help="Seconds before a single attempt is abandoned and retried "
+        "(default: no limit)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Total seconds allowed per LLM request across retries (default: no limit)",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="Send a duplicate request once an attempt is slower than this latency "
+        "percentile of its model, e.g. 95 (default: no hedging)",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Record every LLM request and response with timing to DIR",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Serve LLM responses recorded in DIR without any network access",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 for provider clients (requires the h2 package)",
+    )
+    parser.add_argument(
+        "--figure-format",
+        type=str,
+        default="png",
+        help="Image format of the visualizations, e.g. png, svg or pdf (default: png)",
+    )
+    parser.add_argument(
+        "--figure-dpi",
+        type=int,
+        default=300,
+        help="Resolution of raster visualizations (default: 300)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="RUN_DIR",
+        help="Resume an interrupted run from the match checkpoints in RUN_DIR",
+    )
 
     args = parser.parse_args()
 
@@ -85,6 +369,59 @@ def main():
         print("ERROR: Cannot skip both regular and grounding models!")
         return
 
+    if args.record and args.replay:
+        print("ERROR: Cannot record and replay in the same run!")
+        return
+
+    baseUrls: Dict[Provider, str] = {}
+
+    if args.fake_server:
+        fakeServerUrl = args.fake_server.rstrip("/")
+        baseUrls = {
+            Provider.ANTHROPIC: fakeServerUrl,
+            Provider.OPENAI: f"{fakeServerUrl}/v1",
+            Provider.GEMINI: fakeServerUrl,
+        }
+
+        # The fake server accepts any key, but the SDKs insist on having one
+        for keyVariable in ("ANTHROPIC_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY"):
+            os.environ.setdefault(keyVariable, "fake")
+
+    for setting in args.base_url:
+        providerName, _, url = setting.partition("=")
+
+        try:
+            baseUrls[Provider(providerName.strip().lower())] = url.strip()
+        except ValueError:
+            print(f"ERROR: Invalid --base-url '{setting}', expected PROVIDER=URL!")
+            return
+
+    if args.batch and args.engine == TournamentEngine.SEQUENTIAL.value:
+        print("ERROR: Batch mode needs the lockstep or hybrid engine!")
+        return
+
+    if (args.match_graph == MatchGraphMode.PAIRS.value) != bool(args.match_pairs):
+        print("ERROR: --match-pairs goes with, and only with, --match-graph pairs!")
+        return
+
+    if args.samples_per_cluster < 1:
+        print("ERROR: --samples-per-cluster must be at least 1!")
+        return
+
+    matchPairs: List[Tuple[str, str]] = []
+    # Hash of the pair list, so a resumed run checks the pairs rather than the path
+    matchPairsHash: Optional[str] = None
+
+    if args.match_pairs:
+        with open(args.match_pairs, "rb") as f:
+            matchPairsData = f.read()
+
+        matchPairs = [
+            (str(player), str(opponent))
+            for player, opponent in json.loads(matchPairsData)
+        ]
+        matchPairsHash = hashlib.sha256(matchPairsData).hexdigest()
+
     print("=" * 80)
     print("AXELROD TOURNAMENT BENCHMARK WITH LLM PLAYERS")
     print("=" * 80)
@@ -93,10 +430,125 @@ def main():
     print(f"  Turns per match: {args.turns}")
     print(f"  Random seed: {args.seed}")
     print(f"  Output directory: {args.output_dir}")
+    print(f"  Resume from: {args.resume or 'disabled'}")
     print(f"  Include regular models: {not args.skip_regular}")
     print(f"  Include grounding models: {not args.skip_grounding}")
     print(f"  Max tokens: {args.max_tokens}")
     print(f"  Temperature: {args.temperature}")
+    print(f"  Decision mode: {args.decision_mode}")
+    print(f"  Prompt mode: {args.prompt_mode}")
+    print(f"  Engine: {args.engine}")
+    print(f"  Concurrency: {args.concurrency}")
+    print(f"  Processes: {args.processes or 'all cores'}")
+    print(f"  Match graph: {args.match_graph}")
+    print(
+        f"  Batch mode: {args.batch}"
+        + (
+            f" (window {args.batch_window}s, poll every {args.batch_poll_interval}s, "
+            f"up to {args.batch_max_requests} requests)"
+            if args.batch
+            else ""
+        )
+    )
+    print(f"  Max connections per provider: {args.max_connections}")
+    print(f"  Request timeout: {args.request_timeout}s")
+    print(f"  HTTP/2: {args.http2}")
+    print(
+        "  Base URLs: "
+        + (
+            ", ".join(f"{key.value}={url}" for key, url in baseUrls.items())
+            or "provider defaults"
+        )
+    )
+    print(f"  Response cache: {args.cache_path or 'disabled'}")
+    print(f"  Match store: {args.match_store or 'disabled'}")
+    print(f"  Gemini context cache TTL: {args.gemini_cache_ttl or 'disabled'}")
+    print(f"  Rate limits: {args.rate_limits or 'none'}")
+    print(f"  Prices: {args.prices or 'none'}")
+    print(f"  Trace file: {args.trace or 'disabled'}")
+    print(f"  Max attempts: {args.max_attempts}")
+    print(f"  Attempt timeout: {args.attempt_timeout or 'none'}")
+    print(f"  Deadline: {args.deadline or 'none'}")
+    print(f"  Hedge percentile: {args.hedge_percentile or 'disabled'}")
+    print(f"  Record to: {args.record or 'disabled'}")
+    print(f"  Replay from: {args.replay or 'disabled'}")
+
+    clientRegistry.configure(
+        ClientConfig(
+            maxConnections=args.max_connections,
+            maxKeepaliveConnections=args.max_connections,
+            timeoutSeconds=args.request_timeout,
+            http2=args.http2,
+            baseUrls=baseUrls,
+        )
+    )
+
+    if args.cache_path:
+        responseCache.open(
+            args.cache_path,
+            maxBytes=args.cache_max_mb * 1024 * 1024,
+            includeSampled=args.cache_sampled,
+        )
+
+    if args.match_store:
+        matchStore.open(args.match_store)
+
+    contextCache.configure(args.gemini_cache_ttl)
+    batchDispatcher.configure(
+        BatchConfig(
+            windowSeconds=args.batch_window,
+            pollIntervalSeconds=args.batch_poll_interval,
+            maxRequests=args.batch_max_requests,
+        )
+        if args.batch
+        else None
+    )
+
+    if args.rate_limits:
+        with open(args.rate_limits, "r") as f:
+            rateLimiter.configure(
+                {key: RateLimitConfig(**value) for key, value in json.load(f).items()}
+            )
+
+    if args.prices:
+        with open(args.prices, "r") as f:
+            usageTracker.configure(
+                {key: ModelPrice(**value) for key, value in json.load(f).items()}
+            )
+
+    runDir = Path(
+        args.resume or Path(args.output_dir) / datetime.now().strftime("%Y%m%d_%H%M%S")
+    )
+    checkpointDir = runDir / "checkpoints"
+    checkpointDir.mkdir(parents=True, exist_ok=True)
+    runConfigPath = checkpointDir / "runConfig.json"
+    runConfig = {key: vars(args)[key] for key in CHECKPOINT_ARGS}
+    runConfig["match_pairs_sha256"] = matchPairsHash
+
+    if runConfigPath.exists():
+        with open(runConfigPath, "r") as f:
+            if json.load(f) != runConfig:
+                print(f"ERROR: {runDir} was started with different settings!")
+                return
+    else:
+        with open(runConfigPath, "w") as f:
+            json.dump(runConfig, f, indent=2)
+
+    print(f"\nMatch checkpoints: {checkpointDir} (resume with --resume {runDir})")
+
+    retryExecutor.configure(
+        RetryPolicy(
+            maxAttempts=args.max_attempts,
+            attemptTimeoutSeconds=args.attempt_timeout,
+            deadlineSeconds=args.deadline,
+            hedgePercentile=args.hedge_percentile,
+        )
+    )
+
+    if args.record:
+        cassette.record(args.record)
+    elif args.replay:
+        cassette.replay(args.replay)
 
     benchmarkStartTime = time.time()
 
@@ -120,6 +572,8 @@ def main():
         includeGrounding=not args.skip_grounding,
         maxTokens=args.max_tokens,
         temperature=args.temperature,
+        decisionMode=DecisionMode(args.decision_mode),
+        promptMode=PromptMode(args.prompt_mode),
     )
 
     print(f"Generated {len(llmPlayers)} LLM players")
@@ -130,23 +584,55 @@ def main():
     print(f"  - Axelrod strategies: {len(axelrodStrategies)}")
     print(f"  - LLM players: {len(llmPlayers)}")
 
+    # Each iteration's match graph, built up front so a bad pair list fails early
+    matchGraphs: Dict[int, Optional[List[Tuple[int, int]]]] = {}
+
+    try:
+        for i in range(args.iterations):
+            matchGraphs[i] = buildMatchGraph(
+                allPlayers,
+                mode=MatchGraphMode(args.match_graph),
+                seed=args.seed + i,
+                samplesPerCluster=args.samples_per_cluster,
+                pairs=matchPairs,
+            )
+    except ValueError as e:
+        print(f"ERROR: Invalid match graph: {e}!")
+        return
+
     # Step 4: Run tournament iterations
     print("\n" + "=" * 80)
     print("STEP 3: Running Tournament Iterations")
     print("=" * 80)
 
-    allResults: List[TournamentIterationResult] = []
+    resultLog = IterationResultLog(str(runDir / ITERATION_LOG_FILENAME))
+    completedIterations = resultLog.completedIterations()
+    matrixStore = MatrixStore(str(runDir / MATRIX_DIRNAME))
 
     for i in range(args.iterations):
         iterationSeed = args.seed + i
+
+        if i + 1 in completedIterations:
+            print(f"\nIteration {i + 1} already completed, skipping")
+            continue
+
         result = runTournamentIteration(
             players=allPlayers,
             turns=args.turns,
             seed=iterationSeed,
             iterationNumber=i + 1,
+            engine=TournamentEngine(args.engine),
+            concurrency=args.concurrency,
+            processes=args.processes,
+            checkpointPath=str(
+                checkpointDir / f"iteration_{i + 1}_seed_{iterationSeed}.csv"
+            ),
+            edges=matchGraphs[i],
         )
 
-        allResults.append(result)
+        resultLog.append(matrixStore.put(result))
+
+    resultLog.close()
 
     # Step 5: Save results
     print("\n" + "=" * 80)
@@ -165,12 +651,18 @@ def main():
         includeGroundingModels=not args.skip_grounding,
         maxTokens=args.max_tokens,
         temperature=args.temperature,
+        engine=args.engine,
+        decisionMode=args.decision_mode,
+        promptMode=args.prompt_mode,
+        matchGraph=args.match_graph,
+        llmModels=sorted({player.model.value for player in llmPlayers}),
     )
 
     savedFiles = saveResults(
-        allResults=allResults,
+        allResults=resultLog,
         benchmarkMetadata=benchmarkMetadata,
         outputDir=args.output_dir,
+        runDir=str(runDir),
     )
 
     # Step 6: Generate visualizations
@@ -182,11 +674,15 @@ def main():
     runOutputDir = savedFiles["fullResults"].rsplit("/", 1)[0]
 
     visualizationFiles = generateVisualizations(
-        allResults=allResults,
-        outputDir=runOutputDir,
+        runDir=runOutputDir,
+        imageFormat=args.figure_format,
+        dpi=args.figure_dpi,
     )
 
     savedFiles.update(visualizationFiles)
+    contextCache.close()
+    clientRegistry.close()
+    cassette.close()
 
     # Step 7: Print summary
     benchmarkEndTime = time.time()
@@ -198,6 +694,77 @@ def main():
     print(f"\nTotal duration: {totalDuration / 60:.2f} minutes")
     print(f"Average time per iteration: {totalDuration / args.iterations:.2f} seconds")
 
+    if responseCache.enabled:
+        cacheStats = responseCache.stats()
+        print(
+            f"Response cache: {cacheStats['hits']} hits, "
+            f"{cacheStats['misses']} misses ({cacheStats['hitRate']:.1%} hit rate), "
+            f"{cacheStats['entries']} entries"
+        )
+        responseCache.close()
+
+    if matchStore.enabled:
+        storeStats = matchStore.stats()
+        print(
+            f"Match store: {storeStats['hits']} matches reused, "
+            f"{storeStats['stored']} played and stored, "
+            f"{storeStats['entries']} entries"
+        )
+        matchStore.close()
+
+    for key, state in rateLimiter.snapshot().items():
+        print(
+            f"Rate limit {key}: concurrency {state['concurrencyLimit']:.1f}, "
+            f"{state['rateLimited']} rate limited responses"
+        )
+
+    if batchDispatcher.enabled:
+        batchStats = batchDispatcher.stats()
+        print(
+            f"Batches: {batchStats['batches']} sent with {batchStats['requests']} "
+            f"requests, {batchStats['unanswered']} requests sent on their own, "
+            f"{batchStats['failedBatches']} failed batches"
+        )
+
+    retryStats = retryExecutor.stats()
+
+    if retryStats["attempts"]:
+        print(
+            f"LLM requests: {retryStats['attempts']} attempts, "
+            f"{retryStats['retries']} retries, {retryStats['timeouts']} timeouts, "
+            f"{retryStats['hedges']} hedges ({retryStats['hedgeWins']} won)"
+        )
+
+    for player, usage in usageTracker.snapshot().items():
+        cachedShare = (
+            usage.cachedInputTokens / usage.inputTokens if usage.inputTokens else 0
+        )
+        cost = f", ${usage.costUsd:.4f}" if usage.costUsd is not None else ""
+        print(
+            f"Usage {player}: {usage.requests} requests, {usage.inputTokens} input "
+            f"tokens ({cachedShare:.1%} cached), {usage.outputTokens} output tokens "
+            f"({usage.reasoningTokens} reasoning), {usage.wallSeconds:.1f}s{cost}"
+        )
+
+    for model, latency in tracer.summary().items():
+        # NaN when none of the model's responses reported their first byte
+        timeToFirstByte = (
+            f"{latency['timeToFirstByteP50']:.2f}s"
+            if not math.isnan(latency["timeToFirstByteP50"])
+            else "n/a"
+        )
+        print(
+            f"Latency {model}: {latency['calls']} calls, "
+            f"p50 {latency['p50']:.2f}s, p90 {latency['p90']:.2f}s, "
+            f"p99 {latency['p99']:.2f}s, "
+            f"TTFB p50 {timeToFirstByte}, "
+            f"queue wait p50 {latency['queueWaitP50']:.2f}s"
+        )
+
+    if args.trace:
+        tracer.export(args.trace)
+        savedFiles["trace"] = args.trace
+
     print("\n" + "-" * 80)
     print("Saved Files:")
     print("-" * 80)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Serve the fake provider APIs on a local port.
+
+Answers the Anthropic, OpenAI and Gemini endpoints used by the helpers, with
+configurable latency, injected errors and rate limits and scripted moves, so the
+harness's throughput can be measured and benchmarks run end to end without API
+keys or network access.
+"""
+
+import argparse
+import threading
+
+from .fakeServer import FakeProviderServer
+from .models import FakeServerConfig, LatencyDistribution
+
+
+def main():
+    """Main function to run the fake provider server."""
+    parser = argparse.ArgumentParser(
+        description="Serve stand-ins for the provider APIs on a local port"
+    )
+    parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Interface to listen on"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Port to listen on (default: 8000)"
+    )
+    parser.add_argument(
+        "--batch-delay",
+        type=float,
+        default=1.0,
+        help="Seconds before a batch job completes (default: 1.0)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Mean seconds before a prompt is answered (default: 0)",
+    )
+    parser.add_argument(
+        "--latency-distribution",
+        type=str,
+        choices=[distribution.value for distribution in LatencyDistribution],
+        default=LatencyDistribution.CONSTANT.value,
+        help="Distribution of the response delays (default: constant)",
+    )
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="Half-width of uniform delays as a fraction of the mean, or sigma of "
+        "lognormal ones (default: 0.5)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of prompts answered with a 500 (default: 0)",
+    )
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of prompts answered with a 429 (default: 0)",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds sent with each 429 (default: 1.0)",
+    )
+    parser.add_argument(
+        "--policy",
+        type=str,
+        default="C",
+        help="Moves cycled through per model: C cooperates, D defects, R picks "
+        "at random, e.g. CCD (default: C)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for latencies, injected failures and random moves",
+    )
+
+    args = parser.parse_args()
+
+    if set(args.policy.upper()) - set("CDR") or not args.policy:
+        print("ERROR: The policy may only contain C, D and R!")
+        return
+
+    server = FakeProviderServer(
+        FakeServerConfig(
+            host=args.host,
+            port=args.port,
+            batchDelaySeconds=args.batch_delay,
+            latencySeconds=args.latency,
+            latencyDistribution=LatencyDistribution(args.latency_distribution),
+            latencySpread=args.latency_spread,
+            errorRate=args.error_rate,
+            rateLimitRate=args.rate_limit_rate,
+            retryAfterSeconds=args.retry_after,
+            policy=args.policy.upper(),
+            seed=args.seed,
+        )
+    ).start()
+
+    print(f"Fake provider server listening on {server.url}")
+    print("Point a benchmark at it with:")
+    print(f"  runBenchmark --fake-server {server.url}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        stats = server.stats()
+        print(
+            f"Served {stats['prompts']} prompts over {stats['connections']} "
+            f"connections ({stats['errors']} errors and {stats['rateLimited']} rate "
+            f"limits injected), and {stats['batches']} batch jobs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Time the harness with the performance benchmark suite.
+
+Covers prompt rendering, classical tournament iterations, saving and plotting
+large synthetic runs, and whole iterations whose LLM requests are stubbed. Each
+run is saved as JSON named after its commit, so a later run can be compared with
+it to catch regressions.
+"""
+
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .models import PerfRun
+from .perf import CASES, compareRuns, measure
+
+GROUPS = ("prompt", "tournament", "output", "endToEnd")
+
+
+def _gitState() -> Tuple[Optional[str], bool]:
+    """The checked-out commit and whether the tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+    return commit, bool(status.strip())
+
+
+def _loadBaseline(outputDir: Path, compare: str) -> Optional[PerfRun]:
+    """
+    The earlier results to compare with.
+
+    `compare` is a run file, a commit prefix or "latest" (the commit of the most
+    recent run). For a commit, its saved runs are merged, later timings of a case
+    replacing earlier ones, so runs of different groups combine into one baseline.
+    """
+    if Path(compare).is_file():
+        return PerfRun.model_validate_json(Path(compare).read_text())
+
+    runs = [
+        PerfRun.model_validate_json(path.read_text())
+        for path in sorted(outputDir.glob("*.json"))
+    ]
+
+    if compare == "latest" and runs:
+        compare = runs[-1].commit or ""
+
+    matches = [run for run in runs if (run.commit or "").startswith(compare)]
+
+    if not compare or not matches:
+        return None
+
+    results = {}
+
+    for run in matches:
+        for result in run.results:
+            results[(result.group, result.name)] = result
+
+    return matches[-1].model_copy(update={"results": list(results.values())})
+
+
+def main():
+    """Main function to run the performance benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description="Time the benchmark harness and compare with earlier runs"
+    )
+    parser.add_argument(
+        "--group",
+        type=str,
+        action="append",
+        choices=GROUPS,
+        default=[],
+        help="Only run the cases of this group (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--filter",
+        type=str,
+        default=None,
+        help="Only run the cases whose name contains this text",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=None,
+        help="Samples per case (default: each case's own, 3 to 5)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="perf_results",
+        help="Directory the run is saved to (default: perf_results)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        metavar="RUN",
+        help="Compare with an earlier run: a run file, a commit prefix, or 'latest'",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change of a median that counts as a regression (default: 0.1)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not save this run's results"
+    )
+
+    args = parser.parse_args()
+    outputDir = Path(args.output_dir)
+
+    baseline: Optional[PerfRun] = None
+
+    if args.compare:
+        baseline = _loadBaseline(outputDir, args.compare)
+
+        if baseline is None:
+            print(f"ERROR: No saved run matches '{args.compare}'!")
+            return
+
+    cases = [
+        case
+        for case in CASES
+        if (not args.group or case.group in args.group)
+        and (args.filter is None or args.filter in case.name)
+    ]
+
+    if not cases:
+        print("ERROR: No cases match the given group and filter!")
+        return
+
+    commit, dirty = _gitState()
+    run = PerfRun(
+        timestamp=time.strftime("%Y%m%d_%H%M%S"),
+        commit=commit,
+        dirty=dirty,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        cpuCount=os.cpu_count() or 1,
+    )
+
+    print(f"Running {len(cases)} cases at {(commit or 'unknown commit')[:10]}")
+
+    for case in cases:
+        result = measure(case, args.repeats)
+        run.results.append(result)
+        print(
+            f"  {case.group + '/' + case.name:<72} "
+            f"median {result.medianSeconds * 1000:10.3f} ms  "
+            f"min {result.minSeconds * 1000:10.3f} ms  "
+            f"({result.repeats} x {result.number})"
+        )
+
+    if not args.no_save:
+        outputDir.mkdir(parents=True, exist_ok=True)
+        runPath = outputDir / f"{run.timestamp}_{(commit or 'unknown')[:10]}.json"
+
+        with open(runPath, "w") as f:
+            f.write(run.model_dump_json(indent=2))
+
+        print(f"Saved results to: {runPath}")
+
+    if baseline is None:
+        return
+
+    rows = compareRuns(baseline, run, args.threshold)
+    slower: List[str] = [key for key, *_, verdict in rows if verdict == "slower"]
+
+    print(
+        f"\nCompared with {(baseline.commit or 'unknown')[:10]} ({baseline.timestamp}):"
+    )
+
+    for key, previous, current, ratio, verdict in rows:
+        print(
+            f"  {key:<72} {previous * 1000:10.3f} ms -> {current * 1000:10.3f} ms  "
+            f"x{ratio:.2f}  {verdict}"
+        )
+
+    if slower:
+        print(f"\n{len(slower)} cases are more than {args.threshold:.0%} slower")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Groups concurrent LLM requests into provider batch jobs.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..models import BatchConfig, PromptRequest, PromptResponse, Provider
+
+# Sends one batch of requests to a model and returns the response of each, or None
+# for requests the batch job did not answer
+RunBatch = Callable[
+    [Provider, str, List[PromptRequest]], Awaitable[List[Optional[PromptResponse]]]
+]
+
+_Entry = Tuple[PromptRequest, "asyncio.Future[Optional[PromptResponse]]"]
+
+
+class BatchDispatcher:
+    """
+    Sends move requests through the provider batch endpoints instead of one call
+    each.
+
+    Requests submitted on an event loop are held per (provider, model) until none
+    has arrived for `windowSeconds`, then sent as batches of at most `maxRequests`.
+    The lockstep engines request every move of a round at once, so each round
+    becomes one batch per model. Each batch job is polled every
+    `pollIntervalSeconds` until it ends. A request the job failed to answer
+    resolves to None, and the caller sends it on its own. Disabled until
+    `configure` is given a `BatchConfig`.
+    """
+
+    def __init__(self):
+        self.config: Optional[BatchConfig] = None
+        self._pending: Dict[Tuple[Provider, str], List[_Entry]] = {}
+        self._runBatch: Optional[RunBatch] = None
+        self._flushHandle: Optional[asyncio.TimerHandle] = None
+        self._jobs: Set["asyncio.Task[None]"] = set()
+        self._counters: Dict[str, int] = self._emptyCounters()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.config is not None
+
+    def configure(self, config: Optional[BatchConfig]) -> None:
+        """
+        Enable batch mode, or disable it with None.
+
+        Args:
+            config: Batching window, polling interval and batch size
+        """
+        self.config = config
+        self._counters = self._emptyCounters()
+
+    @staticmethod
+    def _emptyCounters() -> Dict[str, int]:
+        return {"batches": 0, "requests": 0, "unanswered": 0, "failedBatches": 0}
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    async def submit(
+        self, provider: Provider, request: PromptRequest, runBatch: RunBatch
+    ) -> Optional[PromptResponse]:
+        """
+        Add a request to the next batch and wait for its response.
+
+        Args:
+            provider: The provider serving the request
+            request: The request parameters
+            runBatch: Sends one batch to the provider's batch endpoint
+
+        Returns:
+            The response, or None if the batch job did not answer the request
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Optional[PromptResponse]]" = loop.create_future()
+        self._pending.setdefault((provider, request.model), []).append(
+            (request, future)
+        )
+        self._runBatch = runBatch
+
+        if self._flushHandle is not None:
+            self._flushHandle.cancel()
+
+        self._flushHandle = loop.call_later(self.config.windowSeconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Start one batch job per (provider, model) for the pending requests."""
+        self._flushHandle = None
+        pending, self._pending = self._pending, {}
+        maxRequests = self.config.maxRequests
+
+        for (provider, model), entries in pending.items():
+            for start in range(0, len(entries), maxRequests):
+                job = asyncio.ensure_future(
+                    self._send(provider, model, entries[start : start + maxRequests])
+                )
+                # Keep a reference so the job is not garbage collected mid-flight
+                self._jobs.add(job)
+                job.add_done_callback(self._jobs.discard)
+
+    async def _send(
+        self, provider: Provider, model: str, entries: List[_Entry]
+    ) -> None:
+        self._count("batches")
+        self._count("requests", len(entries))
+
+        try:
+            responses = await self._runBatch(
+                provider, model, [request for request, _ in entries]
+            )
+        except Exception:
+            # The requests fall back to calls of their own
+            self._count("failedBatches")
+            responses = [None] * len(entries)
+
+        for index, (_, future) in enumerate(entries):
+            response = responses[index] if index < len(responses) else None
+
+            if response is None:
+                self._count("unanswered")
+
+            if not future.done():
+                future.set_result(response)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the batch counters of the current configuration.
+
+        Returns:
+            Batches sent, requests they carried, requests left unanswered and
+            batches that failed outright
+        """
+        with self._lock:
+            return dict(self._counters)
+
+
+batchDispatcher = BatchDispatcher()
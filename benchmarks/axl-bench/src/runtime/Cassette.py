@@ -0,0 +1,183 @@
+"""
+Record/replay of every LLM request made during a benchmark run.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, TextIO
+
+from ..models import CassetteEntry, PromptRequest, PromptResponse
+
+CASSETTE_FILENAME = "cassette.jsonl"
+
+
+class Cassette:
+    """
+    Logs `runPrompt` requests and responses to disk, or serves them back.
+
+    In record mode every request is appended to `<dir>/cassette.jsonl` with its
+    response and wall time. In replay mode responses are served from that file
+    in the order they were recorded for each request, without any network access,
+    so a paid-for tournament can be re-run deterministically.
+
+    Worker processes record with `buffer` instead of writing to the file: their
+    entries are sent to the main process with `collect`, which writes them with
+    `merge`.
+    """
+
+    def __init__(self):
+        self.directory: Optional[Path] = None
+        self.recording: bool = False
+        self.replaying: bool = False
+        self._file: Optional[TextIO] = None
+        # Entries recorded by a worker process, until `collect` hands them over
+        self._buffered: Optional[List[CassetteEntry]] = None
+        self._responses: Dict[str, Deque[PromptResponse]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, directory: str) -> None:
+        """
+        Start recording requests to a directory.
+
+        Args:
+            directory: Directory to write the cassette to
+        """
+        self.close()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.directory / CASSETTE_FILENAME, "a")
+        self.recording = True
+
+    def buffer(self) -> None:
+        """Start recording requests in memory, for a worker process to send back."""
+        self.close()
+        self._buffered = []
+        self.recording = True
+
+    def replay(self, directory: str) -> None:
+        """
+        Start serving responses from a previously recorded directory.
+
+        Args:
+            directory: Directory containing a recorded cassette
+        """
+        self.close()
+        self.directory = Path(directory)
+        responses: Dict[str, Deque[PromptResponse]] = defaultdict(deque)
+
+        with open(self.directory / CASSETTE_FILENAME, "r") as f:
+            for line in f:
+                entry = json.loads(line)
+                responses[entry["requestKey"]].append(
+                    PromptResponse.model_validate(entry["response"])
+                )
+
+        self._responses = dict(responses)
+        self.replaying = True
+
+    def close(self) -> None:
+        """Stop recording or replaying."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            self._buffered = None
+            self._responses = {}
+            self.recording = False
+            self.replaying = False
+
+    def nextResponse(self, requestKey: str) -> PromptResponse:
+        """
+        Serve the next recorded response for a request.
+
+        Args:
+            requestKey: The request hash from `hashRequest`
+
+        Returns:
+            The recorded response
+
+        Raises:
+            ValueError: If the request was not recorded (often enough)
+        """
+        with self._lock:
+            responses = self._responses.get(requestKey)
+
+            if not responses:
+                raise ValueError(
+                    f"No recorded response left for request {requestKey} in "
+                    f"{self.directory}"
+                )
+
+            return responses.popleft()
+
+    def write(
+        self,
+        requestKey: str,
+        request: PromptRequest,
+        response: PromptResponse,
+        startTime: float,
+    ) -> None:
+        """
+        Append a request and its response to the cassette, if recording.
+
+        Args:
+            requestKey: The request hash from `hashRequest`
+            request: The request parameters
+            response: The model response
+            startTime: Epoch time at which the request started
+        """
+        if not self.recording:
+            return
+
+        entry = CassetteEntry(
+            requestKey=requestKey,
+            request=request,
+            response=response,
+            startTime=startTime,
+            durationSeconds=time.time() - startTime,
+        )
+
+        with self._lock:
+            if self._buffered is not None:
+                self._buffered.append(entry)
+            else:
+                self._writeEntries([entry])
+
+    def merge(self, entries: List[CassetteEntry]) -> None:
+        """
+        Write entries recorded in another process, if recording.
+
+        Args:
+            entries: The entries to write
+        """
+        with self._lock:
+            self._writeEntries(entries)
+
+    def collect(self) -> List[CassetteEntry]:
+        """
+        Hand over the entries buffered since the last call.
+
+        Returns:
+            The new entries, empty unless recording with `buffer`
+        """
+        with self._lock:
+            if not self._buffered:
+                return []
+
+            entries, self._buffered = self._buffered, []
+
+        return entries
+
+    def _writeEntries(self, entries: List[CassetteEntry]) -> None:
+        if self._file is not None and entries:
+            self._file.writelines(
+                json.dumps(entry.model_dump()) + "\n" for entry in entries
+            )
+            self._file.flush()
+
+
+cassette = Cassette()
@@ -0,0 +1,238 @@
+"""
+Process-wide registry of long-lived provider clients.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+from anthropic import (
+    Anthropic,
+    AsyncAnthropic,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+)
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types
+from openai import AsyncOpenAI, OpenAI
+from openai import DefaultAsyncHttpxClient as OpenAiAsyncHttpxClient
+from openai import DefaultHttpxClient as OpenAiHttpxClient
+
+from ..models import ClientConfig, Provider
+from .Tracer import Tracer
+
+load_dotenv()
+
+
+class ClientRegistry:
+    """
+    Builds each provider client once and shares it across all players and matches.
+
+    Every client owns a pooled HTTP transport, so keep-alive connections (and their
+    TLS sessions) are reused between moves instead of being renegotiated per call.
+    Async clients are kept per event loop, since their connections cannot outlive
+    the loop that opened them. SDK-level retries are disabled because the
+    retry executor owns retries for every provider. Each transport reports when
+    response headers arrive to the tracer, and is pointed at the configured base
+    URL of its provider, if any.
+
+    Gemini clients are handed httpx clients built here rather than httpx
+    arguments, since google-genai sends async requests through its own aiohttp
+    session whenever aiohttp is importable, which would ignore the pool limits,
+    HTTP/2 setting and tracer hooks.
+    """
+
+    def __init__(self, config: Optional[ClientConfig] = None):
+        self.config: ClientConfig = config or ClientConfig()
+        self._clients: Dict[Provider, Any] = {}
+        self._asyncClients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[Provider, Any]
+        ] = weakref.WeakKeyDictionary()
+        # The httpx clients built for Gemini clients, which close them here
+        self._geminiHttpClients: List[httpx.Client] = []
+        self._geminiAsyncHttpClients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def configure(self, config: ClientConfig) -> None:
+        """
+        Replace the client configuration, closing any clients built with the old one.
+
+        Args:
+            config: The new connection pool and timeout settings
+        """
+        self.close()
+        self.config = config
+
+    def getClient(self, provider: Provider) -> Any:
+        """
+        Return the shared client for a provider, building it on first use.
+
+        Args:
+            provider: The provider to get a client for
+
+        Returns:
+            The provider's client instance
+        """
+        client = self._clients.get(provider)
+
+        if client is None:
+            with self._lock:
+                client = self._clients.get(provider)
+
+                if client is None:
+                    client = self._buildClient(provider)
+                    self._clients[provider] = client
+
+        return client
+
+    def getAsyncClient(self, provider: Provider) -> Any:
+        """
+        Return the async client for a provider on the running event loop.
+
+        Args:
+            provider: The provider to get a client for
+
+        Returns:
+            The provider's async client instance (a `genai.Client` for Gemini,
+            whose `aio` interface is used)
+        """
+        loopClients = self._asyncClients.setdefault(asyncio.get_running_loop(), {})
+        client = loopClients.get(provider)
+
+        if client is None:
+            client = self._buildAsyncClient(provider)
+            loopClients[provider] = client
+
+        return client
+
+    async def aclose(self) -> None:
+        """Close the async clients opened on the running event loop."""
+        loop = asyncio.get_running_loop()
+        loopClients = self._asyncClients.pop(loop, {})
+
+        for provider, client in loopClients.items():
+            if provider == Provider.GEMINI:
+                await client.aio.aclose()
+            else:
+                await client.close()
+
+        httpClient = self._geminiAsyncHttpClients.pop(loop, None)
+
+        if httpClient is not None:
+            await httpClient.aclose()
+
+    def close(self) -> None:
+        """Close every client built so far and release their connection pools."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+
+            for httpClient in self._geminiHttpClients:
+                httpClient.close()
+
+            self._clients = {}
+            self._geminiHttpClients = []
+
+    def _httpxLimits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.maxConnections,
+            max_keepalive_connections=self.config.maxKeepaliveConnections,
+            keepalive_expiry=self.config.keepaliveExpirySeconds,
+        )
+
+    def _buildClient(self, provider: Provider) -> Any:
+        if provider == Provider.ANTHROPIC:
+            return Anthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                base_url=self.config.baseUrls.get(Provider.ANTHROPIC),
+                timeout=self.config.timeoutSeconds,
+                max_retries=0,
+                http_client=DefaultHttpxClient(
+                    limits=self._httpxLimits(),
+                    http2=self.config.http2,
+                    event_hooks={"response": [Tracer.onResponse]},
+                ),
+            )
+
+        if provider == Provider.OPENAI:
+            return OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=self.config.baseUrls.get(Provider.OPENAI),
+                timeout=self.config.timeoutSeconds,
+                max_retries=0,
+                http_client=OpenAiHttpxClient(
+                    limits=self._httpxLimits(),
+                    http2=self.config.http2,
+                    event_hooks={"response": [Tracer.onResponse]},
+                ),
+            )
+
+        httpClient = httpx.Client(
+            limits=self._httpxLimits(),
+            http2=self.config.http2,
+            timeout=self.config.timeoutSeconds,
+            event_hooks={"response": [Tracer.onResponse]},
+        )
+        self._geminiHttpClients.append(httpClient)
+
+        return genai.Client(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            http_options=types.HttpOptions(
+                base_url=self.config.baseUrls.get(Provider.GEMINI),
+                timeout=int(self.config.timeoutSeconds * 1000),
+                httpx_client=httpClient,
+            ),
+        )
+
+    def _buildAsyncClient(self, provider: Provider) -> Any:
+        if provider == Provider.ANTHROPIC:
+            return AsyncAnthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                base_url=self.config.baseUrls.get(Provider.ANTHROPIC),
+                timeout=self.config.timeoutSeconds,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=self._httpxLimits(),
+                    http2=self.config.http2,
+                    event_hooks={"response": [Tracer.onResponseAsync]},
+                ),
+            )
+
+        if provider == Provider.OPENAI:
+            return AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=self.config.baseUrls.get(Provider.OPENAI),
+                timeout=self.config.timeoutSeconds,
+                max_retries=0,
+                http_client=OpenAiAsyncHttpxClient(
+                    limits=self._httpxLimits(),
+                    http2=self.config.http2,
+                    event_hooks={"response": [Tracer.onResponseAsync]},
+                ),
+            )
+
+        httpClient = httpx.AsyncClient(
+            limits=self._httpxLimits(),
+            http2=self.config.http2,
+            timeout=self.config.timeoutSeconds,
+            event_hooks={"response": [Tracer.onResponseAsync]},
+        )
+        self._geminiAsyncHttpClients[asyncio.get_running_loop()] = httpClient
+
+        return genai.Client(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            http_options=types.HttpOptions(
+                base_url=self.config.baseUrls.get(Provider.GEMINI),
+                timeout=int(self.config.timeoutSeconds * 1000),
+                httpx_async_client=httpClient,
+            ),
+        )
+
+
+clientRegistry = ClientRegistry()
@@ -0,0 +1,162 @@
+"""
+Gemini explicit context caches for static prompt prefixes.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from google import genai
+from google.genai import types
+
+from .isRetryableError import isRetryableError
+
+# Recreate a cache this long before it expires, so no request uses a stale one
+EXPIRY_MARGIN_SECONDS = 60
+
+
+class ContextCache:
+    """
+    Creates one Gemini `CachedContent` per (model, prompt prefix) and reuses it.
+
+    Requests then send only the part of the prompt after the prefix and reference
+    the cache by name. A prefix Gemini refuses to cache (for instance because it is
+    shorter than the model's minimum) is remembered and sent inline from then on;
+    Gemini 2.5 models still cache such prefixes implicitly. Disabled until
+    `configure` is given a TTL, since explicit caches are billed for storage.
+    """
+
+    def __init__(self):
+        self.ttlSeconds: Optional[int] = None
+        # Cache name and expiry time per key, or None for prefixes sent inline
+        self._caches: Dict[str, Optional[Tuple[str, float]]] = {}
+        self._client: Optional[genai.Client] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttlSeconds is not None
+
+    def configure(self, ttlSeconds: Optional[int]) -> None:
+        """
+        Enable explicit caching, or disable it with None.
+
+        Args:
+            ttlSeconds: Lifetime of each created cache
+        """
+        self.close()
+        self.ttlSeconds = ttlSeconds
+
+    @staticmethod
+    def _key(model: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model}\0{prefix}".encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[str]]:
+        if key not in self._caches:
+            return False, None
+
+        entry = self._caches[key]
+
+        if entry is None:
+            return True, None
+
+        name, expiresAt = entry
+
+        if time.time() >= expiresAt - EXPIRY_MARGIN_SECONDS:
+            return False, None
+
+        return True, name
+
+    def lookup(self, client: genai.Client, model: str, prefix: str) -> Optional[str]:
+        """
+        Return the name of the cache holding a prefix, creating it on first use.
+
+        Args:
+            client: Gemini client used to create the cache
+            model: Model identifier the cache is created for
+            prefix: The static prompt prefix
+
+        Returns:
+            The cache name, or None if the prefix should be sent inline
+        """
+        if not self.enabled or not prefix:
+            return None
+
+        key = self._key(model, prefix)
+        found, name = self._cached(key)
+
+        if found:
+            return name
+
+        with self._lock:
+            found, name = self._cached(key)
+
+            if found:
+                return name
+
+            try:
+                cache = client.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[prefix],
+                        ttl=f"{self.ttlSeconds}s",
+                        display_name=f"axl-bench-{key[:16]}",
+                    ),
+                )
+            except Exception as error:
+                # Try again on the next request if the failure was transient
+                if isRetryableError(error):
+                    return None
+
+                self._caches[key] = None
+                return None
+
+            self._client = client
+            self._caches[key] = (cache.name, time.time() + self.ttlSeconds)
+
+            return cache.name
+
+    async def lookupAsync(
+        self, client: genai.Client, model: str, prefix: str
+    ) -> Optional[str]:
+        """
+        Like `lookup`, but creates missing caches off the event loop.
+
+        Args:
+            client: Gemini client used to create the cache
+            model: Model identifier the cache is created for
+            prefix: The static prompt prefix
+
+        Returns:
+            The cache name, or None if the prefix should be sent inline
+        """
+        if not self.enabled or not prefix:
+            return None
+
+        found, name = self._cached(self._key(model, prefix))
+
+        if found:
+            return name
+
+        return await asyncio.to_thread(self.lookup, client, model, prefix)
+
+    def close(self) -> None:
+        """Delete the caches created so far, instead of waiting for them to expire."""
+        with self._lock:
+            for entry in self._caches.values():
+                if entry is None or self._client is None:
+                    continue
+
+                try:
+                    self._client.caches.delete(name=entry[0])
+                except Exception:
+                    # Expired or already deleted
+                    pass
+
+            self._caches = {}
+            self._client = None
+
+
+contextCache = ContextCache()
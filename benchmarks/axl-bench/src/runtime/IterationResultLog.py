@@ -0,0 +1,86 @@
+"""
+Append-only, crash-safe log of tournament iteration results.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator, List, Set
+
+from ..models import TournamentIterationResult
+
+ITERATION_LOG_FILENAME = "iterations.jsonl"
+
+
+class IterationResultLog:
+    """
+    Streams `TournamentIterationResult`s to a JSONL file, one line per iteration.
+
+    Each line is flushed and fsynced as soon as its iteration finishes, so a crash
+    loses at most the iteration in progress. On open, a torn last line left by a
+    crash is cut off by rewriting the intact lines to a temporary file and renaming
+    it over the log. Reading streams the file line by line, so memory use does not
+    grow with the number of iterations.
+    """
+
+    def __init__(self, path: str):
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._repair()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _repair(self) -> None:
+        if not self.path.exists():
+            return
+
+        intactLines: List[str] = []
+        torn = False
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    json.loads(line)
+                except json.JSONDecodeError:
+                    torn = True
+                    break
+
+                if not line.endswith("\n"):
+                    torn = True
+                    break
+
+                intactLines.append(line)
+
+        if not torn:
+            return
+
+        tmpPath = self.path.with_name(f"{self.path.name}.tmp")
+
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            f.writelines(intactLines)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmpPath, self.path)
+
+    def append(self, result: TournamentIterationResult) -> None:
+        """
+        Durably append one iteration result.
+
+        Args:
+            result: The finished iteration
+        """
+        self._file.write(result.model_dump_json() + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def __iter__(self) -> Iterator[TournamentIterationResult]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield TournamentIterationResult.model_validate_json(line)
+
+    def completedIterations(self) -> Set[int]:
+        """Iteration numbers already in the log."""
+        return {result.iteration for result in self}
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,262 @@
+"""
+Persistent store of played matches, shared across runs.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import axelrod as axl
+from axelrod import Action
+from axelrod.action import actions_to_str, str_to_actions
+
+# The moves of both players in each repetition of a match
+Interactions = List[List[Tuple[Action, Action]]]
+
+
+class MatchStore:
+    """
+    SQLite-backed store of match interactions, keyed by everything that decides how
+    a match plays out.
+
+    A key is `matchKey` of both players' specs (class and constructor arguments),
+    the turns, tournament seed, game payoffs, noise, end probability, repetitions
+    and the Axelrod version. Tournaments seed each match from its key rather than
+    from its position in the round robin, with or without the store, so a pair
+    plays the same way whichever roster it appears in, and a run with one new
+    player only plays that player's matches. LLM matches are stored too, so a
+    stored LLM match is reused instead of asking the model again.
+    """
+
+    def __init__(self):
+        self.path: Optional[Path] = None
+        self.hits: int = 0
+        self.stored: int = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    def open(self, path: str) -> None:
+        """
+        Open (or create) the store database.
+
+        Args:
+            path: Path to the SQLite file
+        """
+        self.close()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            "key TEXT PRIMARY KEY, "
+            "playerSpec TEXT NOT NULL, "
+            "opponentSpec TEXT NOT NULL, "
+            "interactions TEXT NOT NULL)"
+        )
+        connection.commit()
+
+        self.path = Path(path)
+        self.hits = 0
+        self.stored = 0
+        self._connection = connection
+
+    def close(self) -> None:
+        """Close the store database, if open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @staticmethod
+    def playerSpec(player: axl.Player) -> str:
+        """
+        Identify a player by its class and constructor arguments.
+
+        Args:
+            player: The player
+
+        Returns:
+            The player's spec, the same for every instance built alike
+        """
+        playerClass = type(player)
+        arguments = json.dumps(player.init_kwargs, sort_keys=True, default=str)
+
+        return f"{playerClass.__module__}.{playerClass.__qualname__}{arguments}"
+
+    @staticmethod
+    def matchKey(
+        playerSpec: str,
+        opponentSpec: str,
+        turns: Optional[int],
+        seed: Optional[int],
+        game: axl.Game,
+        noise: float = 0,
+        probEnd: Optional[float] = None,
+        repetitions: int = 1,
+    ) -> str:
+        """
+        Hash everything that decides how a match plays out.
+
+        Args:
+            playerSpec: Spec of the first player
+            opponentSpec: Spec of the second player
+            turns: Turns per match
+            seed: The tournament's seed
+            game: The game scoring the match
+            noise: Probability that a move is flipped
+            probEnd: Probability of the match ending after each turn
+            repetitions: Repetitions of the match
+
+        Returns:
+            The store key
+        """
+        identity = json.dumps(
+            [
+                playerSpec,
+                opponentSpec,
+                turns,
+                seed,
+                [int(payoff) for payoff in game.RPST()],
+                noise,
+                probEnd,
+                repetitions,
+                axl.__version__,
+            ]
+        )
+
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def matchSeed(key: str) -> int:
+        """
+        The seed a match is played with, derived from its key.
+
+        Args:
+            key: The store key of the match
+
+        Returns:
+            A seed below 2**32
+        """
+        return int(key[:8], 16)
+
+    def contains(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Find which of the given matches are stored.
+
+        Args:
+            keys: Store keys
+
+        Returns:
+            The keys that are stored
+        """
+        keys = list(keys)
+        found: Set[str] = set()
+
+        with self._lock:
+            if self._connection is None:
+                return found
+
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                found.update(
+                    row[0]
+                    for row in self._connection.execute(
+                        "SELECT key FROM matches WHERE key IN "
+                        f"({', '.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+
+        return found
+
+    def get(self, key: str) -> Optional[Interactions]:
+        """
+        Look up a stored match.
+
+        Args:
+            key: The store key
+
+        Returns:
+            The moves of each repetition, or None if the match is not stored
+        """
+        with self._lock:
+            if self._connection is None:
+                return None
+
+            row = self._connection.execute(
+                "SELECT interactions FROM matches WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        self.hits += 1
+
+        return [
+            list(zip(str_to_actions(playerMoves), str_to_actions(opponentMoves)))
+            for playerMoves, opponentMoves in json.loads(row[0])
+        ]
+
+    def put(
+        self, key: str, playerSpec: str, opponentSpec: str, interactions: Interactions
+    ) -> None:
+        """
+        Store a played match.
+
+        Args:
+            key: The store key
+            playerSpec: Spec of the first player
+            opponentSpec: Spec of the second player
+            interactions: The moves of each repetition
+        """
+        # Each repetition as the two players' moves, e.g. ["CCD", "CDD"]
+        serializedInteractions = json.dumps(
+            [
+                [
+                    actions_to_str(moves[0] for moves in repetition),
+                    actions_to_str(moves[1] for moves in repetition),
+                ]
+                for repetition in interactions
+            ]
+        )
+
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?)",
+                (key, playerSpec, opponentSpec, serializedInteractions),
+            )
+            self._connection.commit()
+            self.stored += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the store's counters.
+
+        Returns:
+            Matches reused from the store, matches stored since it was opened, and
+            matches it holds
+        """
+        entries = 0
+
+        with self._lock:
+            if self._connection is not None:
+                entries = self._connection.execute(
+                    "SELECT COUNT(*) FROM matches"
+                ).fetchone()[0]
+
+        return {"hits": self.hits, "stored": self.stored, "entries": entries}
+
+
+matchStore = MatchStore()
@@ -0,0 +1,173 @@
+"""
+Columnar, memory-mappable store for the matrix-shaped iteration results.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..models import TournamentIterationResult
+
+MATRIX_DIRNAME = "matrices"
+MATRIX_MANIFEST_FILENAME = "manifest.json"
+MATRIX_DTYPES: Dict[str, str] = {
+    "payoffMatrix": "float64",
+    "matchLengths": "int32",
+    "cooperationMatrix": "float64",
+}
+
+
+class MatrixStore:
+    """
+    Keeps the player-by-player matrices of each iteration as `.npy` files.
+
+    `put` moves `payoffMatrix`, `matchLengths` and `cooperationMatrix` out of a
+    `TournamentIterationResult` into one binary file per matrix, and records them in
+    a small JSON manifest. Files are opened with `mmap_mode="r"`, so reading a slice
+    (say, the top 30 players) only touches those rows. The other fields stay in the
+    iteration log.
+    """
+
+    def __init__(self, directory: str):
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifestPath: Path = self.directory / MATRIX_MANIFEST_FILENAME
+        self.manifest: Dict[str, Any] = {"playerNames": [], "iterations": {}}
+
+        if self.manifestPath.exists():
+            with open(self.manifestPath, "r") as f:
+                self.manifest = json.load(f)
+
+    def put(self, result: TournamentIterationResult) -> TournamentIterationResult:
+        """
+        Store the matrices of an iteration.
+
+        Args:
+            result: The finished iteration
+
+        Returns:
+            A copy of the result without its matrices
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+
+        for field, dtype in MATRIX_DTYPES.items():
+            value = getattr(result, field)
+
+            if value is None:
+                continue
+
+            array = np.asarray(value, dtype=dtype)
+            filename = f"{field}_iteration_{result.iteration}.npy"
+            self._atomicSave(self.directory / filename, array)
+            entries[field] = {
+                "file": filename,
+                "shape": list(array.shape),
+                "dtype": dtype,
+            }
+
+        self.manifest["playerNames"] = result.playerNames
+        self.manifest["iterations"][str(result.iteration)] = entries
+        self._writeManifest()
+
+        return result.model_copy(update={field: None for field in MATRIX_DTYPES})
+
+    @staticmethod
+    def _atomicSave(path: Path, array: np.ndarray) -> None:
+        tmpPath = path.with_name(f"{path.name}.tmp")
+
+        with open(tmpPath, "wb") as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmpPath, path)
+
+    def _writeManifest(self) -> None:
+        tmpPath = self.manifestPath.with_name(f"{MATRIX_MANIFEST_FILENAME}.tmp")
+
+        with open(tmpPath, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmpPath, self.manifestPath)
+
+    @property
+    def playerNames(self) -> List[str]:
+        """Names of the players indexing the matrices."""
+        return self.manifest["playerNames"]
+
+    def iterations(self, field: Optional[str] = None) -> List[int]:
+        """
+        Iteration numbers in the store.
+
+        Args:
+            field: Only count iterations that have this matrix (default: any)
+
+        Returns:
+            Sorted iteration numbers
+        """
+        return sorted(
+            int(iteration)
+            for iteration, entries in self.manifest["iterations"].items()
+            if field is None or field in entries
+        )
+
+    def load(self, field: str, iteration: int) -> np.ndarray:
+        """
+        Memory-map one matrix.
+
+        Args:
+            field: The matrix name, e.g. "payoffMatrix"
+            iteration: The iteration number
+
+        Returns:
+            A read-only memory-mapped array
+        """
+        entry = self.manifest["iterations"][str(iteration)][field]
+
+        return np.load(self.directory / entry["file"], mmap_mode="r")
+
+    def mean(
+        self,
+        field: str,
+        rows: Optional[Sequence[int]] = None,
+        columns: Optional[Sequence[int]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Average a matrix, or a block of it, over all iterations.
+
+        Only the selected block of each iteration is read, and at most one block
+        is held in memory besides the running sum.
+
+        Args:
+            field: The matrix name, e.g. "payoffMatrix"
+            rows: Player indices of the rows to keep (default: all)
+            columns: Player indices of the columns to keep (default: all)
+
+        Returns:
+            The mean block, or None if no iteration has this matrix
+        """
+        iterations = self.iterations(field)
+
+        if not iterations:
+            return None
+
+        total: Optional[np.ndarray] = None
+
+        for iteration in iterations:
+            matrix = self.load(field, iteration)
+
+            if rows is not None:
+                matrix = matrix[np.asarray(rows)]
+
+            if columns is not None:
+                matrix = matrix[:, np.asarray(columns)]
+
+            block = np.array(matrix, dtype="float64")
+            total = block if total is None else total + block
+
+        return total / len(iterations)
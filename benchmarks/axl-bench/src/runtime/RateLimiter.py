@@ -0,0 +1,360 @@
+"""
+Adaptive, per-provider rate limiting of LLM requests.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple, Union
+
+from ..models import PromptRequest, Provider, RateLimitConfig
+from .isRateLimitError import isRateLimitError
+
+
+class TokenBucket:
+    """A bucket holding up to `perMinute` units, refilled continuously."""
+
+    def __init__(self, perMinute: int):
+        self.capacity: float = float(perMinute)
+        self.available: float = float(perMinute)
+        self.refillPerSecond: float = perMinute / 60.0
+        self.updatedAt: float = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updatedAt
+        self.available = min(
+            self.capacity, self.available + elapsed * self.refillPerSecond
+        )
+        self.updatedAt = now
+
+    def delayFor(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they already are)."""
+        amount = min(amount, self.capacity)
+
+        if self.available >= amount:
+            return 0.0
+
+        return (amount - self.available) / self.refillPerSecond
+
+
+class _Waiter:
+    """A thread queued for a slot, woken when it may try again."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def wake(self) -> None:
+        self._event.set()
+
+    def wait(self, timeout: Optional[float]) -> None:
+        self._event.wait(timeout)
+        self._event.clear()
+
+
+class _AsyncWaiter:
+    """A task queued for a slot, woken from any thread when it may try again."""
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def wake(self) -> None:
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except TimeoutError:
+            pass
+
+        self._event.clear()
+
+
+class RateLimitState:
+    """Buckets and AIMD concurrency window of one rate limit key."""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config: RateLimitConfig = config
+        self.requestBucket: Optional[TokenBucket] = (
+            TokenBucket(config.requestsPerMinute) if config.requestsPerMinute else None
+        )
+        self.tokenBucket: Optional[TokenBucket] = (
+            TokenBucket(config.tokensPerMinute) if config.tokensPerMinute else None
+        )
+        self.concurrencyLimit: float = float(config.initialConcurrency)
+        self.inFlight: int = 0
+        self.rateLimited: int = 0
+        # Requests waiting for a slot, served in arrival order
+        self.queue: Deque[Union[_Waiter, _AsyncWaiter]] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self.queue)
+
+
+class RateLimiter:
+    """
+    Keeps each provider (or model) at its maximum sustainable throughput.
+
+    Every key has optional requests-per-minute and tokens-per-minute buckets and a
+    concurrency window that grows additively while requests succeed and halves
+    whenever the provider answers with a 429 or overload error (AIMD). Limits are
+    looked up by `provider/model` first, then by `provider`; requests with no
+    configured limit pass straight through.
+
+    Requests waiting for a slot are queued per key and served first come, first
+    served: only the request at the head of the queue tries to take a slot, sleeping
+    until its buckets refill or until a finished request frees a slot and wakes it.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, RateLimitConfig] = {}
+        self._states: Dict[str, RateLimitState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def limits(self) -> Dict[str, RateLimitConfig]:
+        """The configured limits, keyed by `provider` or `provider/model`."""
+        with self._lock:
+            return dict(self._configs)
+
+    def configure(self, limits: Dict[str, RateLimitConfig]) -> None:
+        """
+        Replace the configured limits.
+
+        Args:
+            limits: Mapping of `provider` or `provider/model` to its limits
+        """
+        with self._lock:
+            self._configs = dict(limits)
+            self._states = {}
+
+    @staticmethod
+    def estimateTokens(request: PromptRequest) -> int:
+        """Rough token cost of a request: ~4 characters per input token plus output."""
+        promptCharacters = sum(len(msg.content) for msg in request.messages)
+
+        return promptCharacters // 4 + request.maxTokens
+
+    def _state(self, provider: Provider, model: str) -> Optional[RateLimitState]:
+        for key in (f"{provider.value}/{model}", provider.value):
+            config = self._configs.get(key)
+
+            if config is not None:
+                with self._lock:
+                    if key not in self._states:
+                        self._states[key] = RateLimitState(config)
+
+                    return self._states[key]
+
+        return None
+
+    def _tryAcquire(
+        self, state: RateLimitState, estimatedTokens: int
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Take a slot if possible; call with the lock held.
+
+        Returns:
+            Whether a slot was taken, and if not, how long until the buckets allow
+            one (None if the request waits for a slot to be freed)
+        """
+        now = time.monotonic()
+        delay = 0.0
+
+        if state.requestBucket is not None:
+            state.requestBucket.refill(now)
+            delay = max(delay, state.requestBucket.delayFor(1))
+
+        if state.tokenBucket is not None:
+            state.tokenBucket.refill(now)
+            delay = max(delay, state.tokenBucket.delayFor(estimatedTokens))
+
+        if state.inFlight >= int(state.concurrencyLimit):
+            return False, None
+
+        if delay > 0:
+            return False, delay
+
+        if state.requestBucket is not None:
+            state.requestBucket.available -= 1
+
+        if state.tokenBucket is not None:
+            state.tokenBucket.available -= min(
+                estimatedTokens, state.tokenBucket.capacity
+            )
+
+        state.inFlight += 1
+
+        return True, None
+
+    def _poll(
+        self,
+        state: RateLimitState,
+        waiter: Union[_Waiter, _AsyncWaiter],
+        estimatedTokens: int,
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Take a slot if the waiter is at the head of the queue and one is free.
+
+        Returns:
+            Whether a slot was taken, and if not, how long the waiter may sleep
+            before trying again (None to sleep until woken)
+        """
+        with self._lock:
+            if state.queue[0] is not waiter:
+                return False, None
+
+            acquired, delay = self._tryAcquire(state, estimatedTokens)
+
+            if acquired:
+                state.queue.popleft()
+
+                if state.queue:
+                    state.queue[0].wake()
+
+            return acquired, delay
+
+    def _leave(
+        self, state: RateLimitState, waiter: Union[_Waiter, _AsyncWaiter]
+    ) -> None:
+        """Drop a waiter that gave up, handing the head of the queue on."""
+        with self._lock:
+            if waiter in state.queue:
+                wasHead = state.queue[0] is waiter
+                state.queue.remove(waiter)
+
+                if wasHead and state.queue:
+                    state.queue[0].wake()
+
+    def _release(self, state: RateLimitState, error: Optional[BaseException]) -> None:
+        with self._lock:
+            state.inFlight -= 1
+            config = state.config
+
+            if error is not None and isRateLimitError(error):
+                state.rateLimited += 1
+                state.concurrencyLimit = max(
+                    float(config.minConcurrency), state.concurrencyLimit / 2
+                )
+            elif error is None:
+                state.concurrencyLimit = min(
+                    float(config.maxConcurrency),
+                    state.concurrencyLimit + 1 / state.concurrencyLimit,
+                )
+
+            if state.queue:
+                state.queue[0].wake()
+
+    @contextmanager
+    def limit(self, provider: Provider, request: PromptRequest) -> Iterator[None]:
+        """
+        Block until a request may be sent, and account for its outcome.
+
+        Args:
+            provider: The provider serving the request
+            request: The request parameters
+        """
+        state = self._state(provider, request.model)
+
+        if state is None:
+            yield
+            return
+
+        estimatedTokens = self.estimateTokens(request)
+        waiter = _Waiter()
+
+        with self._lock:
+            state.queue.append(waiter)
+
+        try:
+            while True:
+                acquired, delay = self._poll(state, waiter, estimatedTokens)
+
+                if acquired:
+                    break
+
+                waiter.wait(delay)
+        except BaseException:
+            self._leave(state, waiter)
+            raise
+
+        try:
+            yield
+        except BaseException as error:
+            self._release(state, error)
+            raise
+        else:
+            self._release(state, None)
+
+    @asynccontextmanager
+    async def limitAsync(
+        self, provider: Provider, request: PromptRequest
+    ) -> AsyncIterator[None]:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            provider: The provider serving the request
+            request: The request parameters
+        """
+        state = self._state(provider, request.model)
+
+        if state is None:
+            yield
+            return
+
+        estimatedTokens = self.estimateTokens(request)
+        waiter = _AsyncWaiter()
+
+        with self._lock:
+            state.queue.append(waiter)
+
+        try:
+            while True:
+                acquired, delay = self._poll(state, waiter, estimatedTokens)
+
+                if acquired:
+                    break
+
+                await waiter.wait(delay)
+        except BaseException:
+            self._leave(state, waiter)
+            raise
+
+        try:
+            yield
+        except BaseException as error:
+            self._release(state, error)
+            raise
+        else:
+            self._release(state, None)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the live state of every active rate limit key.
+
+        Returns:
+            Mapping of key to its concurrency limit, in-flight and queued requests,
+            and the number of rate limit errors seen
+        """
+        with self._lock:
+            return {
+                key: {
+                    "concurrencyLimit": state.concurrencyLimit,
+                    "inFlight": state.inFlight,
+                    "waiting": state.waiting,
+                    "rateLimited": state.rateLimited,
+                }
+                for key, state in self._states.items()
+            }
+
+    def queueDepth(self) -> int:
+        """Total number of requests currently waiting for a slot."""
+        with self._lock:
+            return sum(state.waiting for state in self._states.values())
+
+
+rateLimiter = RateLimiter()
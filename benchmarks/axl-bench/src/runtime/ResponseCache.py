@@ -0,0 +1,212 @@
+"""
+Persistent, content-addressed cache of LLM responses.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..models import PromptResponse
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of `runPrompt` responses with size-bounded LRU eviction.
+
+    Entries are keyed by `hashRequest` of (model, rendered messages, temperature,
+    maxTokens, grounding flag). Only greedy (`temperature == 0`) requests are
+    cached unless `includeSampled` is set, since replaying a sampled response
+    changes the behaviour of stochastic players.
+    """
+
+    def __init__(self):
+        self.path: Optional[Path] = None
+        self.maxBytes: int = 0
+        self.includeSampled: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+        self._sizeBytes: int = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._connection is not None
+
+    def open(
+        self,
+        path: str,
+        maxBytes: int = 512 * 1024 * 1024,
+        includeSampled: bool = False,
+    ) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite file
+            maxBytes: Maximum total size of cached responses before eviction
+            includeSampled: Whether to also cache requests with temperature > 0
+        """
+        self.close()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "response TEXT NOT NULL, "
+            "sizeBytes INTEGER NOT NULL, "
+            "lastAccess REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS responsesLastAccess ON responses (lastAccess)"
+        )
+        connection.commit()
+
+        self.path = Path(path)
+        self.maxBytes = maxBytes
+        self.includeSampled = includeSampled
+        self.hits = 0
+        self.misses = 0
+        self._sizeBytes = connection.execute(
+            "SELECT COALESCE(SUM(sizeBytes), 0) FROM responses"
+        ).fetchone()[0]
+        self._connection = connection
+
+    def close(self) -> None:
+        """Close the cache database, if open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def keyFor(self, requestKey: str, temperature: float) -> Optional[str]:
+        """
+        Return the cache key of a request, if it may be cached.
+
+        Args:
+            requestKey: The request hash from `hashRequest`
+            temperature: Temperature for sampling of the request
+
+        Returns:
+            The key, or None if the cache is closed or the request is not cacheable
+        """
+        if not self.enabled or (temperature > 0 and not self.includeSampled):
+            return None
+
+        return requestKey
+
+    def get(self, key: Optional[str]) -> Optional[PromptResponse]:
+        """
+        Look up a cached response and mark it as recently used.
+
+        Args:
+            key: The cache key from `keyFor`
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        if key is None:
+            return None
+
+        with self._lock:
+            if self._connection is None:
+                return None
+
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET lastAccess = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._connection.commit()
+            self.hits += 1
+
+            return PromptResponse.model_validate_json(row[0])
+
+    def put(self, key: Optional[str], response: PromptResponse) -> None:
+        """
+        Store a response, evicting the least recently used entries if needed.
+
+        Args:
+            key: The cache key from `keyFor`
+            response: The response to cache
+        """
+        if key is None:
+            return
+
+        serializedResponse = response.model_dump_json()
+        sizeBytes = len(serializedResponse.encode("utf-8"))
+
+        with self._lock:
+            if self._connection is None:
+                return
+
+            previous = self._connection.execute(
+                "SELECT sizeBytes FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, serializedResponse, sizeBytes, time.time()),
+            )
+            self._sizeBytes += sizeBytes - (previous[0] if previous else 0)
+
+            while self._sizeBytes > self.maxBytes:
+                oldest = self._connection.execute(
+                    "SELECT key, sizeBytes FROM responses ORDER BY lastAccess LIMIT 100"
+                ).fetchall()
+
+                if not oldest:
+                    break
+
+                evictedKeys: List[tuple] = []
+
+                for oldestKey, oldestSize in oldest:
+                    if self._sizeBytes <= self.maxBytes:
+                        break
+
+                    evictedKeys.append((oldestKey,))
+                    self._sizeBytes -= oldestSize
+
+                self._connection.executemany(
+                    "DELETE FROM responses WHERE key = ?", evictedKeys
+                )
+
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return hit/miss counters and the current cache size.
+
+        Returns:
+            Dictionary with hits, misses, hitRate, entries and sizeBytes
+        """
+        entries = 0
+
+        with self._lock:
+            if self._connection is not None:
+                entries = self._connection.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "sizeBytes": self._sizeBytes,
+        }
+
+
+responseCache = ResponseCache()
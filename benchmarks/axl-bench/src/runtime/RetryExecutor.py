@@ -0,0 +1,538 @@
+"""
+Retries, deadlines and hedged duplicates for LLM requests.
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    InvalidStateError,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from ..models import RetryPolicy
+from .isRetryableError import isRetryableError
+
+T = TypeVar("T")
+
+
+class _SendMarker:
+    """When one request of an attempt was sent, and whom to tell."""
+
+    def __init__(self, onSent: Optional[Callable[[], None]] = None):
+        self.sentAt: Optional[float] = None
+        self._onSent = onSent
+
+    def mark(self) -> None:
+        if self.sentAt is None:
+            self.sentAt = time.monotonic()
+
+            if self._onSent is not None:
+                self._onSent()
+
+
+# The marker of the request `send` is making in this context
+_sendMarker: contextvars.ContextVar[Optional[_SendMarker]] = contextvars.ContextVar(
+    "sendMarker", default=None
+)
+
+
+class RetryExecutor:
+    """
+    Runs each provider call under the configured `RetryPolicy`.
+
+    Transient failures are retried with exponential backoff and full jitter,
+    honouring any `Retry-After` header the provider sends. Every attempt can be
+    bounded by a timeout, and the whole request by a deadline. Once enough latencies
+    have been seen for a model, an attempt still running past the configured
+    percentile is hedged with a duplicate request and the first answer wins, which
+    trims the tail latency that dominates sequential matches. Attempt timeouts,
+    hedge delays and latencies are measured from when `send` calls `markSent`,
+    after the request has waited for the rate limiter and any in-flight limit, so a
+    request that is only queued is neither timed out nor hedged; the deadline
+    counts queuing too.
+
+    Sync requests cannot be cancelled: a losing hedge or an attempt abandoned after
+    its timeout keeps running on its pool thread, holding its rate limiter slot,
+    until the provider answers. It is still billed, so the gateway records usage
+    inside each `send` rather than for the winning response only. Async attempts
+    are cancelled instead.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None):
+        self.policy: RetryPolicy = policy or RetryPolicy()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counters: Dict[str, int] = self._emptyCounters()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def configure(self, policy: RetryPolicy) -> None:
+        """
+        Replace the policy and forget the latencies seen so far.
+
+        Args:
+            policy: The new retry, deadline and hedging settings
+        """
+        with self._lock:
+            self.policy = policy
+            self._latencies = {}
+            self._counters = self._emptyCounters()
+
+    @staticmethod
+    def _emptyCounters() -> Dict[str, int]:
+        return {"attempts": 0, "retries": 0, "hedges": 0, "hedgeWins": 0, "timeouts": 0}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _recordLatency(self, key: str, seconds: float) -> None:
+        with self._lock:
+            window = self._latencies.get(key)
+
+            if window is None:
+                window = deque(maxlen=self.policy.latencyWindow)
+                self._latencies[key] = window
+
+            window.append(seconds)
+
+    def hedgeDelay(self, key: str) -> Optional[float]:
+        """
+        Seconds after which a still-running attempt gets a duplicate.
+
+        Args:
+            key: The latency key (the model)
+
+        Returns:
+            The configured latency percentile, or None while hedging is off or too
+            few latencies have been seen
+        """
+        policy = self.policy
+
+        if policy.hedgePercentile is None or policy.maxHedges < 1:
+            return None
+
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+
+        if len(latencies) < policy.hedgeMinSamples:
+            return None
+
+        index = round(policy.hedgePercentile / 100 * (len(latencies) - 1))
+
+        return latencies[min(index, len(latencies) - 1)]
+
+    def backoffDelay(self, attempt: int, error: BaseException) -> float:
+        """
+        Seconds to wait before the next attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            error: The error it failed with
+
+        Returns:
+            A full-jitter exponential delay, raised to the provider's `Retry-After`
+            if it asked for longer
+        """
+        ceiling = min(
+            self.policy.maxDelaySeconds, self.policy.baseDelaySeconds * 2**attempt
+        )
+        delay = self._random.uniform(0, ceiling)
+        response = getattr(error, "response", None)
+        retryAfter = getattr(getattr(response, "headers", None), "get", None)
+
+        if retryAfter is not None:
+            try:
+                delay = max(delay, float(retryAfter("retry-after") or 0))
+            except ValueError:
+                pass
+
+        return min(delay, self.policy.maxDelaySeconds)
+
+    def _deadlineAt(self, startedAt: float) -> Optional[float]:
+        if self.policy.deadlineSeconds is None:
+            return None
+
+        return startedAt + self.policy.deadlineSeconds
+
+    def _timeoutAt(
+        self, primary: _SendMarker, deadlineAt: Optional[float]
+    ) -> Optional[float]:
+        """When the attempt times out: its timeout once sent, or the deadline."""
+        timeouts: List[float] = []
+
+        if self.policy.attemptTimeoutSeconds is not None and primary.sentAt is not None:
+            timeouts.append(primary.sentAt + self.policy.attemptTimeoutSeconds)
+
+        if deadlineAt is not None:
+            timeouts.append(deadlineAt)
+
+        return min(timeouts) if timeouts else None
+
+    @staticmethod
+    def _hedgeAt(
+        markers: Iterable[_SendMarker], hedgeDelay: Optional[float]
+    ) -> Optional[float]:
+        """When to hedge, once every request of the attempt has been sent."""
+        sentTimes = [marker.sentAt for marker in markers]
+
+        if hedgeDelay is None or not sentTimes or None in sentTimes:
+            return None
+
+        return max(sentTimes) + hedgeDelay
+
+    @staticmethod
+    def markSent() -> None:
+        """
+        Mark the request of the attempt running in this context as sent.
+
+        Called by `send` once the request has its rate limiter slot and any
+        in-flight limit, so attempt timeouts, hedge delays and the latencies
+        behind them leave out the time spent queuing.
+        """
+        marker = _sendMarker.get()
+
+        if marker is not None:
+            marker.mark()
+
+    def _shouldRetry(
+        self, attempt: int, error: BaseException, startedAt: float, delay: float
+    ) -> bool:
+        if attempt + 1 >= self.policy.maxAttempts or not isRetryableError(error):
+            return False
+
+        if self.policy.deadlineSeconds is None:
+            return True
+
+        return time.monotonic() - startedAt + delay < self.policy.deadlineSeconds
+
+    def run(self, key: str, send: Callable[[], T]) -> T:
+        """
+        Call `send` until it succeeds, retrying and hedging according to the policy.
+
+        Losing hedges and timed out attempts are abandoned, not cancelled; they
+        run on until their request returns.
+
+        Args:
+            key: The latency key (the model)
+            send: Sends one request and returns its response, calling `markSent`
+                once the request leaves its queues
+
+        Returns:
+            The first successful response
+
+        Raises:
+            TimeoutError: If an attempt misses its timeout and no retries remain
+            Exception: The last error if it is not retryable or no retries remain
+        """
+        startedAt = time.monotonic()
+        deadlineAt = self._deadlineAt(startedAt)
+        attempt = 0
+
+        while True:
+            try:
+                return self._attempt(key, send, deadlineAt)
+            except Exception as error:
+                delay = self.backoffDelay(attempt, error)
+
+                if not self._shouldRetry(attempt, error, startedAt, delay):
+                    raise
+
+                self._count("retries")
+                time.sleep(delay)
+                attempt += 1
+
+    def _attempt(
+        self, key: str, send: Callable[[], T], deadlineAt: Optional[float]
+    ) -> T:
+        hedgeDelay = self.hedgeDelay(key)
+        self._count("attempts")
+        queuedAt = time.monotonic()
+
+        if deadlineAt is not None and queuedAt >= deadlineAt:
+            self._count("timeouts")
+            raise TimeoutError(f"Request to {key} missed its deadline")
+
+        if (
+            self.policy.attemptTimeoutSeconds is None
+            and deadlineAt is None
+            and hedgeDelay is None
+        ):
+            marker = _SendMarker()
+            token = _sendMarker.set(marker)
+
+            try:
+                response = send()
+            finally:
+                _sendMarker.reset(token)
+
+            self._recordLatency(key, time.monotonic() - (marker.sentAt or queuedAt))
+
+            return response
+
+        pool = self._getPool()
+        # Resolved by the first request marked sent since the last wait
+        wakeup: List[Future] = [Future()]
+
+        def wake() -> None:
+            try:
+                wakeup[0].set_result(None)
+            except InvalidStateError:
+                pass
+
+        def submit() -> Tuple[Future, _SendMarker]:
+            marker = _SendMarker(wake)
+            token = _sendMarker.set(marker)
+
+            try:
+                return pool.submit(contextvars.copy_context().run, send), marker
+            finally:
+                _sendMarker.reset(token)
+
+        future, primary = submit()
+        markers: Dict[Future, _SendMarker] = {future: primary}
+        hedgesLeft = self.policy.maxHedges if hedgeDelay is not None else 0
+        lastError: Optional[BaseException] = None
+
+        while markers:
+            timeoutAt = self._timeoutAt(primary, deadlineAt)
+            hedgeAt = (
+                self._hedgeAt(markers.values(), hedgeDelay) if hedgesLeft else None
+            )
+            wakeAt = [at for at in (timeoutAt, hedgeAt) if at is not None]
+            waitFor = wakeup[0]
+            done, _ = wait(
+                [*markers, waitFor],
+                timeout=max(0.0, min(wakeAt) - time.monotonic()) if wakeAt else None,
+                return_when=FIRST_COMPLETED,
+            )
+
+            if waitFor in done:
+                done.discard(waitFor)
+                wakeup[0] = Future()
+
+            for future in done:
+                marker = markers.pop(future)
+                error = future.exception()
+
+                if error is None:
+                    self._recordLatency(
+                        key, time.monotonic() - (marker.sentAt or queuedAt)
+                    )
+
+                    if marker is not primary:
+                        self._count("hedgeWins")
+
+                    return future.result()
+
+                lastError = error
+
+            now = time.monotonic()
+
+            if done or not markers:
+                continue
+
+            if timeoutAt is not None and now >= timeoutAt:
+                self._count("timeouts")
+                raise TimeoutError(
+                    f"Request to {key} timed out after {now - queuedAt:.2f} seconds"
+                )
+
+            if hedgeAt is not None and now >= hedgeAt:
+                hedgesLeft -= 1
+                self._count("hedges")
+                future, marker = submit()
+                markers[future] = marker
+
+        raise lastError
+
+    async def runAsync(self, key: str, send: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async counterpart of `run`; losing hedges and timed out attempts are
+        cancelled rather than left running.
+
+        Args:
+            key: The latency key (the model)
+            send: Coroutine function that sends one request and returns its
+                response, calling `markSent` once the request leaves its queues
+
+        Returns:
+            The first successful response
+        """
+        startedAt = time.monotonic()
+        deadlineAt = self._deadlineAt(startedAt)
+        attempt = 0
+
+        while True:
+            try:
+                return await self._attemptAsync(key, send, deadlineAt)
+            except Exception as error:
+                delay = self.backoffDelay(attempt, error)
+
+                if not self._shouldRetry(attempt, error, startedAt, delay):
+                    raise
+
+                self._count("retries")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _attemptAsync(
+        self, key: str, send: Callable[[], Awaitable[T]], deadlineAt: Optional[float]
+    ) -> T:
+        hedgeDelay = self.hedgeDelay(key)
+        self._count("attempts")
+        queuedAt = time.monotonic()
+
+        if deadlineAt is not None and queuedAt >= deadlineAt:
+            self._count("timeouts")
+            raise TimeoutError(f"Request to {key} missed its deadline")
+
+        if (
+            self.policy.attemptTimeoutSeconds is None
+            and deadlineAt is None
+            and hedgeDelay is None
+        ):
+            marker = _SendMarker()
+            token = _sendMarker.set(marker)
+
+            try:
+                response = await send()
+            finally:
+                _sendMarker.reset(token)
+
+            self._recordLatency(key, time.monotonic() - (marker.sentAt or queuedAt))
+
+            return response
+
+        loop = asyncio.get_running_loop()
+        # Resolved by the first request marked sent since the last wait
+        wakeup: List[asyncio.Future] = [loop.create_future()]
+
+        def wake() -> None:
+            if not wakeup[0].done():
+                wakeup[0].set_result(None)
+
+        def submit() -> Tuple[asyncio.Task, _SendMarker]:
+            marker = _SendMarker(wake)
+            token = _sendMarker.set(marker)
+
+            try:
+                # The task runs in a copy of this context, marker included
+                return asyncio.ensure_future(send()), marker
+            finally:
+                _sendMarker.reset(token)
+
+        task, primary = submit()
+        markers: Dict[asyncio.Task, _SendMarker] = {task: primary}
+        hedgesLeft = self.policy.maxHedges if hedgeDelay is not None else 0
+        lastError: Optional[BaseException] = None
+
+        try:
+            while markers:
+                timeoutAt = self._timeoutAt(primary, deadlineAt)
+                hedgeAt = (
+                    self._hedgeAt(markers.values(), hedgeDelay) if hedgesLeft else None
+                )
+                wakeAt = [at for at in (timeoutAt, hedgeAt) if at is not None]
+                waitFor = wakeup[0]
+                done, _ = await asyncio.wait(
+                    [*markers, waitFor],
+                    timeout=(
+                        max(0.0, min(wakeAt) - time.monotonic()) if wakeAt else None
+                    ),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if waitFor in done:
+                    done.discard(waitFor)
+                    wakeup[0] = loop.create_future()
+
+                for task in done:
+                    marker = markers.pop(task)
+                    error = task.exception()
+
+                    if error is None:
+                        self._recordLatency(
+                            key, time.monotonic() - (marker.sentAt or queuedAt)
+                        )
+
+                        if marker is not primary:
+                            self._count("hedgeWins")
+
+                        return task.result()
+
+                    lastError = error
+
+                now = time.monotonic()
+
+                if done or not markers:
+                    continue
+
+                if timeoutAt is not None and now >= timeoutAt:
+                    self._count("timeouts")
+                    raise TimeoutError(
+                        f"Request to {key} timed out after {now - queuedAt:.2f} "
+                        "seconds"
+                    )
+
+                if hedgeAt is not None and now >= hedgeAt:
+                    hedgesLeft -= 1
+                    self._count("hedges")
+                    task, marker = submit()
+                    markers[task] = marker
+
+            raise lastError
+        finally:
+            for task in markers:
+                task.cancel()
+
+            if not wakeup[0].done():
+                wakeup[0].cancel()
+
+    def _getPool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(thread_name_prefix="llm-request")
+
+            return self._pool
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return attempt, retry, hedge and timeout counts, plus the p50/p99 latency
+        across all models.
+
+        Returns:
+            Mapping of statistic name to value
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            latencies = sorted(
+                latency for window in self._latencies.values() for latency in window
+            )
+
+        if latencies:
+            stats["p50Seconds"] = latencies[(len(latencies) - 1) // 2]
+            stats["p99Seconds"] = latencies[round(0.99 * (len(latencies) - 1))]
+
+        return stats
+
+
+retryExecutor = RetryExecutor()
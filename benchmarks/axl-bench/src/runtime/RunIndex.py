@@ -0,0 +1,275 @@
+"""
+Append-only, queryable catalog of benchmark runs.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models import BenchmarkMetadata
+
+RUN_INDEX_FILENAME = "runs.sqlite"
+LEGACY_HISTORY_FILENAME = "history.json"
+BUSY_TIMEOUT_MS = 30000
+
+
+class RunIndex:
+    """
+    SQLite catalog of every run saved under an output directory.
+
+    Each run is inserted in its own transaction, so benchmark processes sharing an
+    output directory can append concurrently (WAL mode, with a busy timeout instead
+    of failing on a locked database). Runs are indexed by date, turns, seed and
+    temperature, with the LLM models they included and each player's summary
+    statistics, so runs can be found and compared without opening any
+    `full_results.json`. Entries of a legacy `history.json` next to the index are
+    imported on first use.
+    """
+
+    def __init__(self, outputDir: str):
+        self.path: Path = Path(outputDir) / RUN_INDEX_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "runId TEXT PRIMARY KEY, "
+            "directory TEXT NOT NULL, "
+            "benchmarkDate TEXT NOT NULL, "
+            "iterations INTEGER NOT NULL, "
+            "turns INTEGER NOT NULL, "
+            "baseSeed INTEGER NOT NULL, "
+            "temperature REAL NOT NULL, "
+            "maxTokens INTEGER NOT NULL, "
+            "engine TEXT NOT NULL, "
+            "decisionMode TEXT NOT NULL, "
+            "totalPlayers INTEGER NOT NULL, "
+            "numIterations INTEGER NOT NULL, "
+            "metadata TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS runsDate ON runs (benchmarkDate);"
+            "CREATE INDEX IF NOT EXISTS runsTurns ON runs (turns);"
+            "CREATE INDEX IF NOT EXISTS runsSeed ON runs (baseSeed);"
+            "CREATE INDEX IF NOT EXISTS runsTemperature ON runs (temperature);"
+            "CREATE TABLE IF NOT EXISTS runModels ("
+            "runId TEXT NOT NULL REFERENCES runs (runId), "
+            "model TEXT NOT NULL, "
+            "PRIMARY KEY (model, runId));"
+            "CREATE TABLE IF NOT EXISTS runPlayers ("
+            "runId TEXT NOT NULL REFERENCES runs (runId), "
+            "player TEXT NOT NULL, "
+            "avgScore REAL NOT NULL, "
+            "avgRank REAL NOT NULL, "
+            "totalWins INTEGER NOT NULL, "
+            "avgCooperationRate REAL NOT NULL, "
+            "numIterations INTEGER NOT NULL, "
+            "PRIMARY KEY (player, runId));"
+        )
+        self._importLegacyHistory()
+
+    def _importLegacyHistory(self) -> None:
+        historyPath = self.path.parent / LEGACY_HISTORY_FILENAME
+
+        try:
+            with open(historyPath, "r") as f:
+                history = json.load(f)
+        except FileNotFoundError:
+            return
+
+        for entry in history:
+            self.addRun(
+                runId=entry["timestamp"],
+                directory=entry["directory"],
+                metadata=BenchmarkMetadata(**entry["metadata"]),
+                numIterations=entry["numIterations"],
+            )
+
+        # Another process may have imported it concurrently; the inserts above
+        # replace its rows, so losing the rename race is harmless
+        try:
+            historyPath.rename(
+                historyPath.with_name(f"{LEGACY_HISTORY_FILENAME}.imported")
+            )
+        except FileNotFoundError:
+            pass
+
+    def addRun(
+        self,
+        runId: str,
+        directory: str,
+        metadata: BenchmarkMetadata,
+        numIterations: int,
+        playerSummaries: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Record a run, replacing any earlier entry with the same id (a resumed run).
+
+        Args:
+            runId: The run's identifier (its directory name)
+            directory: The run's output directory
+            metadata: The run's benchmark metadata
+            numIterations: Number of iterations saved
+            playerSummaries: Per-player rows of `summaryStatistics.csv`
+        """
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+
+            for table in ("runPlayers", "runModels", "runs"):
+                self._connection.execute(
+                    f"DELETE FROM {table} WHERE runId = ?", (runId,)
+                )
+
+            self._connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    runId,
+                    directory,
+                    metadata.benchmarkDate,
+                    metadata.iterations,
+                    metadata.turnsPerMatch,
+                    metadata.baseSeed,
+                    metadata.temperature,
+                    metadata.maxTokens,
+                    metadata.engine,
+                    metadata.decisionMode,
+                    metadata.totalPlayers,
+                    numIterations,
+                    metadata.model_dump_json(),
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO runModels VALUES (?, ?)",
+                [(runId, model) for model in metadata.llmModels],
+            )
+            self._connection.executemany(
+                "INSERT INTO runPlayers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        runId,
+                        summary["player"],
+                        summary["avgScore"],
+                        summary["avgRank"],
+                        summary["totalWins"],
+                        summary["avgCooperationRate"],
+                        summary["numIterations"],
+                    )
+                    for summary in playerSummaries or []
+                ],
+            )
+
+    @staticmethod
+    def _filters(
+        model: Optional[str],
+        temperature: Optional[float],
+        turns: Optional[int],
+        seed: Optional[int],
+        since: Optional[str],
+        until: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if model is not None:
+            clauses.append(
+                "runs.runId IN (SELECT runId FROM runModels WHERE model = ?)"
+            )
+            params.append(model)
+
+        for column, value in (
+            ("runs.temperature", temperature),
+            ("runs.turns", turns),
+            ("runs.baseSeed", seed),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        if since is not None:
+            clauses.append("runs.benchmarkDate >= ?")
+            params.append(since)
+
+        if until is not None:
+            clauses.append("runs.benchmarkDate < ?")
+            params.append(until)
+
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def findRuns(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        turns: Optional[int] = None,
+        seed: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find runs matching every given filter, newest first.
+
+        Args:
+            model: An LLM model value the run included, e.g. "gpt-4o"
+            temperature: The run's sampling temperature
+            turns: Turns per match
+            seed: The run's base seed
+            since: Earliest benchmark date (ISO format, inclusive)
+            until: Latest benchmark date (ISO format, exclusive)
+
+        Returns:
+            One dict per run with its indexed columns and models
+        """
+        where, params = self._filters(model, temperature, turns, seed, since, until)
+        rows = self._connection.execute(
+            "SELECT runs.*, (SELECT GROUP_CONCAT(model) FROM runModels "
+            "WHERE runModels.runId = runs.runId) AS models "
+            f"FROM runs{where} ORDER BY runs.benchmarkDate DESC",
+            params,
+        ).fetchall()
+
+        return [
+            {
+                **{key: row[key] for key in row.keys() if key != "metadata"},
+                "models": row["models"].split(",") if row["models"] else [],
+            }
+            for row in rows
+        ]
+
+    def playerResults(
+        self,
+        player: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        turns: Optional[int] = None,
+        seed: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-player summary statistics across the matching runs.
+
+        Args:
+            player: Only this player (default: all players)
+            model, temperature, turns, seed, since, until: Run filters, as in
+                `findRuns`
+
+        Returns:
+            One dict per (run, player) with the run's date, turns, seed and
+            temperature, newest run first
+        """
+        where, params = self._filters(model, temperature, turns, seed, since, until)
+
+        if player is not None:
+            where += (" AND " if where else " WHERE ") + "runPlayers.player = ?"
+            params.append(player)
+
+        rows = self._connection.execute(
+            "SELECT runPlayers.*, runs.benchmarkDate, runs.turns, runs.baseSeed, "
+            "runs.temperature FROM runPlayers JOIN runs USING (runId)"
+            f"{where} ORDER BY runs.benchmarkDate DESC, runPlayers.avgScore DESC",
+            params,
+        ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        self._connection.close()
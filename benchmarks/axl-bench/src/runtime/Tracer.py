@@ -0,0 +1,306 @@
+"""
+Per-call latency spans for LLM requests, with percentile summaries and export.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from ..models import Provider, ResponseSource, TraceSpan
+
+# Receives the time the response headers of the attempt running in this context
+# arrived, set by the HTTP clients' response hooks
+_firstByte: ContextVar[Optional[List[float]]] = ContextVar("firstByte", default=None)
+
+
+class _ActiveSpan:
+    """The span of a gateway call in progress, filled in by its attempts."""
+
+    def __init__(self):
+        self.source: ResponseSource = ResponseSource.PROVIDER
+        self.queueWaitSeconds: float = 0.0
+        self.timeToFirstByteSeconds: Optional[float] = None
+        self.attempts: int = 0
+
+    @contextmanager
+    def attempt(self, queuedAt: float) -> Iterator[None]:
+        """
+        Time one attempt, entered once the request may be sent.
+
+        Args:
+            queuedAt: `time.perf_counter()` when the attempt started waiting for the
+                rate limiter and the in-flight limit
+        """
+        sentAt = time.perf_counter()
+        self.attempts += 1
+        self.queueWaitSeconds += sentAt - queuedAt
+        firstByte: List[float] = []
+        token = _firstByte.set(firstByte)
+
+        try:
+            yield
+
+            if firstByte:
+                self.timeToFirstByteSeconds = firstByte[0] - sentAt
+        finally:
+            _firstByte.reset(token)
+
+
+class Tracer:
+    """
+    Records a `TraceSpan` for every call to the prompt gateway.
+
+    Spans are kept in memory for the whole run. `summary` reports latency
+    percentiles per model over the requests a provider served, and `export` writes
+    every span as a Chrome trace, which chrome://tracing and Perfetto open with one
+    row per player and match. Time to first byte comes from response hooks
+    installed on the providers' HTTP clients. Spans recorded in a worker process
+    are sent to the main process and added with `merge`.
+    """
+
+    def __init__(self):
+        self._spans: List[TraceSpan] = []
+        # Number of spans already handed over by `collect`
+        self._collected: int = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(
+        self,
+        provider: Provider,
+        model: str,
+        player: Optional[str] = None,
+        opponent: Optional[str] = None,
+        turn: Optional[int] = None,
+    ) -> Iterator[_ActiveSpan]:
+        """
+        Time one gateway call and record its span when it returns or raises.
+
+        Args:
+            provider: The provider serving the request
+            model: The model identifier
+            player: Name of the requesting player
+            opponent: Name of that player's opponent
+            turn: The turn the move is requested for, counted from 1
+
+        Yields:
+            The span in progress, whose `attempt` times each provider attempt
+        """
+        active = _ActiveSpan()
+        startTime = time.time()
+        startedAt = time.perf_counter()
+        error: Optional[str] = None
+
+        try:
+            yield active
+        except BaseException as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            span = TraceSpan(
+                provider=provider,
+                model=model,
+                player=player,
+                opponent=opponent,
+                turn=turn,
+                source=active.source,
+                startTime=startTime,
+                totalSeconds=time.perf_counter() - startedAt,
+                queueWaitSeconds=active.queueWaitSeconds,
+                timeToFirstByteSeconds=active.timeToFirstByteSeconds,
+                attempts=active.attempts,
+                error=error,
+            )
+
+            with self._lock:
+                self._spans.append(span)
+
+    @staticmethod
+    def onResponse(response: httpx.Response) -> None:
+        """Response hook for sync HTTP clients, marking the first byte."""
+        firstByte = _firstByte.get()
+
+        if firstByte is not None and not firstByte:
+            firstByte.append(time.perf_counter())
+
+    @staticmethod
+    async def onResponseAsync(response: httpx.Response) -> None:
+        """Response hook for async HTTP clients, marking the first byte."""
+        Tracer.onResponse(response)
+
+    def recordCooperationProbability(
+        self, player: str, opponent: str, turn: int, probability: float
+    ) -> None:
+        """
+        Attach the P(C) a player decided with to the span of the call it came from.
+
+        Args:
+            player: Name of the deciding player
+            opponent: Name of that player's opponent
+            turn: The turn the move was requested for, counted from 1
+            probability: The probability of cooperating
+        """
+        with self._lock:
+            # The call finished just before the decision, so search from the end
+            for span in reversed(self._spans):
+                if (
+                    span.player == player
+                    and span.opponent == opponent
+                    and span.turn == turn
+                    and span.cooperationProbability is None
+                ):
+                    span.cooperationProbability = probability
+
+                    return
+
+    def merge(self, spans: List[TraceSpan]) -> None:
+        """
+        Add spans recorded in another process.
+
+        Args:
+            spans: The spans to add
+        """
+        with self._lock:
+            self._spans.extend(spans)
+            self._collected = len(self._spans)
+
+    def collect(self) -> List[TraceSpan]:
+        """
+        Hand over the spans recorded since the last call.
+
+        Returns:
+            The new spans
+        """
+        with self._lock:
+            spans = self._spans[self._collected :]
+            self._collected = len(self._spans)
+
+        return spans
+
+    def spans(self) -> List[TraceSpan]:
+        """
+        Every span recorded in this run.
+
+        Returns:
+            The spans in the order they finished
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Latency percentiles per model over the successful provider-served calls.
+
+        Returns:
+            Per model: the number of calls, the p50, p90 and p99 of the total
+            latency, and the median time to first byte and queue wait, in seconds
+        """
+        byModel: Dict[str, List[TraceSpan]] = {}
+
+        for span in self.spans():
+            if span.source == ResponseSource.PROVIDER and span.error is None:
+                byModel.setdefault(span.model, []).append(span)
+
+        summary: Dict[str, Dict[str, float]] = {}
+
+        for model, spans in sorted(byModel.items()):
+            totals = np.array([span.totalSeconds for span in spans])
+            p50, p90, p99 = np.percentile(totals, [50, 90, 99])
+            firstBytes = [
+                span.timeToFirstByteSeconds
+                for span in spans
+                if span.timeToFirstByteSeconds is not None
+            ]
+            summary[model] = {
+                "calls": len(spans),
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+                "timeToFirstByteP50": (
+                    float(np.median(firstBytes)) if firstBytes else float("nan")
+                ),
+                "queueWaitP50": float(
+                    np.median([span.queueWaitSeconds for span in spans])
+                ),
+            }
+
+        return summary
+
+    def export(self, path: str) -> None:
+        """
+        Write every span to a Chrome trace file.
+
+        Each provider is a process and each (player, opponent) match a thread, so
+        one player's requests in a match line up on their own row; the span's
+        fields are kept as the event's arguments.
+
+        Args:
+            path: The JSON file to write
+        """
+        providers: Dict[str, int] = {}
+        matches: Dict[Tuple[str, str], int] = {}
+        events: List[Dict[str, Any]] = []
+
+        for span in self.spans():
+            provider = span.provider.value
+            match = (span.player or "unknown", span.opponent or "unknown")
+
+            if provider not in providers:
+                providers[provider] = len(providers) + 1
+                events.append(
+                    {
+                        "ph": "M",
+                        "name": "process_name",
+                        "pid": providers[provider],
+                        "args": {"name": provider},
+                    }
+                )
+
+            pid = providers[provider]
+
+            if match not in matches:
+                matches[match] = len(matches) + 1
+                events.append(
+                    {
+                        "ph": "M",
+                        "name": "thread_name",
+                        "pid": pid,
+                        "tid": matches[match],
+                        "args": {"name": f"{match[0]} vs {match[1]}"},
+                    }
+                )
+
+            events.append(
+                {
+                    "ph": "X",
+                    "name": span.model
+                    + (f" turn {span.turn}" if span.turn is not None else ""),
+                    "cat": span.source.value,
+                    "ts": span.startTime * 1_000_000,
+                    "dur": span.totalSeconds * 1_000_000,
+                    "pid": pid,
+                    "tid": matches[match],
+                    "args": span.model_dump(mode="json"),
+                }
+            )
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def reset(self) -> None:
+        """Forget all recorded spans."""
+        with self._lock:
+            self._spans = []
+            self._collected = 0
+
+
+tracer = Tracer()
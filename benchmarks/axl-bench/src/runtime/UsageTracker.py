@@ -0,0 +1,159 @@
+"""
+Per-player and per-match accounting of LLM token usage and cost.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..models import MatchUsage, ModelPrice, PromptResponse, TokenUsage
+
+UNKNOWN_PLAYER = "unknown"
+
+
+class UsageTracker:
+    """
+    Sums the tokens, wall time and cost of the LLM requests made by each player.
+
+    Only responses that came from a provider are recorded, not those served from
+    the response cache or a cassette, so the totals reflect what was billed. The
+    gateways record each request as the provider answers it, so losing hedged
+    duplicates and attempts abandoned after a timeout are counted too. Usage is
+    kept per (player, opponent) match until `collect` hands it to the iteration
+    being built, and per player for the whole run. Costs come from the price table
+    given to `configure`. Usage recorded in a worker process is sent to the main
+    process and added with `merge`.
+    """
+
+    def __init__(self):
+        self.prices: Dict[str, ModelPrice] = {}
+        self._matches: Dict[Tuple[str, str], TokenUsage] = {}
+        self._players: Dict[str, TokenUsage] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, prices: Dict[str, ModelPrice]) -> None:
+        """
+        Replace the price table.
+
+        Args:
+            prices: Token prices keyed by model identifier, e.g. "gpt-4o"
+        """
+        self.prices = prices
+
+    def cost(
+        self, model: str, response: PromptResponse, batched: bool = False
+    ) -> Optional[float]:
+        """
+        Price one response.
+
+        Args:
+            model: The model identifier the request was sent to
+            response: The provider response
+            batched: Whether the response came from a provider batch job
+
+        Returns:
+            Cost in USD, or None if the model has no price
+        """
+        price = self.prices.get(model) or self.prices.get(model.replace("models/", ""))
+
+        if price is None:
+            return None
+
+        cachedInputTokens = response.cachedInputTokens or 0
+        cachedInputPrice = (
+            price.cachedInputPerMillion
+            if price.cachedInputPerMillion is not None
+            else price.inputPerMillion
+        )
+
+        cost = (
+            ((response.inputTokens or 0) - cachedInputTokens) * price.inputPerMillion
+            + cachedInputTokens * cachedInputPrice
+            + (response.outputTokens or 0) * price.outputPerMillion
+        ) / 1_000_000
+
+        return cost * price.batchMultiplier if batched else cost
+
+    def record(
+        self,
+        model: str,
+        player: Optional[str],
+        opponent: Optional[str],
+        response: PromptResponse,
+        wallSeconds: float,
+        batched: bool = False,
+    ) -> None:
+        """
+        Add the usage of one provider response.
+
+        Args:
+            model: The model identifier the request was sent to
+            player: Name of the player that made the request
+            opponent: Name of that player's opponent
+            response: The provider response
+            wallSeconds: Time from queuing the request to its response
+            batched: Whether the response came from a provider batch job
+        """
+        usage = TokenUsage(
+            requests=1,
+            inputTokens=response.inputTokens or 0,
+            cachedInputTokens=response.cachedInputTokens or 0,
+            outputTokens=response.outputTokens or 0,
+            reasoningTokens=response.reasoningTokens or 0,
+            wallSeconds=wallSeconds,
+            costUsd=self.cost(model, response, batched),
+        )
+        player = player or UNKNOWN_PLAYER
+        key = (player, opponent or UNKNOWN_PLAYER)
+
+        with self._lock:
+            self._matches[key] = self._matches.get(key, TokenUsage()) + usage
+            self._players[player] = self._players.get(player, TokenUsage()) + usage
+
+    def merge(self, matchUsage: List[MatchUsage]) -> None:
+        """
+        Add per-match usage collected in another process.
+
+        Args:
+            matchUsage: Usage per (player, opponent) match
+        """
+        with self._lock:
+            for entry in matchUsage:
+                key = (entry.player, entry.opponent)
+                self._matches[key] = self._matches.get(key, TokenUsage()) + entry.usage
+                self._players[entry.player] = (
+                    self._players.get(entry.player, TokenUsage()) + entry.usage
+                )
+
+    def collect(self) -> List[MatchUsage]:
+        """
+        Hand over the per-match usage recorded since the last call.
+
+        Returns:
+            Usage per (player, opponent) match
+        """
+        with self._lock:
+            matches, self._matches = self._matches, {}
+
+        return [
+            MatchUsage(player=player, opponent=opponent, usage=usage)
+            for (player, opponent), usage in matches.items()
+        ]
+
+    def snapshot(self) -> Dict[str, TokenUsage]:
+        """
+        Run totals per player.
+
+        Returns:
+            Usage per player name
+        """
+        with self._lock:
+            return dict(sorted(self._players.items()))
+
+    def reset(self) -> None:
+        """Forget all recorded usage."""
+        with self._lock:
+            self._matches = {}
+            self._players = {}
+
+
+usageTracker = UsageTracker()
@@ -0,0 +1,49 @@
+from .BatchDispatcher import BatchDispatcher, batchDispatcher
+from .Cassette import Cassette, cassette
+from .ClientRegistry import ClientRegistry, clientRegistry
+from .ContextCache import ContextCache, contextCache
+from .hashRequest import hashRequest
+from .isRateLimitError import isRateLimitError
+from .isRetryableError import isRetryableError
+from .IterationResultLog import ITERATION_LOG_FILENAME, IterationResultLog
+from .MatchStore import MatchStore, matchStore
+from .MatrixStore import MATRIX_DIRNAME, MATRIX_MANIFEST_FILENAME, MatrixStore
+from .RateLimiter import RateLimiter, rateLimiter
+from .ResponseCache import ResponseCache, responseCache
+from .RetryExecutor import RetryExecutor, retryExecutor
+from .RunIndex import RUN_INDEX_FILENAME, RunIndex
+from .Tracer import Tracer, tracer
+from .UsageTracker import UsageTracker, usageTracker
+
+__all__ = [
+    "ITERATION_LOG_FILENAME",
+    "MATRIX_DIRNAME",
+    "MATRIX_MANIFEST_FILENAME",
+    "RUN_INDEX_FILENAME",
+    "BatchDispatcher",
+    "Cassette",
+    "ClientRegistry",
+    "ContextCache",
+    "IterationResultLog",
+    "MatchStore",
+    "MatrixStore",
+    "RateLimiter",
+    "ResponseCache",
+    "RetryExecutor",
+    "RunIndex",
+    "Tracer",
+    "UsageTracker",
+    "batchDispatcher",
+    "cassette",
+    "clientRegistry",
+    "contextCache",
+    "hashRequest",
+    "isRateLimitError",
+    "isRetryableError",
+    "matchStore",
+    "rateLimiter",
+    "responseCache",
+    "retryExecutor",
+    "tracer",
+    "usageTracker",
+]
@@ -0,0 +1,20 @@
+"""
+Helper function to derive a stable key for an LLM request.
+"""
+
+import hashlib
+
+from ..models import PromptRequest
+
+
+def hashRequest(request: PromptRequest) -> str:
+    """
+    Hashes the parameters that determine an LLM response.
+
+    Args:
+        request: The request parameters
+
+    Returns:
+        Hex SHA-256 digest of the request
+    """
+    return hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
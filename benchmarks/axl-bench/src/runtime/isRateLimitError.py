@@ -0,0 +1,22 @@
+"""
+Helper function to recognise quota and overload errors from any provider.
+"""
+
+RATE_LIMIT_STATUS_CODES = {429, 503, 529}
+
+
+def isRateLimitError(error: BaseException) -> bool:
+    """
+    Checks whether an error means the provider is rate limiting or overloaded.
+
+    Anthropic and OpenAI errors carry `status_code`, Gemini errors carry `code`.
+
+    Args:
+        error: The raised exception
+
+    Returns:
+        True for 429 (rate limited), 503 (unavailable) and 529 (overloaded)
+    """
+    statusCode = getattr(error, "status_code", None) or getattr(error, "code", None)
+
+    return statusCode in RATE_LIMIT_STATUS_CODES
@@ -0,0 +1,39 @@
+"""
+Helper function to recognise transient errors worth retrying.
+"""
+
+import httpx
+
+from .isRateLimitError import isRateLimitError
+
+RETRYABLE_STATUS_CODES = {408, 409, 500, 502, 504}
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def isRetryableError(error: BaseException) -> bool:
+    """
+    Checks whether a failed request may succeed if it is sent again.
+
+    Covers rate limiting and overload, server errors, timeouts (including missed
+    deadlines) and dropped connections. The SDKs wrap connection failures in their
+    own `APIConnectionError` and `APITimeoutError` classes, so those are matched by
+    name.
+
+    Args:
+        error: The raised exception
+
+    Returns:
+        True if the request should be retried
+    """
+    if isRateLimitError(error):
+        return True
+
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+
+    statusCode = getattr(error, "status_code", None) or getattr(error, "code", None)
+
+    return statusCode in RETRYABLE_STATUS_CODES
@@ -1,22 +1,32 @@
-from typing import Optional, Union
+import asyncio
+import math
+from typing import Any, Dict, List, Optional, Union
 
-from axelrod import Action, Player
+from axelrod import Action, History, Player
 from dotenv import load_dotenv
 
-from ..helpers import runPrompt
+from ..helpers.runPrompt import runPrompt
+from ..helpers.runPromptAsync import runPromptAsync
+from ..helpers.supportsLogprobs import supportsLogprobs
 from ..models import (
     ClaudeModel,
     ClaudeModelGrounding,
+    DecisionMode,
     GeminiModel,
     GeminiModelGrounding,
     Message,
     OpenAiModel,
     OpenAiModelGrounding,
-    PromptContext,
+    PromptMode,
+    PromptResponse,
 )
+from ..prompts import PromptRenderer
+from ..runtime import tracer
 
 load_dotenv()
 
+LOGPROB_TOP_ALTERNATIVES = 5
+
 
 class CompletionLLM(Player):
     """
@@ -37,6 +47,8 @@ class CompletionLLM(Player):
         historyLastTurns: Optional[int] = None,
         numTurns: Optional[int] = None,
         endProbability: Optional[float] = None,
+        turnTemplate: str = "",
+        promptMode: PromptMode = PromptMode.STATELESS,
         # Model parameters
         model: Union[
             ClaudeModel,
@@ -48,6 +60,7 @@ class CompletionLLM(Player):
         ] = GeminiModel.GEMINI_2_5_FLASH_LITE,
         maxTokens: int = 1024,
         temperature: float = 1.0,
+        decisionMode: DecisionMode = DecisionMode.TEXT,
     ):
         super().__init__()
 
@@ -65,6 +78,8 @@ class CompletionLLM(Player):
         self.historyLastTurns: Optional[int] = historyLastTurns
         self.numTurns: Optional[int] = numTurns
         self.endProbability: Optional[float] = endProbability
+        self.turnTemplate: str = turnTemplate
+        self.promptMode: PromptMode = promptMode
         # Model parameters
         self.model: Union[
             ClaudeModel,
@@ -76,37 +91,126 @@ class CompletionLLM(Player):
         ] = model
         self.maxTokens: int = maxTokens
         self.temperature: float = temperature
+        self.decisionMode: DecisionMode = decisionMode
+        # Renders this match's prompts incrementally; built on the first move
+        self.promptRenderer: Optional[PromptRenderer] = None
+        # This match's messages in conversation mode
+        self.conversation: List[Message] = []
 
     def __repr__(self) -> str:
         return self.name
 
-    def strategy(self, opponent: Player) -> Action:
+    @property
+    def conversational(self) -> bool:
         """
-        Run the prompt and return the action.
+        Whether moves are requested in one conversation per match.
+
+        Only full-history prompts with a turn template use conversation mode; a
+        last-turns prompt already has a bounded size.
+        """
+        return (
+            self.promptMode == PromptMode.CONVERSATION
+            and self.historyLastTurns is None
+            and bool(self.turnTemplate)
+        )
+
+    def buildMessages(self, opponent: Player) -> List[Message]:
+        """
+        Build the prompt messages for the next move.
 
         Args:
             opponent: The opponent player
 
         Returns:
-            The action to take
+            The messages to send to the model
         """
 
-        self.promptContext = PromptContext(
-            promptTemplate=self.promptTemplate,
-            personalHistory=self.history,
-            opponentHistory=opponent.history,
-            historyLastTurns=self.historyLastTurns,
-            numTurns=self.numTurns,
-            endProbability=self.endProbability,
-        )
-        move: str = runPrompt(
-            model=self.model.value,
-            maxTokens=self.maxTokens,
-            temperature=self.temperature,
-            messages=[
-                Message(role="user", content=self.promptContext.formatPrompt()),
-            ],
-        )
+        if self.promptRenderer is None:
+            self.promptRenderer = PromptRenderer(
+                promptTemplate=self.promptTemplate,
+                historyLastTurns=self.historyLastTurns,
+                numTurns=self.numTurns,
+                endProbability=self.endProbability,
+            )
+
+        if self.conversational:
+            return self._buildConversation(opponent)
+
+        prompt = self.promptRenderer.render(self.history, opponent.history)
+
+        # The prompt is a plain string built here, so skip pydantic validation. The
+        # static rules come first and are marked as a cacheable prefix.
+        return [
+            Message.model_construct(
+                role="user",
+                content=prompt,
+                prefixLength=len(self.promptRenderer.staticPrefix),
+            )
+        ]
+
+    def _buildConversation(self, opponent: Player) -> List[Message]:
+        """
+        Extend this match's conversation with the moves played since the last call.
+
+        The first message is the prompt with an empty history. Each turn played
+        since adds this player's move as the assistant reply and a user message
+        with the opponent's move, so every request only appends to the previous
+        one. Besides the rules prefix of the first message, the last message is
+        marked as cacheable, so providers can serve the whole conversation so far
+        from their prompt caches.
+        """
+        # The conversation holds two messages per turn after the first
+        turnsInConversation = (len(self.conversation) - 1) // 2
+
+        if not self.conversation or turnsInConversation > len(self.history):
+            self.conversation = [
+                Message.model_construct(
+                    role="user",
+                    content=self.promptRenderer.render(History(), History()),
+                    prefixLength=len(self.promptRenderer.staticPrefix),
+                )
+            ]
+            turnsInConversation = 0
+
+        for turn in range(turnsInConversation, len(self.history)):
+            self.conversation.append(
+                Message.model_construct(
+                    role="assistant", content=self.history[turn].name
+                )
+            )
+            self.conversation.append(
+                Message.model_construct(
+                    role="user",
+                    content=self.turnTemplate.format(
+                        opponentMove=opponent.history[turn].name
+                    ),
+                )
+            )
+
+        messages = list(self.conversation)
+
+        if len(messages) > 1:
+            messages[-1] = Message.model_construct(
+                role="user",
+                content=messages[-1].content,
+                prefixLength=len(messages[-1].content),
+            )
+
+        return messages
+
+    def parseMove(self, move: str) -> Action:
+        """
+        Convert the model's response into an action.
+
+        Args:
+            move: The generated text response
+
+        Returns:
+            The action to take
+
+        Raises:
+            ValueError: If the response is neither "C" nor "D"
+        """
 
         if move == "C":
             return Action.C
@@ -114,3 +218,124 @@ class CompletionLLM(Player):
             return Action.D
         else:
             raise ValueError(f"Invalid move: {move}")
+
+    def cooperationProbability(self, topLogprobs: Dict[str, float]) -> Optional[float]:
+        """
+        Derive P(C) from the logprobs of the first output token.
+
+        Args:
+            topLogprobs: Logprob of each alternative for the first output token
+
+        Returns:
+            The probability of cooperating, or None if neither move is among the
+            alternatives
+        """
+
+        moveProbabilities: Dict[str, float] = {"C": 0.0, "D": 0.0}
+
+        for token, logprob in topLogprobs.items():
+            move = token.strip().upper()
+
+            if move in moveProbabilities:
+                moveProbabilities[move] += math.exp(logprob)
+
+        total = moveProbabilities["C"] + moveProbabilities["D"]
+
+        if total == 0:
+            return None
+
+        if self.temperature == 0:
+            return 1.0 if moveProbabilities["C"] >= moveProbabilities["D"] else 0.0
+
+        return moveProbabilities["C"] / total
+
+    def decide(self, response: PromptResponse, opponent: Player) -> Action:
+        """
+        Turn the model response into an action.
+
+        In logprob mode the move is sampled locally from P(C) with the player's
+        seeded random generator, and P(C) is recorded on the call's trace span;
+        otherwise the response text is parsed.
+
+        Args:
+            response: The model response
+            opponent: The opponent player
+
+        Returns:
+            The action to take
+        """
+
+        if response.topLogprobs:
+            probability = self.cooperationProbability(response.topLogprobs)
+
+            if probability is not None:
+                tracer.recordCooperationProbability(
+                    self.name, opponent.name, len(self.history) + 1, probability
+                )
+
+                if getattr(self, "_random", None) is None:
+                    self.set_seed(None)
+
+                return Action.C if self._random.random() < probability else Action.D
+
+            return self.parseMove(response.text.strip())
+
+        return self.parseMove(response.text)
+
+    def _requestParams(self, opponent: Player) -> Dict[str, Any]:
+        if self.decisionMode == DecisionMode.LOGPROB and supportsLogprobs(
+            self.model.value
+        ):
+            maxTokens: int = 1
+            topLogprobs: Optional[int] = LOGPROB_TOP_ALTERNATIVES
+        else:
+            maxTokens = self.maxTokens
+            topLogprobs = None
+
+        return {
+            "model": self.model.value,
+            "maxTokens": maxTokens,
+            "temperature": self.temperature,
+            "messages": self.buildMessages(opponent),
+            "topLogprobs": topLogprobs,
+            "player": self.name,
+            "opponent": opponent.name,
+            "turn": len(self.history) + 1,
+        }
+
+    def strategy(self, opponent: Player) -> Action:
+        """
+        Run the prompt and return the action.
+
+        Args:
+            opponent: The opponent player
+
+        Returns:
+            The action to take
+        """
+
+        response: PromptResponse = runPrompt(**self._requestParams(opponent))
+
+        return self.decide(response, opponent)
+
+    async def strategyAsync(
+        self,
+        opponent: Player,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Action:
+        """
+        Run the prompt without blocking the event loop and return the action.
+
+        Args:
+            opponent: The opponent player
+            semaphore: Shared limit on the number of requests in flight
+
+        Returns:
+            The action to take
+        """
+
+        response: PromptResponse = await runPromptAsync(
+            **self._requestParams(opponent), semaphore=semaphore
+        )
+
+        return self.decide(response, opponent)
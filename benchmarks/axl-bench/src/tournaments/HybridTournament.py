@@ -0,0 +1,115 @@
+"""
+Tournament engine that splits CPU-bound and I/O-bound matches.
+"""
+
+import asyncio
+import threading
+from multiprocessing import Queue
+from typing import Any, Dict, List, Optional
+
+from axelrod.match_generator import MatchChunk
+
+from .LockstepTournament import LockstepTournament
+
+
+class HybridTournament(LockstepTournament):
+    """
+    Axelrod tournament that plays classical and LLM matches on separate executors.
+
+    Classical-vs-classical matches are CPU-bound and go to a pool of worker
+    processes across all cores. Matches involving a `CompletionLLM` are I/O-bound
+    and are played in lockstep on an event loop in the main process, with at most
+    `concurrency` requests in flight. Both streams of interactions are written to
+    the same file, so a single `ResultSet` is built from the merged results.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writeLock = threading.Lock()
+        self._workerFailure: Optional[Exception] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state.pop("_writeLock", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._writeLock = threading.Lock()
+
+    def _write_interactions_to_file(self, results, writer):
+        with self._writeLock:
+            super()._write_interactions_to_file(results, writer)
+
+    def _run_parallel(self, processes: int = 2, build_results: bool = True) -> bool:
+        """
+        Play classical matches on worker processes while LLM matches run in lockstep.
+
+        Args:
+            processes: How many worker processes to use for classical matches
+            build_results: Whether or not to build a results set
+        """
+        outFile, writer = self._get_file_objects(build_results)
+        progressBar = self._get_progress_bar()
+        workQueue: Queue = Queue()
+        doneQueue: Queue = Queue()
+        llmChunks: List[MatchChunk] = []
+        numClassicalChunks = 0
+
+        for chunk in self._pendingChunks():
+            if self.isLlmMatch(chunk):
+                llmChunks.append(chunk)
+            else:
+                workQueue.put(chunk)
+                numClassicalChunks += 1
+
+        workers = min(self._n_workers(processes=processes), numClassicalChunks)
+        self._start_workers(workers, workQueue, doneQueue, build_results)
+
+        drainer = threading.Thread(
+            target=self._drainDoneQueue,
+            args=(workers, doneQueue, writer, progressBar),
+        )
+        drainer.start()
+
+        try:
+            asyncio.run(
+                self._playLockstep(llmChunks, writer, build_results, progressBar)
+            )
+        finally:
+            drainer.join()
+
+            for obj in (outFile, progressBar):
+                if obj is not None:
+                    obj.close()
+
+        if self._workerFailure is not None:
+            raise self._workerFailure
+
+        return True
+
+    def _drainDoneQueue(
+        self,
+        workers: int,
+        doneQueue: Queue,
+        writer: Any,
+        progressBar: Optional[Any] = None,
+    ) -> None:
+        stops = 0
+        self._workerFailure = None
+
+        while stops < workers:
+            results = doneQueue.get()
+
+            if results == "STOP":
+                stops += 1
+                continue
+
+            if isinstance(results, Exception):
+                self._workerFailure = self._workerFailure or results
+                continue
+
+            self._write_interactions_to_file(results, writer)
+
+            if progressBar is not None:
+                progressBar.update(1)
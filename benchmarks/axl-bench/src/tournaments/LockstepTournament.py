@@ -0,0 +1,243 @@
+"""
+Tournament engine that plays all LLM matches in lockstep.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import axelrod as axl
+from axelrod import Action, Classifiers, Player
+from axelrod.match import sample_length
+from axelrod.match_generator import MatchChunk
+
+from ..runtime import clientRegistry
+from ..strategies import CompletionLLM
+from .ResumableTournament import ResumableTournament
+
+
+class LockstepMatch:
+    """
+    A match between two players that can be advanced one turn at a time.
+
+    Mirrors `axl.Match.play` (seeding, noise, deterministic cache), but lets the
+    caller await the LLM decisions of each turn, so the moves of many matches can
+    be requested concurrently.
+    """
+
+    def __init__(
+        self, tournament: axl.Tournament, chunk: MatchChunk, buildResults: bool = True
+    ):
+        p1Index, p2Index = chunk.index_pair
+        matchParams: Dict[str, Any] = dict(chunk.match_params)
+        matchParams["players"] = (
+            tournament.players[p1Index].clone(),
+            tournament.players[p2Index].clone(),
+        )
+        matchParams["seed"] = chunk.seed
+
+        self.tournament: axl.Tournament = tournament
+        self.buildResults: bool = buildResults
+        self.indexPair: Tuple[int, int] = chunk.index_pair
+        self.match: axl.Match = axl.Match(**matchParams)
+        self.remainingRepetitions: int = chunk.repetitions
+        self.interactions: List[List[Any]] = []
+        self.finished: bool = False
+        self._startRepetition()
+
+    def _startRepetition(self) -> None:
+        match = self.match
+
+        if match.prob_end:
+            sampledTurns = sample_length(match.prob_end, match._random.random())
+            turns = min(sampledTurns, match.turns)
+        else:
+            turns = match.turns
+
+        self.result: List[Tuple[Action, Action]] = []
+        self.remainingTurns = turns
+        cacheKey = (match.players[0], match.players[1])
+
+        if match._cached_enough_turns(cacheKey, turns):
+            self.result = match._cache[cacheKey][:turns]
+            self.remainingTurns = 0
+        else:
+            for player in match.players:
+                if match.reset:
+                    player.reset()
+
+                player.set_match_attributes(**match.match_attributes)
+
+                if Classifiers["stochastic"](player):
+                    player.set_seed(match._random.random_seed_int())
+
+        if self.remainingTurns == 0:
+            self._finishRepetition()
+
+    def _finishRepetition(self) -> None:
+        match = self.match
+        cacheKey = (match.players[0], match.players[1])
+
+        if match._cache_update_required and cacheKey not in match._cache:
+            match._cache[cacheKey] = self.result
+
+        match.result = self.result
+        results = (
+            self.tournament._calculate_results(self.result)
+            if self.buildResults
+            else None
+        )
+        self.interactions.append([self.result, results])
+        self.remainingRepetitions -= 1
+
+        if self.remainingRepetitions > 0:
+            self._startRepetition()
+        else:
+            self.finished = True
+
+    @staticmethod
+    async def _decide(
+        player: Player, opponent: Player, semaphore: asyncio.Semaphore
+    ) -> Action:
+        if isinstance(player, CompletionLLM):
+            return await player.strategyAsync(opponent, semaphore=semaphore)
+
+        return player.strategy(opponent)
+
+    async def playTurn(self, semaphore: asyncio.Semaphore) -> None:
+        """
+        Play the next turn of the match.
+
+        Args:
+            semaphore: Shared limit on the number of LLM requests in flight
+        """
+        match = self.match
+        player, coplayer = match.players
+
+        s1, s2 = await asyncio.gather(
+            self._decide(player, coplayer, semaphore),
+            self._decide(coplayer, player, semaphore),
+        )
+
+        if match.noise:
+            s1 = match._random.random_flip(s1, match.noise)
+            s2 = match._random.random_flip(s2, match.noise)
+
+        player.update_history(s1, s2)
+        coplayer.update_history(s2, s1)
+        self.result.append((s1, s2))
+        self.remainingTurns -= 1
+
+        if self.remainingTurns == 0:
+            self._finishRepetition()
+
+
+class LockstepTournament(ResumableTournament):
+    """
+    Axelrod tournament that advances every LLM match by one turn at a time.
+
+    Matches between classical strategies are played as usual. Matches involving a
+    `CompletionLLM` are stepped together: each round collects the pending LLM
+    decisions of every active match and requests them concurrently, so the critical
+    path is roughly `turns` rounds of concurrent calls instead of one call after
+    another. Interactions are written with the standard Axelrod writer, so the
+    resulting `ResultSet` is the same as for `axl.Tournament`, and finished matches
+    are checkpointed as in `ResumableTournament`.
+    """
+
+    def __init__(self, players: List[Player], concurrency: int = 64, **kwargs):
+        super().__init__(players, **kwargs)
+        self.concurrency: int = concurrency
+
+    def isLlmMatch(self, chunk: MatchChunk) -> bool:
+        """
+        Whether a match involves at least one LLM player.
+
+        Args:
+            chunk: The match chunk
+
+        Returns:
+            True if either player is a `CompletionLLM`
+        """
+        return any(
+            isinstance(self.players[index], CompletionLLM) for index in chunk.index_pair
+        )
+
+    def _run_serial(self, build_results: bool = True) -> bool:
+        """Play classical matches one by one, then all LLM matches in lockstep."""
+        outFile, writer = self._get_file_objects(build_results)
+        progressBar = self._get_progress_bar()
+        llmChunks: List[MatchChunk] = []
+
+        try:
+            for chunk in self._pendingChunks():
+                if self.isLlmMatch(chunk):
+                    llmChunks.append(chunk)
+                    continue
+
+                results = self._play_matches(chunk, build_results=build_results)
+                self._write_interactions_to_file(results, writer=writer)
+
+                if progressBar is not None:
+                    progressBar.update(1)
+
+            asyncio.run(
+                self._playLockstep(llmChunks, writer, build_results, progressBar)
+            )
+        finally:
+            for obj in (outFile, progressBar):
+                if obj is not None:
+                    obj.close()
+
+        return True
+
+    async def _playLockstep(
+        self,
+        chunks: Iterable[MatchChunk],
+        writer: Any,
+        buildResults: bool = True,
+        progressBar: Optional[Any] = None,
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        activeMatches: List[LockstepMatch] = []
+
+        try:
+            for chunk in chunks:
+                lockstepMatch = LockstepMatch(self, chunk, buildResults)
+
+                if lockstepMatch.finished:
+                    self._writeMatch(lockstepMatch, writer, progressBar)
+                else:
+                    activeMatches.append(lockstepMatch)
+
+            while activeMatches:
+                await asyncio.gather(
+                    *(
+                        lockstepMatch.playTurn(semaphore)
+                        for lockstepMatch in activeMatches
+                    )
+                )
+
+                for lockstepMatch in activeMatches:
+                    if lockstepMatch.finished:
+                        self._writeMatch(lockstepMatch, writer, progressBar)
+
+                activeMatches = [
+                    lockstepMatch
+                    for lockstepMatch in activeMatches
+                    if not lockstepMatch.finished
+                ]
+        finally:
+            await clientRegistry.aclose()
+
+    def _writeMatch(
+        self,
+        lockstepMatch: LockstepMatch,
+        writer: Any,
+        progressBar: Optional[Any] = None,
+    ) -> None:
+        self._write_interactions_to_file(
+            {lockstepMatch.indexPair: lockstepMatch.interactions}, writer
+        )
+
+        if progressBar is not None:
+            progressBar.update(1)
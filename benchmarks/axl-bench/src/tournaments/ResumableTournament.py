@@ -0,0 +1,398 @@
+"""
+Tournament that checkpoints every finished match and resumes from its checkpoint.
+"""
+
+import csv
+import os
+from collections import defaultdict
+from multiprocessing import Queue
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import axelrod as axl
+from axelrod.match_generator import MatchChunk
+
+from ..models import CassetteEntry, MatchUsage, TraceSpan
+from ..runtime import (
+    cassette,
+    clientRegistry,
+    contextCache,
+    matchStore,
+    rateLimiter,
+    responseCache,
+    retryExecutor,
+    tracer,
+    usageTracker,
+)
+
+PLAYER_INDEX_COLUMN = 1
+OPPONENT_INDEX_COLUMN = 2
+PLAYER_NAME_COLUMN = 4
+OPPONENT_NAME_COLUMN = 5
+
+
+def pairKey(playerIndex: int, opponentIndex: int) -> Tuple[int, int]:
+    """The unordered pair of player indices that identifies a match."""
+    return (min(playerIndex, opponentIndex), max(playerIndex, opponentIndex))
+
+
+class ResumableTournament(axl.Tournament):
+    """
+    Axelrod tournament whose interactions file doubles as a match-level checkpoint.
+
+    Rows are flushed as soon as each match finishes. When `play` is given a
+    `filename` that already holds interactions, the matches recorded there in full
+    are kept and skipped, and any partially written match is dropped and played
+    again. Matches between players that the tournament's `edges` do not pair are
+    dropped too, so a checkpoint of another match graph adds nothing to the results.
+
+    Each match is seeded from its match store key (see `MatchStore.matchSeed`)
+    rather than from its position in the round robin, whether or not the store is
+    open, so a resumed tournament produces the same `ResultSet` as an uninterrupted
+    one and opening the store does not change how matches play. While the store is
+    open, matches found in it are written to the interactions file without being
+    played, and every match played is added to the store.
+
+    Worker processes are set up with the parent's runtime configuration: client
+    settings, price table, rate limits (applied per process), retry policy, Gemini
+    context cache TTL, response cache and cassette. They send their usage, trace
+    spans and recorded cassette entries back after each chunk, so the parent's
+    usage tracker, tracer and cassette see every request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.completedPairs: Set[Tuple[int, int]] = set()
+        # Store key of each pending match that is in the match store
+        self.storedPairs: Dict[Tuple[int, int], str] = {}
+        self._checkpointFile: Optional[Any] = None
+        self._playerSpecs: Optional[List[str]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_checkpointFile"] = None
+        state["_runtimeConfig"] = {
+            "prices": usageTracker.prices,
+            "clientConfig": clientRegistry.config,
+            "rateLimits": rateLimiter.limits,
+            "retryPolicy": retryExecutor.policy,
+            "contextCacheTtl": contextCache.ttlSeconds,
+            "responseCache": (
+                (
+                    str(responseCache.path),
+                    responseCache.maxBytes,
+                    responseCache.includeSampled,
+                )
+                if responseCache.enabled
+                else None
+            ),
+            "cassette": (
+                ("replay" if cassette.replaying else "record", str(cassette.directory))
+                if cassette.replaying or cassette.recording
+                else None
+            ),
+        }
+        return state
+
+    @staticmethod
+    def _configureWorker(config: Dict[str, Any]) -> None:
+        """Apply the parent's runtime configuration in a worker process."""
+        usageTracker.configure(config["prices"])
+        clientRegistry.configure(config["clientConfig"])
+        rateLimiter.configure(config["rateLimits"])
+        retryExecutor.configure(config["retryPolicy"])
+        contextCache.configure(config["contextCacheTtl"])
+
+        if config["responseCache"] is not None:
+            path, maxBytes, includeSampled = config["responseCache"]
+            responseCache.open(path, maxBytes=maxBytes, includeSampled=includeSampled)
+        else:
+            responseCache.close()
+
+        if config["cassette"] is None:
+            cassette.close()
+        elif config["cassette"][0] == "replay":
+            cassette.replay(config["cassette"][1])
+        else:
+            # Entries go back to the parent, which owns the cassette file
+            cassette.buffer()
+
+    def setup_output(self, filename: Optional[str] = None) -> None:
+        super().setup_output(filename)
+        self.completedPairs = set()
+
+        if filename is not None and os.path.exists(filename):
+            self._loadCheckpoint(filename)
+
+        self.storedPairs = {}
+
+        if matchStore.enabled:
+            keys = {
+                tuple(chunk.index_pair): self._matchKey(chunk.index_pair)
+                for chunk in self.match_generator.build_match_chunks()
+                if pairKey(*chunk.index_pair) not in self.completedPairs
+            }
+            found = matchStore.contains(keys.values())
+            self.storedPairs = {pair: key for pair, key in keys.items() if key in found}
+
+    def _matchKey(self, indexPair: Tuple[int, int]) -> str:
+        """The match store key of the match between two players."""
+        if self._playerSpecs is None:
+            self._playerSpecs = [
+                matchStore.playerSpec(player) for player in self.players
+            ]
+
+        playerIndex, opponentIndex = indexPair
+
+        return matchStore.matchKey(
+            self._playerSpecs[playerIndex],
+            self._playerSpecs[opponentIndex],
+            self.turns,
+            self.seed,
+            self.game,
+            self.noise,
+            self.prob_end,
+            self.repetitions,
+        )
+
+    def _loadCheckpoint(self, filename: str) -> None:
+        """Keep the fully written matches of a checkpoint and drop the rest."""
+        with open(filename, "r", newline="") as f:
+            rows = list(csv.reader(f))
+
+        if not rows:
+            return
+
+        header, rows = rows[0], rows[1:]
+        edgePairs: Optional[Set[Tuple[int, int]]] = (
+            {pairKey(*edge) for edge in self.edges} if self.edges is not None else None
+        )
+        rowsByPair: Dict[Tuple[int, int], List[List[str]]] = defaultdict(list)
+
+        for row in rows:
+            if len(row) != len(header):
+                continue
+
+            playerIndex = int(row[PLAYER_INDEX_COLUMN])
+            opponentIndex = int(row[OPPONENT_INDEX_COLUMN])
+
+            if row[PLAYER_NAME_COLUMN] != str(self.players[playerIndex]) or row[
+                OPPONENT_NAME_COLUMN
+            ] != str(self.players[opponentIndex]):
+                raise ValueError(
+                    f"Checkpoint {filename} was written for a different tournament"
+                )
+
+            pair = pairKey(playerIndex, opponentIndex)
+
+            if edgePairs is not None and pair not in edgePairs:
+                continue
+
+            rowsByPair[pair].append(row)
+
+        keptRows: List[List[str]] = []
+
+        for pair, pairRows in rowsByPair.items():
+            if len(pairRows) == 2 * self.repetitions:
+                self.completedPairs.add(pair)
+                keptRows.extend(pairRows)
+
+        tmpFilename = f"{filename}.tmp"
+
+        with open(tmpFilename, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(header)
+            writer.writerows(keptRows)
+
+        os.replace(tmpFilename, filename)
+        self.num_interactions = len(keptRows) // 2
+
+    def _pendingChunks(self) -> Iterator[MatchChunk]:
+        """Yield the match chunks neither in the checkpoint nor in the match store."""
+        for chunk in self.match_generator.build_match_chunks():
+            if (
+                pairKey(*chunk.index_pair) in self.completedPairs
+                or tuple(chunk.index_pair) in self.storedPairs
+            ):
+                continue
+
+            if self.seed is not None:
+                chunk.seed = matchStore.matchSeed(self._matchKey(chunk.index_pair))
+
+            yield chunk
+
+    def _get_file_objects(self, build_results: bool = True):
+        if self.completedPairs:
+            outFile = open(self.filename, "a")
+            writer = csv.writer(outFile, lineterminator="\n")
+        else:
+            outFile, writer = super()._get_file_objects(build_results)
+
+        self._checkpointFile = outFile
+
+        if writer is not None:
+            self._writeStoredMatches(writer, build_results)
+
+        return outFile, writer
+
+    def _writeStoredMatches(self, writer: Any, build_results: bool = True) -> None:
+        """Write the pending matches found in the match store, as if just played."""
+        for pair, key in self.storedPairs.items():
+            interactions = matchStore.get(key) or []
+
+            # Bypasses this class's writer, which would store them again
+            axl.Tournament._write_interactions_to_file(
+                self,
+                {
+                    pair: [
+                        [
+                            repetition,
+                            self._calculate_results(repetition)
+                            if build_results
+                            else None,
+                        ]
+                        for repetition in interactions
+                    ]
+                },
+                writer,
+            )
+
+        if self._checkpointFile is not None:
+            self._checkpointFile.flush()
+
+    def _get_progress_bar(self):
+        progressBar = super()._get_progress_bar()
+
+        if progressBar is not None and (self.completedPairs or self.storedPairs):
+            progressBar.update(len(self.completedPairs) + len(self.storedPairs))
+
+        return progressBar
+
+    def _write_interactions_to_file(self, results, writer):
+        super()._write_interactions_to_file(results, writer)
+
+        if self._checkpointFile is not None:
+            self._checkpointFile.flush()
+
+        if matchStore.enabled:
+            for indexPair, repetitions in results.items():
+                playerIndex, opponentIndex = indexPair
+                matchStore.put(
+                    self._matchKey(indexPair),
+                    self._playerSpecs[playerIndex],
+                    self._playerSpecs[opponentIndex],
+                    [interaction for interaction, _ in repetitions],
+                )
+
+    def _run_serial(self, build_results: bool = True) -> bool:
+        """Play the pending matches one by one."""
+        outFile, writer = self._get_file_objects(build_results)
+        progressBar = self._get_progress_bar()
+
+        try:
+            for chunk in self._pendingChunks():
+                results = self._play_matches(chunk, build_results=build_results)
+                self._write_interactions_to_file(results, writer=writer)
+
+                if progressBar is not None:
+                    progressBar.update(1)
+        finally:
+            for obj in (outFile, progressBar):
+                if obj is not None:
+                    obj.close()
+
+        return True
+
+    def _run_parallel(self, processes: int = 2, build_results: bool = True) -> bool:
+        """Play the pending matches on worker processes."""
+        workQueue: Queue = Queue()
+        doneQueue: Queue = Queue()
+        workers = self._n_workers(processes=processes)
+
+        for chunk in self._pendingChunks():
+            workQueue.put(chunk)
+
+        self._start_workers(workers, workQueue, doneQueue, build_results)
+        self._process_done_queue(workers, doneQueue, build_results)
+
+        return True
+
+    def _worker(self, work_queue: Queue, done_queue: Queue, build_results: bool = True):
+        """Play chunks until told to stop, reporting a failure instead of hanging."""
+        try:
+            runtimeConfig = getattr(self, "_runtimeConfig", None)
+
+            if runtimeConfig is not None:
+                self._configureWorker(runtimeConfig)
+
+            for chunk in iter(work_queue.get, "STOP"):
+                done_queue.put(self._play_matches(chunk, build_results))
+                telemetry = [
+                    *usageTracker.collect(),
+                    *tracer.collect(),
+                    *cassette.collect(),
+                ]
+
+                if telemetry:
+                    done_queue.put(telemetry)
+
+            done_queue.put("STOP")
+
+            return True
+        except Exception as error:
+            done_queue.put(error)
+            done_queue.put("STOP")
+
+            return False
+
+    def _process_done_queue(
+        self, workers: int, done_queue: Queue, build_results: bool = True
+    ) -> bool:
+        """
+        Write results from the workers as they arrive.
+
+        Usage, spans and cassette entries sent by the workers go to the usage
+        tracker, tracer and cassette. A worker that fails stops, while the others
+        keep playing (and checkpointing) the remaining matches; the first failure is
+        raised once all have stopped.
+        """
+        outFile, writer = self._get_file_objects(build_results)
+        progressBar = self._get_progress_bar()
+        failure: Optional[Exception] = None
+        stops = 0
+
+        try:
+            while stops < workers:
+                results = done_queue.get()
+
+                if results == "STOP":
+                    stops += 1
+                elif isinstance(results, Exception):
+                    failure = failure or results
+                elif isinstance(results, list):
+                    usageTracker.merge(
+                        [entry for entry in results if isinstance(entry, MatchUsage)]
+                    )
+                    tracer.merge(
+                        [entry for entry in results if isinstance(entry, TraceSpan)]
+                    )
+                    cassette.merge(
+                        [
+                            entry
+                            for entry in results
+                            if isinstance(entry, CassetteEntry)
+                        ]
+                    )
+                else:
+                    self._write_interactions_to_file(results, writer)
+
+                    if progressBar is not None:
+                        progressBar.update(1)
+        finally:
+            for obj in (outFile, progressBar):
+                if obj is not None:
+                    obj.close()
+
+        if failure is not None:
+            raise failure
+
+        return True
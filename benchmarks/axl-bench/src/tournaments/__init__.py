@@ -0,0 +1,10 @@
+from .HybridTournament import HybridTournament
+from .LockstepTournament import LockstepMatch, LockstepTournament
+from .ResumableTournament import ResumableTournament
+
+__all__ = [
+    "HybridTournament",
+    "LockstepMatch",
+    "LockstepTournament",
+    "ResumableTournament",
+]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Regenerate the visualizations of a saved benchmark run.
+
+Reads the run directory written by runBenchmark, so plots can be redrawn in a
+different format or resolution without re-running any tournament. Figures whose
+inputs are unchanged since their last render are skipped unless --force is given.
+"""
+
+import argparse
+
+from .helpers.generateVisualizations import generateVisualizations
+
+
+def main():
+    """Main function to visualize a saved run."""
+    parser = argparse.ArgumentParser(
+        description="Generate visualizations for a saved benchmark run"
+    )
+    parser.add_argument("run_dir", type=str, help="Directory of the saved run")
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Directory to save the figures (default: the run directory)",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="png",
+        help="Image format, e.g. png, svg or pdf (default: png)",
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=300,
+        help="Resolution of raster formats (default: 300)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes rendering figures (default: all cores)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render every figure, even if its inputs are unchanged",
+    )
+
+    args = parser.parse_args()
+
+    generateVisualizations(
+        runDir=args.run_dir,
+        outputDir=args.output_dir,
+        imageFormat=args.format,
+        dpi=args.dpi,
+        processes=args.processes,
+        force=args.force,
+    )
+
+
+if __name__ == "__main__":
+    main()